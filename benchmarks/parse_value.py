@@ -0,0 +1,95 @@
+# parse_value microbenchmark
+#
+# Compares the current scalar resolver with the original one on a value
+# mix typical of our config files (repeated booleans, nulls, small ints and
+# enum strings, plus some unique strings and floats), checks both give the
+# same results, and prints values per second.
+#
+# usage: python benchmarks/parse_value.py [values]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_decoder import parse_value, parse_scalar
+
+
+# parse_value as it was before the first character dispatch and cache
+def parse_value_original(value):
+    value = value.strip()
+
+    if value == "":
+        return None
+
+    if value.lower() == "null":
+        return None
+    if value.lower() == "true":
+        return True
+    if value.lower() == "false":
+        return False
+
+    if value.isdigit():
+        return int(value)
+
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    if (value.startswith('"') and value.endswith('"')) or \
+       (value.startswith("'") and value.endswith("'")):
+        return value[1:-1]
+
+    return value
+
+
+def build_values(n):
+    rng = random.Random(13)
+    repeated = ["true", "false", "null", "yes", "no", "enabled", "disabled",
+                "info", "debug", "warning", "0", "1", "8080", "'production'",
+                '"eu-west-1"', "0.5", "~", "none"]
+    values = []
+    for i in range(n):
+        r = rng.random()
+        if r < 0.75:
+            values.append(" " + rng.choice(repeated))
+        elif r < 0.9:
+            values.append(f" host-{i}.example.internal")
+        elif r < 0.95:
+            values.append(f" {rng.random() * 1000:.3f}")
+        else:
+            values.append(f" {i}")
+    return values
+
+
+def throughput(func, values):
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    elapsed = time.perf_counter() - start
+    return len(values) / elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    values = build_values(n)
+
+    for value in values[:10000]:
+        if parse_value(value) != parse_value_original(value):
+            print(f"mismatch for {value!r}")
+            sys.exit(1)
+
+    original = throughput(parse_value_original, values)
+    parse_scalar.cache_clear()
+    current = throughput(parse_value, values)
+
+    print(f"original parse_value : {original:>12,.0f} values/s")
+    print(f"current parse_value  : {current:>12,.0f} values/s ({current / original:.1f}x)")
+    print(f"cache                : {parse_scalar.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
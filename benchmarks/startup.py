@@ -0,0 +1,116 @@
+# Startup benchmark
+#
+# Runs a few headless commands and a plain "import data_decoder" in fresh
+# interpreters with -X importtime, and prints how long the imports took and
+# which of the heavier modules each one loaded. Every run should only load
+# the decoder it uses. Wall times are the median of several runs.
+#
+# usage: python benchmarks/startup.py [runs]
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules worth watching, roughly in order of import cost
+watched = [
+    "colorama", "sqlite3", "xml.etree.ElementTree", "csv", "concurrent.futures.process",
+    "multiprocessing", "urllib.request", "argparse", "orjson", "data_decoder.cli",
+    "data_decoder.xml_decoder", "data_decoder.csv_decoder", "data_decoder.sqlite_decoder",
+    "data_decoder.yaml_decoder", "data_decoder.num_decoder"
+]
+
+
+def make_inputs(folder):
+    import sqlite3
+
+    paths = {
+        "xml": os.path.join(folder, "in.xml"),
+        "csv": os.path.join(folder, "in.csv"),
+        "sql": os.path.join(folder, "in.sqlite"),
+        "yaml": os.path.join(folder, "in.yaml"),
+        "num": os.path.join(folder, "in.txt")
+    }
+    with open(paths["xml"], "w") as f:
+        f.write("<a><b>text</b></a>")
+    with open(paths["csv"], "w") as f:
+        f.write("id,name\n1,a\n")
+    with open(paths["yaml"], "w") as f:
+        f.write("a: 1\nb:\n  - x\n")
+    with open(paths["num"], "w") as f:
+        f.write("ff 10\n")
+    conn = sqlite3.connect(paths["sql"])
+    conn.execute("create table t(a, b)")
+    conn.execute("insert into t values (1, 'x')")
+    conn.commit()
+    conn.close()
+    return paths
+
+
+def scenarios(paths, folder):
+    out = os.path.join(folder, "out")
+    return [
+        ("import data_decoder", ["-c", "import data_decoder"]),
+        ("xml", ["-m", "data_decoder", "xml", paths["xml"], "-o", out]),
+        ("csv", ["-m", "data_decoder", "csv", paths["csv"], "-c", "name", "-o", out]),
+        ("sql", ["-m", "data_decoder", "sql", paths["sql"], "-o", out]),
+        ("yaml", ["-m", "data_decoder", "yaml", paths["yaml"], "-o", out]),
+        ("num", ["-m", "data_decoder", "num", paths["num"], "--from", "hex", "--to", "bin", "-o", out])
+    ]
+
+
+def run(args, folder, importtime=False):
+    env = dict(os.environ, PYTHONPATH=root)
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    began = time.perf_counter()
+    result = subprocess.run(command, cwd=folder, env=env, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - began
+    if result.returncode != 0:
+        raise SystemExit(f"{' '.join(args)} failed:\n{result.stderr}")
+    return elapsed, result.stderr
+
+
+# total import time of everything imported after startup, and the modules
+def parse_importtime(text):
+    total = 0
+    modules = set()
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        modules.add(name.strip())
+        # top level entries start right after the separator
+        if not name.startswith("  ") and name.strip() not in ("site", "encodings", "_frozen_importlib_external"):
+            total += int(parts[1])
+    return total, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = make_inputs(folder)
+        baseline = statistics.median(run(["-c", "pass"], folder)[0] for _ in range(runs))
+        print(f"python -c pass: {baseline * 1000:.1f} ms")
+        print()
+        print(f"{'command':<20} {'imports':>9} {'wall':>9}  heavy modules loaded")
+
+        for name, args in scenarios(paths, folder):
+            # first run also writes the bytecode cache
+            run(args, folder)
+            total, modules = parse_importtime(run(args, folder, importtime=True)[1])
+            wall = statistics.median(run(args, folder)[0] for _ in range(runs))
+            loaded = [module for module in watched if module in modules]
+            print(f"{name:<20} {total / 1000:>7.1f}ms {wall * 1000:>7.1f}ms  {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# YAML decoder scaling benchmark
+#
+# Builds wide and deep YAML documents at growing sizes, checks that
+# decode_yaml returns exactly the expected structure, and prints how the
+# time per line changes with size. Linear decoding keeps that number flat.
+#
+# usage: python benchmarks/yaml_scaling.py [max_size]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_decoder import decode_yaml
+
+
+# one mapping with n list valued keys
+def wide_lists(n):
+    lines = ["inventory:"]
+    expected = {}
+    for i in range(n):
+        lines.append(f"  key{i}:")
+        lines.append(f"    - {i}")
+        lines.append(f"    - item{i}")
+        expected[f"key{i}"] = [i, f"item{i}"]
+    return lines, {"inventory": expected}
+
+
+# n empty keys followed by the same keys declared again with lists. The
+# second declaration keeps the key's original position, so every list has
+# to be linked to a key that isn't the newest one, and all the earlier
+# empty keys look alike.
+def wide_redeclared(n):
+    lines = ["inventory:"]
+    for i in range(n):
+        lines.append(f"  key{i}:")
+    expected = {}
+    for i in range(n):
+        lines.append(f"  key{i}:")
+        lines.append(f"    - {i}")
+        expected[f"key{i}"] = [i]
+    return lines, {"inventory": expected}
+
+
+# n levels of nested mappings with a list at the bottom
+def deep(n):
+    lines = []
+    expected = {}
+    node = expected
+    for i in range(n):
+        lines.append("  " * i + f"level{i}:")
+        if i < n - 1:
+            node[f"level{i}"] = {}
+            node = node[f"level{i}"]
+    lines.append("  " * n + "- leaf")
+    node[f"level{n - 1}"] = ["leaf"]
+    return lines, expected
+
+
+# many list items, each a small mapping
+def long_list(n):
+    lines = ["items:"]
+    expected = []
+    for i in range(n):
+        lines.append(f"  - id: {i}")
+        lines.append(f"    name: item{i}")
+        lines.append(f"    active: {'true' if i % 2 else 'false'}")
+        expected.append({"id": i, "name": f"item{i}", "active": bool(i % 2)})
+    return lines, {"items": expected}
+
+
+# n mappings whose last key holds a list written at the key's own indent,
+# after keys that must survive the list
+def mixed_keys(n):
+    lines = ["root:"]
+    expected = {}
+    for i in range(n):
+        lines.append(f"  group{i}:")
+        lines.append(f"    id: {i}")
+        lines.append("    tags:")
+        lines.append(f"    - a{i}")
+        lines.append(f"    - b{i}")
+        expected[f"group{i}"] = {"id": i, "tags": [f"a{i}", f"b{i}"]}
+    return lines, {"root": expected}
+
+
+# n top-level keys with lists at column 0, each followed by a scalar key
+def flush_lists(n):
+    lines = []
+    expected = {}
+    for i in range(n):
+        lines.append(f"list{i}:")
+        lines.append(f"- {i}")
+        lines.append(f"- item{i}")
+        lines.append(f"after{i}: {i}")
+        expected[f"list{i}"] = [i, f"item{i}"]
+        expected[f"after{i}"] = i
+    return lines, expected
+
+
+corpus = {
+    "wide_lists": wide_lists,
+    "wide_redeclared": wide_redeclared,
+    "deep": deep,
+    "long_list": long_list,
+    "mixed_keys": mixed_keys,
+    "flush_lists": flush_lists
+}
+
+
+def main():
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else 16000
+    sizes = []
+    size = 1000
+    while size <= max_size:
+        sizes.append(size)
+        size *= 2
+
+    print(f"{'document':<16} {'size':>8} {'lines':>9} {'seconds':>9} {'us/line':>9}")
+    for name, build in corpus.items():
+        for size in sizes:
+            # nesting depth grows much slower than width in real documents
+            if name == "deep":
+                size //= 32
+            lines, expected = build(size)
+
+            start = time.perf_counter()
+            result = decode_yaml(lines)
+            elapsed = time.perf_counter() - start
+
+            if result != expected:
+                print(f"{name} at size {size}: decoded structure does not match")
+                sys.exit(1)
+
+            print(f"{name:<16} {size:>8} {len(lines):>9} {elapsed:>9.4f} {elapsed / len(lines) * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
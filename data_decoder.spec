@@ -2,8 +2,8 @@
 
 
 a = Analysis(
-    ['data_decoder.py'],
-    pathex=[],
+    ['data_decoder/__main__.py'],
+    pathex=['.'],
     binaries=[],
     datas=[],
     hiddenimports=[],
@@ -0,0 +1,114 @@
+# Data Decoder
+# Decoders for XML, CSV, SQLite, YAML and number files, run from the command
+# line with "python -m data_decoder" or used as a library. Nothing is loaded
+# up front: a decoder module is imported the first time one of its names is
+# used, so "import data_decoder" stays cheap.
+import importlib
+
+# modules of the package
+_modules = (
+    "config", "json_output", "xml_decoder", "csv_decoder", "sqlite_decoder",
+    "yaml_decoder", "num_decoder", "metrics", "cache", "api", "bench", "console", "server", "cli", "repl"
+)
+
+# public name -> module that defines it
+_exports = {
+    "version": "config",
+    "load_config": "config",
+    "save_config": "config",
+
+    "extract_text_from_xml": "xml_decoder",
+    "extract_text_from_xml_stream": "xml_decoder",
+    "iter_xml_text": "xml_decoder",
+    "parse_record_path": "xml_decoder",
+    "iter_xml_records": "xml_decoder",
+    "write_xml_records": "xml_decoder",
+    "export_xml_records": "xml_decoder",
+
+    "decode_csv": "csv_decoder",
+    "decode_csv_batch": "csv_decoder",
+    "iter_csv_columns": "csv_decoder",
+    "read_csv_columns": "csv_decoder",
+
+    "indent_json": "json_output",
+    "compact_json": "json_output",
+    "json_output_file": "json_output",
+
+    "sqlite_record": "sqlite_decoder",
+    "sqlite_selection": "sqlite_decoder",
+    "sqlite_tables": "sqlite_decoder",
+    "sqlite_columns": "sqlite_decoder",
+    "quote_identifier": "sqlite_decoder",
+    "decode_sqlite": "sqlite_decoder",
+    "sqlite_document": "sqlite_decoder",
+    "write_sqlite_document": "sqlite_decoder",
+    "export_sqlite_json": "sqlite_decoder",
+    "export_sqlite_incremental": "sqlite_decoder",
+    "export_sqlite_columns": "sqlite_decoder",
+    "read_sqlite_column": "sqlite_decoder",
+
+    "parse_value": "yaml_decoder",
+    "parse_scalar": "yaml_decoder",
+    "iter_yaml": "yaml_decoder",
+    "decode_yaml": "yaml_decoder",
+    "write_yaml_json_stream": "yaml_decoder",
+    "export_yaml_json": "yaml_decoder",
+
+    "convertnum": "num_decoder",
+    "convert_number": "num_decoder",
+    "convertnum_lines": "num_decoder",
+    "convert_num_file": "num_decoder",
+    "convert_binary_file": "num_decoder",
+
+    "cache_usage": "cache",
+    "clear_cache": "cache",
+
+    "xml_lines": "api",
+    "xml_text": "api",
+    "xml_records": "api",
+    "xml_json": "api",
+    "csv_rows": "api",
+    "csv_columns": "api",
+    "sqlite_data": "api",
+    "sqlite_rows": "api",
+    "sqlite_json": "api",
+    "yaml_data": "api",
+    "yaml_entries": "api",
+    "yaml_json": "api",
+    "number_lines": "api",
+    "numbers_text": "api",
+    "bytes_text": "api",
+
+    "run_benchmarks": "bench",
+    "compare_results": "bench",
+
+    "serve_jobs": "server",
+    "submit_jobs": "server",
+    "send_command": "server",
+
+    "run_decode": "cli",
+    "run_jobs": "cli",
+    "load_jobs": "cli",
+    "decode_directory": "cli",
+    "run_cli": "cli",
+    "main": "cli"
+}
+
+__all__ = sorted(_exports)
+
+
+# load modules and names on first use
+def __getattr__(name):
+    if name in _modules:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports) | set(_modules))
@@ -0,0 +1,7 @@
+# python -m data_decoder, also the entry script of the exe
+import sys
+
+from data_decoder.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
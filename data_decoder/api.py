@@ -0,0 +1,269 @@
+# Library API
+# The decoders on data that is already in memory or in an open stream, so
+# nothing has to go through a temporary file. A source can be bytes, a str
+# holding the document itself, a path-like object (pathlib.Path) or a
+# readable file object, text or binary. SQLite is the exception: a database
+# can't be text, so there a str is a path. Results are returned, yielded or
+# written to a text stream, and errors are raised instead of printed.
+import contextlib
+import io
+import os
+
+
+# open a source as a text stream. Binary streams are wrapped and detached
+# again afterwards so the caller's stream stays open.
+@contextlib.contextmanager
+def text_source(source, newline=None):
+    if isinstance(source, str):
+        yield io.StringIO(source, newline=newline)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.TextIOWrapper(io.BytesIO(source), encoding="utf-8", newline=newline)
+    elif isinstance(source, os.PathLike):
+        with open(source, "r", encoding="utf-8", newline=newline) as f:
+            yield f
+    elif hasattr(source, "read"):
+        if isinstance(source.read(0), str):
+            yield source
+        else:
+            wrapper = io.TextIOWrapper(source, encoding="utf-8", newline=newline)
+            try:
+                yield wrapper
+            finally:
+                wrapper.detach()
+    else:
+        raise TypeError(f"Can't read from {type(source).__name__}, use str, bytes, a path or a file object.")
+
+# open a source for the XML parser, which takes text or binary streams and
+# reads the encoding declaration from bytes itself
+@contextlib.contextmanager
+def xml_source(source):
+    if isinstance(source, str):
+        yield io.StringIO(source)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    elif isinstance(source, os.PathLike):
+        with open(source, "rb") as f:
+            yield f
+    elif hasattr(source, "read"):
+        yield source
+    else:
+        raise TypeError(f"Can't read from {type(source).__name__}, use str, bytes, a path or a file object.")
+
+# open a source as a sqlite connection. An open connection is used as it is,
+# a str or path-like object is opened read only, and the bytes of a database
+# (or a binary stream holding one) are loaded into memory, through a
+# temporary file before python 3.11.
+@contextlib.contextmanager
+def sqlite_source(source):
+    import sqlite3
+    from data_decoder.sqlite_decoder import connect_readonly
+
+    if isinstance(source, sqlite3.Connection):
+        yield source
+        return
+
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.isfile(source):
+            raise FileNotFoundError(f"File not found: {os.fspath(source)}")
+        conn = connect_readonly(os.fspath(source))
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    elif hasattr(source, "read"):
+        data = source.read()
+        if isinstance(data, str):
+            raise TypeError("SQLite databases have to be read from a binary stream.")
+    else:
+        raise TypeError(f"Can't read a database from {type(source).__name__}, use bytes, a path, a file object or a connection.")
+
+    conn = None
+    temp_file = None
+    try:
+        if hasattr(sqlite3.Connection, "deserialize"):
+            conn = sqlite3.connect(":memory:")
+            conn.deserialize(data)
+        else:
+            import tempfile
+
+            fd, temp_file = tempfile.mkstemp(suffix=".sqlite")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            conn = sqlite3.connect(temp_file)
+        yield conn
+    finally:
+        if conn is not None:
+            conn.close()
+        if temp_file is not None:
+            os.remove(temp_file)
+
+# run write(out) into a new string when out is None
+def write_or_return(out, write):
+    if out is not None:
+        write(out)
+        return None
+    buffer = io.StringIO()
+    write(buffer)
+    return buffer.getvalue()
+
+
+# XML: the text lines of a document, as extract_text_from_xml writes them
+def xml_lines(source):
+    from data_decoder.xml_decoder import iter_xml_text
+
+    with xml_source(source) as f:
+        first = True
+        for piece in iter_xml_text(f):
+            yield piece.lstrip() if first else piece
+            first = False
+
+# XML: the whole text, the content of extract_text_from_xml's output file
+def xml_text(source):
+    return "\n".join(xml_lines(source)).rstrip()
+
+# XML: every element at record_path (like /feed/entry) as json friendly
+# data, see export_xml_records
+def xml_records(source, record_path):
+    from data_decoder.xml_decoder import iter_xml_records
+
+    with xml_source(source) as f:
+        yield from iter_xml_records(f, record_path)
+
+# XML: the export_xml_records text, written to out or returned
+def xml_json(source, record_path, out=None, fmt="jsonl"):
+    from data_decoder.xml_decoder import write_xml_records
+
+    with xml_source(source) as f:
+        return write_or_return(out, lambda o: write_xml_records(f, o, record_path, fmt))
+
+# CSV: {column: value} per row for the given columns, values stripped
+def csv_rows(source, columns):
+    from data_decoder.csv_decoder import iter_csv_columns
+
+    if isinstance(columns, str):
+        columns = [columns]
+    with text_source(source, newline="") as f:
+        yield from iter_csv_columns(f, columns)
+
+# CSV: {column: [non empty values]}, the lines decode_csv writes per column
+def csv_columns(source, columns):
+    from data_decoder.csv_decoder import read_csv_columns
+
+    if isinstance(columns, str):
+        columns = [columns]
+    with text_source(source, newline="") as f:
+        return read_csv_columns(f, columns)
+
+# SQLite: the decode_sqlite document, {"tables": {name: {"columns", "rows"}}}
+def sqlite_data(source, selection=None):
+    from data_decoder.sqlite_decoder import sqlite_document
+
+    with sqlite_source(source) as conn:
+        return sqlite_document(conn, selection, strict=True)
+
+# SQLite: the rows of one table as json friendly dicts, batch_size at a time
+def sqlite_rows(source, table, selection=None, batch_size=1000):
+    import sqlite3
+    from data_decoder.sqlite_decoder import sqlite_record, sqlite_table_query
+
+    with sqlite_source(source) as conn:
+        _, sql, params = sqlite_table_query(conn, table, selection)
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield sqlite_record(row)
+
+# SQLite: the export_sqlite_json text, written to out or returned
+def sqlite_json(source, out=None, fmt="pretty", selection=None, batch_size=1000):
+    from data_decoder.sqlite_decoder import write_sqlite_document
+
+    with sqlite_source(source) as conn:
+        return write_or_return(out, lambda f: write_sqlite_document(conn, f, batch_size, fmt, selection, strict=True))
+
+# YAML: the decoded document
+def yaml_data(source):
+    from data_decoder.yaml_decoder import decode_yaml
+
+    with text_source(source) as f:
+        return decode_yaml(f)
+
+# YAML: (key, value) per top-level entry, (None, item) for a top-level list
+def yaml_entries(source):
+    from data_decoder.yaml_decoder import iter_yaml
+
+    with text_source(source) as f:
+        yield from iter_yaml(f)
+
+# YAML: the export_yaml_json text, written to out or returned. stream keeps
+# top-level keys in document order like the stream mode of the export.
+def yaml_json(source, out=None, fmt="pretty", stream=False):
+    import json
+    from data_decoder.json_output import compact_json
+    from data_decoder.yaml_decoder import decode_yaml, write_yaml_json_stream
+
+    with text_source(source) as f:
+        if stream or fmt == "jsonl":
+            return write_or_return(out, lambda o: write_yaml_json_stream(f, o, fmt))
+
+        data = decode_yaml(f)
+        if fmt == "compact":
+            text = compact_json(data)
+        else:
+            text = json.dumps(data, indent=2, sort_keys=True)
+        return write_or_return(out, lambda o: o.write(text))
+
+# Numbers: (line, result, error) for every non empty line, result None and
+# error the message convertnum would print when a line can't be converted
+def number_lines(source, type_out, type_in, per_byte=True):
+    from data_decoder.config import valid_num_types
+    from data_decoder.num_decoder import convert_number, convertnum_lines
+
+    if type_out not in valid_num_types or type_in not in valid_num_types:
+        raise ValueError("Invalid number type specified.")
+
+    error = None
+
+    def convert(value, type_out, type_in, per_byte):
+        nonlocal error
+        try:
+            return convert_number(value, type_out, type_in, per_byte)
+        except ValueError as e:
+            error = str(e)
+            return None
+
+    with text_source(source) as f:
+        for line, result in convertnum_lines(f, type_out, type_in, per_byte, convert):
+            yield line, result, error
+            error = None
+
+# Numbers: the converted lines, the content of convert_num_file's output
+def numbers_text(source, type_out, type_in, per_byte=True):
+    return "\n".join(result for _, result, _ in number_lines(source, type_out, type_in, per_byte) if result is not None)
+
+# Numbers: bytes rendered in a number type, bytes_per_line per line, the
+# content of convert_binary_file's output
+def bytes_text(data, type_out, bytes_per_line=16):
+    from data_decoder.config import valid_num_types
+    from data_decoder.num_decoder import byte_tables
+
+    if type_out not in valid_num_types:
+        raise ValueError("Invalid number type specified.")
+    if hasattr(data, "read"):
+        data = data.read()
+
+    table = byte_tables[type_out]
+    with memoryview(data) as view:
+        if type_out == "hex":
+            lines = [view[i:i + bytes_per_line].hex(" ") for i in range(0, len(view), bytes_per_line)]
+        else:
+            lines = [" ".join([table[b] for b in view[i:i + bytes_per_line]]) for i in range(0, len(view), bytes_per_line)]
+    return "\n".join(lines)
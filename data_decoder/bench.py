@@ -0,0 +1,384 @@
+# Benchmark suite
+# "data_decoder bench" generates synthetic inputs for every decoder, times
+# the decoders on them and writes the results as json, so runs on different
+# versions or machines can be compared. Every case runs in a fresh process,
+# which makes its peak RSS its own and not left over from the case before.
+import contextlib
+import json
+import os
+import time
+
+from data_decoder import config
+from data_decoder.config import version
+from data_decoder.metrics import peak_rss
+
+# rows, elements or lines per case at scale 1, picked so each input is a few MB
+bench_sizes = {
+    "xml_wide": 40000,
+    "xml_deep": 400,
+    "xml_records": 40000,
+    "csv_wide": 20000,
+    "sqlite": 20000,
+    "yaml": 8000,
+    "hex_dump": 50000,
+    "bin_dump": 30000
+}
+
+bench_cases = tuple(bench_sizes)
+
+# depth of every chain in the deep XML, under the recursion limit of
+# extract_text_from_xml
+xml_depth = 200
+
+words = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+         "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa")
+
+
+# value at pct percent of the values, interpolated between neighbours
+def percentile(values, pct):
+    values = sorted(values)
+    k = (len(values) - 1) * pct / 100
+    low = int(k)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (k - low)
+
+
+# Generators
+# Each writes one input for n units of its case and returns how many items
+# a decode of it handles. The data is random but seeded, so every run and
+# every version decodes the same files.
+
+# n <item> records with a few children and attributes each
+def make_xml_wide(path, n, rng):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<catalog>\n")
+        for i in range(n):
+            name = " ".join(rng.choice(words) for _ in range(3))
+            f.write(f'  <item id="{i}"><name>{name}</name><price>{rng.random() * 100:.2f}</price>'
+                    f"<tags><tag>{rng.choice(words)}</tag><tag>{rng.choice(words)}</tag></tags>"
+                    f"<note>{rng.choice(words)} &amp; {rng.choice(words)}</note>tail {i}</item>\n")
+        f.write("</catalog>\n")
+    return n * 7 + 1
+
+# the wide XML, decoded into one json record per <item>
+def make_xml_records(path, n, rng):
+    make_xml_wide(path, n, rng)
+    return n
+
+# n chains of xml_depth nested elements, text and tails on every level
+def make_xml_deep(path, n, rng):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<root>")
+        for i in range(n):
+            for depth in range(xml_depth):
+                f.write(f"<level d=\"{depth}\">{rng.choice(words)} {i}")
+            for depth in range(xml_depth):
+                f.write(f"</level>{rng.choice(words)}")
+        f.write("</root>\n")
+    return n * xml_depth + 1
+
+# n rows of 50 columns, some quoted with commas and line breaks inside
+def make_csv_wide(path, n, rng):
+    import csv
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([f"c{i}" for i in range(50)])
+        for i in range(n):
+            row = []
+            for c in range(50):
+                kind = c % 5
+                if kind == 0:
+                    row.append(i * 50 + c)
+                elif kind == 1:
+                    row.append(f"{rng.random() * 1000:.3f}")
+                elif kind == 2:
+                    row.append(f" {rng.choice(words)}, {rng.choice(words)} ")
+                elif kind == 3:
+                    row.append(f"{rng.choice(words)}\n{rng.choice(words)}" if rng.random() < 0.1 else "")
+                else:
+                    row.append(rng.choice(words))
+            writer.writerow(row)
+    return n
+
+# four tables of n rows each: integers, reals, text, nulls and blobs
+def make_sqlite(path, n, rng):
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, score REAL, active INTEGER)")
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, user_id INTEGER, kind TEXT, at TEXT, payload TEXT)")
+        conn.execute("CREATE TABLE files (id INTEGER PRIMARY KEY, name TEXT, data BLOB)")
+        conn.execute("CREATE TABLE metrics (name TEXT, value REAL, note TEXT)")
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?)", (
+            (i, f"{rng.choice(words)} {rng.choice(words)}", f"user{i}@example.com", rng.random() * 100, i % 2)
+            for i in range(n)))
+        conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?)", (
+            (i, rng.randrange(n), rng.choice(words), f"2024-01-{i % 28 + 1:02d}T12:00:00",
+             json.dumps({"words": [rng.choice(words) for _ in range(4)]}))
+            for i in range(n)))
+        conn.executemany("INSERT INTO files VALUES (?, ?, ?)", (
+            (i, f"file{i}.bin", rng.getrandbits(8 * size).to_bytes(size, "little"))
+            for i, size in ((i, rng.randrange(16, 512)) for i in range(n))))
+        conn.executemany("INSERT INTO metrics VALUES (?, ?, ?)", (
+            (rng.choice(words), rng.random(), None if i % 3 else rng.choice(words))
+            for i in range(n)))
+        conn.commit()
+    finally:
+        conn.close()
+    return n * 4
+
+# n top-level services, each a few levels of mappings and lists
+def make_yaml(path, n, rng):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# synthetic inventory\n")
+        for i in range(n):
+            f.write(f"service{i}:\n")
+            f.write(f"  name: {rng.choice(words)}-{i}\n")
+            f.write(f"  enabled: {rng.choice(('true', 'false'))}\n")
+            f.write(f"  replicas: {rng.randrange(1, 10)}\n")
+            f.write(f"  ratio: {rng.random():.4f}\n")
+            f.write("  owner: null\n")
+            f.write("  ports:\n")
+            for _ in range(3):
+                f.write(f"    - {rng.randrange(1024, 65536)}\n")
+            f.write("  env:\n")
+            f.write(f"    region: \"{rng.choice(words)}\"\n")
+            f.write("    limits:\n")
+            f.write(f"      cpu: {rng.randrange(1, 16)}\n")
+            f.write(f"      memory: {rng.randrange(128, 4096)}Mi  # soft limit\n")
+            f.write("  hosts:\n")
+            f.write(f"    - name: {rng.choice(words)}\n")
+            f.write(f"    - name: {rng.choice(words)}\n")
+    return n
+
+# n lines of 16 hex bytes, "00 ff 1a ..."
+def make_hex_dump(path, n, rng):
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(n):
+            f.write(rng.getrandbits(128).to_bytes(16, "little").hex(" ") + "\n")
+    return n
+
+# n lines of 8 binary bytes, "01001100 ..."
+def make_bin_dump(path, n, rng):
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(n):
+            f.write(" ".join(format(b, "08b") for b in rng.getrandbits(64).to_bytes(8, "little")) + "\n")
+    return n
+
+# case -> (generator, input file name)
+bench_inputs = {
+    "xml_wide": (make_xml_wide, "wide.xml"),
+    "xml_deep": (make_xml_deep, "deep.xml"),
+    "xml_records": (make_xml_records, "records.xml"),
+    "csv_wide": (make_csv_wide, "wide.csv"),
+    "sqlite": (make_sqlite, "tables.sqlite"),
+    "yaml": (make_yaml, "nested.yaml"),
+    "hex_dump": (make_hex_dump, "hex_dump.txt"),
+    "bin_dump": (make_bin_dump, "bin_dump.txt")
+}
+
+
+# one decode of a case's input, output files go next to it
+def run_case_once(case, input_file):
+    base_name = os.path.splitext(input_file)[0]
+
+    if case in ("xml_wide", "xml_deep"):
+        from data_decoder.xml_decoder import extract_text_from_xml
+        if not extract_text_from_xml(input_file, base_name + "_decoded.txt"):
+            raise RuntimeError("XML decode failed")
+
+    elif case == "xml_records":
+        from data_decoder.xml_decoder import export_xml_records
+        if not export_xml_records(input_file, base_name + "_records.jsonl", "/catalog/item"):
+            raise RuntimeError("XML record export failed")
+
+    elif case == "csv_wide":
+        from data_decoder.csv_decoder import decode_csv
+        if not decode_csv(input_file, base_name + "_c2_decoded.txt", "c2"):
+            raise RuntimeError("CSV decode failed")
+
+    elif case == "sqlite":
+        from data_decoder.sqlite_decoder import decode_sqlite
+        decode_sqlite(input_file)
+
+    elif case == "yaml":
+        from data_decoder.yaml_decoder import decode_yaml
+        with open(input_file, "r", encoding="utf-8") as f:
+            decode_yaml(f)
+
+    else:
+        from data_decoder.num_decoder import convertnum
+        type_out, type_in = ("bin", "hex") if case == "hex_dump" else ("hex", "bin")
+        with open(input_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if convertnum(line, type_out, type_in, True) is None:
+                    raise RuntimeError(f"Number conversion failed: {line.strip()}")
+
+# Benchmark worker, run in a fresh process: one warmup decode, then repeats
+# timed ones. Decoder messages are dropped so they don't end up in the timings.
+def run_case(case, input_file, repeats, warmup=1):
+    # every repeat has to decode for real
+    config.result_cache = False
+    baseline = peak_rss()
+    runs = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for n in range(warmup + repeats):
+            began = time.perf_counter()
+            run_case_once(case, input_file)
+            elapsed = time.perf_counter() - began
+            if n >= warmup:
+                runs.append(elapsed)
+
+    return {"runs": runs, "baseline_rss": baseline, "peak_rss": peak_rss()}
+
+# summary of one case's timings
+def case_result(input_bytes, items, timing):
+    runs = timing["runs"]
+    median = percentile(runs, 50)
+    return {
+        "input_bytes": input_bytes,
+        "items": items,
+        "runs": [round(t, 6) for t in runs],
+        "latency": {
+            "min": round(min(runs), 6),
+            "p50": round(median, 6),
+            "p90": round(percentile(runs, 90), 6),
+            "p99": round(percentile(runs, 99), 6),
+            "max": round(max(runs), 6),
+            "mean": round(sum(runs) / len(runs), 6)
+        },
+        "bytes_per_s": round(input_bytes / median, 1) if median > 0 else None,
+        "items_per_s": round(items / median, 1) if median > 0 else None,
+        "baseline_rss": timing["baseline_rss"],
+        "peak_rss": timing["peak_rss"]
+    }
+
+# Benchmark runner
+# Generates the inputs at scale (1 = the bench_sizes) in work_dir, or a
+# temporary folder that is removed afterwards, and runs every case in its
+# own process. Returns the results document.
+def run_benchmarks(cases=bench_cases, scale=1.0, repeats=5, work_dir=None, seed=1):
+    # process pools take a while to import, so only benchmark runs load them.
+    # The rest too, the cli imports this module for the case names.
+    import multiprocessing
+    import platform
+    import random
+    import shutil
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    for case in cases:
+        if case not in bench_inputs:
+            raise ValueError(f"Unknown benchmark case: {case}. Use {', '.join(bench_cases)}.")
+    if repeats < 1:
+        raise ValueError("Benchmarks need at least one repeat.")
+
+    results = {
+        "version": version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scale": scale,
+        "repeats": repeats,
+        "seed": seed,
+        "cases": {}
+    }
+
+    folder = work_dir or tempfile.mkdtemp(prefix="data_decoder_bench_")
+    os.makedirs(folder, exist_ok=True)
+    context = multiprocessing.get_context("spawn")
+    try:
+        for case in cases:
+            generate, name = bench_inputs[case]
+            input_file = os.path.join(folder, name)
+            items = generate(input_file, max(1, int(bench_sizes[case] * scale)), random.Random(f"{seed}:{case}"))
+            input_bytes = os.path.getsize(input_file)
+
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                timing = pool.submit(run_case, case, input_file, repeats).result()
+
+            result = case_result(input_bytes, items, timing)
+            results["cases"][case] = result
+            print(format_case(case, result))
+    finally:
+        if work_dir is None:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    return results
+
+def format_size(size):
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+# one line of the results table
+def format_case(case, result):
+    latency = result["latency"]
+    rate = result["bytes_per_s"]
+    return (f"{case:<9} {format_size(result['input_bytes']):>9}  "
+            f"p50 {latency['p50'] * 1000:9.1f} ms  p90 {latency['p90'] * 1000:9.1f} ms  "
+            f"{format_size(rate) + '/s' if rate else 'n/a':>11}  "
+            f"{result['items_per_s'] or 0:>12,.0f} items/s  peak RSS {format_size(result['peak_rss'])}")
+
+# Compare a run with an earlier results file by throughput, which doesn't
+# depend on the scale either was run at. Prints the change per case and
+# returns the cases that got slower by more than threshold percent.
+def compare_results(results, previous, threshold=10.0):
+    regressions = []
+    for case, result in results["cases"].items():
+        old = previous.get("cases", {}).get(case)
+        if not old or not old.get("bytes_per_s") or not result["bytes_per_s"]:
+            print(f"{case:<9} no earlier result")
+            continue
+
+        change = (result["bytes_per_s"] / old["bytes_per_s"] - 1) * 100
+        slower = change < -threshold
+        if slower:
+            regressions.append(case)
+
+        rss = ""
+        if old.get("peak_rss") and result["peak_rss"]:
+            rss = f", peak RSS {(result['peak_rss'] / old['peak_rss'] - 1) * 100:+.1f}%"
+        print(f"{case:<9} throughput {change:+.1f}%{rss}{'  REGRESSION' if slower else ''}")
+
+    return regressions
+
+# headless "bench" command, returns the exit code: 1 when a case failed or
+# got slower than the compared run allows
+def run_bench_command(cases=None, scale=1.0, repeats=5, output_file=None, compare_file=None,
+                      threshold=10.0, keep_dir=None):
+    cases = [c.strip() for c in cases.split(",") if c.strip()] if cases else list(bench_cases)
+
+    previous = None
+    if compare_file:
+        try:
+            with open(compare_file, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read benchmark results {compare_file}: {e}")
+            return 1
+
+    try:
+        results = run_benchmarks(cases, scale, repeats, keep_dir)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Benchmark failed: {e}")
+        return 1
+
+    output_file = output_file or time.strftime("bench-%Y%m%d-%H%M%S.json")
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print("Benchmark results written to:", output_file)
+
+    if previous is not None:
+        print(f"Compared with {compare_file} ({previous.get('version', '?')}, {previous.get('started', '?')}):")
+        if compare_results(results, previous, threshold):
+            return 1
+    return 0
@@ -0,0 +1,282 @@
+# Result cache
+# Output files of the xml, yaml and sqlite decoders kept on disk, keyed by
+# the content hash of the input, the decoder and the options that change the
+# output. Decoding an unchanged file again only copies (or links) the
+# earlier output. The hash of an input is remembered with its size and
+# modification time and only computed again when one of them changes. The
+# cache is kept under config.cache_size_mb by dropping the results that
+# were used least recently. A result's last use is the modification time of
+# its .json file, the result itself isn't touched since in link mode it is
+# also the user's output file.
+import functools
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from data_decoder import config, metrics
+
+# counters of this process, shown in status mode. saved_s is the decode time
+# of the results that were reused.
+stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "hashed_bytes": 0, "saved_s": 0.0}
+stats_lock = threading.Lock()
+
+# remembered input hashes kept before the oldest are dropped
+max_hashes = 10000
+
+# inputs changed this recently are hashed again next time, their size and
+# modification time could still change within the timestamp resolution
+racy_seconds = 2
+
+# part of every key with config.version, so results of older code aren't
+# reused. Raise it when a change alters decoder output between releases.
+cache_format = 2
+
+
+# folder of the cache, config.cache_dir or the user cache folder
+def cache_folder():
+    if config.cache_dir:
+        return config.cache_dir
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "data_decoder")
+
+def results_folder():
+    return os.path.join(cache_folder(), "results")
+
+def hashes_folder():
+    return os.path.join(cache_folder(), "hashes")
+
+def add_stat(name, value=1):
+    with stats_lock:
+        stats[name] += value
+
+# write a small json file so readers never see half of it
+def write_json(path, data):
+    temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp, path)
+    except OSError:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+# sha256 of a file's content. The last hash is reused while the file keeps
+# its size and modification time.
+def file_digest(path):
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    memo = os.path.join(hashes_folder(), hashlib.sha1(path.encode("utf-8", "surrogateescape")).hexdigest() + ".json")
+    try:
+        with open(memo, "r", encoding="utf-8") as f:
+            known = json.load(f)
+        if known["path"] == path and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            return known["digest"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    add_stat("hashed_bytes", st.st_size)
+    digest = digest.hexdigest()
+
+    if time.time() - st.st_mtime > racy_seconds:
+        os.makedirs(hashes_folder(), exist_ok=True)
+        write_json(memo, {"path": path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest})
+    return digest
+
+# cache key of a decode, None when the input can't be read (the decoder
+# reports that itself). companions are suffixes of files that belong to the
+# input, like the write-ahead log of a sqlite database.
+def result_key(op, input_file, options, companions=()):
+    try:
+        digests = [file_digest(input_file)]
+        for suffix in companions:
+            companion = os.fspath(input_file) + suffix
+            if os.path.isfile(companion) and os.path.getsize(companion):
+                digests.append(file_digest(companion))
+    except (OSError, TypeError):
+        return None
+    key = json.dumps([op, config.version, cache_format, digests, options], sort_keys=True, default=repr)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+# a hard linked output shares its file with the cache, so it is removed
+# before a decoder writes to it
+def release_output(output_file):
+    try:
+        if os.stat(output_file).st_nlink > 1:
+            os.remove(output_file)
+    except OSError:
+        pass
+
+# note the last use of a result on its .json file
+def mark_used(key):
+    try:
+        os.utime(os.path.join(results_folder(), key + ".json"))
+    except OSError:
+        pass
+
+# put the cached result at output_file, False when there is none
+def restore(key, output_file):
+    entry = os.path.join(results_folder(), key)
+    if not os.path.isfile(entry):
+        return False
+    try:
+        release_output(output_file)
+        linked = False
+        if config.cache_mode == "link":
+            try:
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+                os.link(entry, output_file)
+                linked = True
+            except OSError:
+                # other drive, or links aren't supported
+                pass
+        if not linked:
+            shutil.copyfile(entry, output_file)
+    except OSError:
+        return False
+    mark_used(key)
+    return True
+
+# decode time of a cached result, 0 when unknown
+def result_elapsed(key):
+    try:
+        with open(os.path.join(results_folder(), key + ".json"), "r", encoding="utf-8") as f:
+            return json.load(f).get("elapsed", 0)
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+# copy a fresh output into the cache and trim it
+def store(key, op, input_file, output_file, elapsed):
+    limit = config.cache_size_mb * 1024 * 1024
+    try:
+        if os.path.getsize(output_file) > limit:
+            return
+        folder = results_folder()
+        os.makedirs(folder, exist_ok=True)
+        entry = os.path.join(folder, key)
+        temp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copyfile(output_file, temp)
+            os.replace(temp, entry)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+    except OSError:
+        # the cache is only an optimisation
+        return
+    write_json(entry + ".json", {"op": op, "input": os.path.abspath(input_file), "elapsed": round(elapsed, 6)})
+    add_stat("stored")
+    trim(limit)
+
+# the cached results as (last use, size, key), oldest first
+def cached_results():
+    results = []
+    try:
+        with os.scandir(results_folder()) as entries:
+            for entry in entries:
+                if "." in entry.name:
+                    continue
+                try:
+                    size = entry.stat().st_size
+                    used = os.stat(entry.path + ".json").st_mtime
+                except OSError:
+                    # no .json, the store was interrupted
+                    try:
+                        used = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                results.append((used, size, entry.name))
+    except OSError:
+        pass
+    results.sort()
+    return results
+
+# drop the least recently used results until the cache fits in limit bytes
+def trim(limit):
+    results = cached_results()
+    total = sum(size for _, size, _ in results)
+    for _, size, key in results:
+        if total <= limit:
+            break
+        for path in (key, key + ".json"):
+            try:
+                os.remove(os.path.join(results_folder(), path))
+            except OSError:
+                pass
+        total -= size
+        add_stat("evicted")
+
+    try:
+        memos = [entry for entry in os.scandir(hashes_folder()) if entry.name.endswith(".json")]
+    except OSError:
+        return
+    if len(memos) > max_hashes:
+        memos.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in memos[:len(memos) - max_hashes // 2]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+# results, bytes in the cache
+def cache_usage():
+    results = cached_results()
+    return len(results), sum(size for _, size, _ in results)
+
+# remove every cached result and remembered hash, returns how many results
+def clear_cache():
+    removed = len(cached_results())
+    for folder in (results_folder(), hashes_folder()):
+        shutil.rmtree(folder, ignore_errors=True)
+    return removed
+
+
+# Decorator for decoders that write one output file: the first argument is
+# the input, the second the output, the rest are options. ignore names the
+# options that don't change the output (batch sizes, worker counts).
+# Decoders report success by returning True, only those outputs are kept.
+def cached(op, ignore=(), companions=()):
+    def wrap(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if not config.result_cache:
+                return func(*args, **kwargs)
+
+            import inspect
+            bound = inspect.signature(func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            values = list(bound.arguments.items())
+            input_file, output_file = values[0][1], values[1][1]
+            options = {name: value for name, value in values[2:] if name not in ignore}
+
+            key = result_key(op, input_file, options, companions)
+            if key is None:
+                return func(*args, **kwargs)
+
+            if restore(key, output_file):
+                add_stat("hits")
+                add_stat("saved_s", result_elapsed(key))
+                metrics.annotate(cache="hit")
+                print(f"Cached result of {input_file} saved to: {output_file}")
+                return True
+
+            add_stat("misses")
+            metrics.annotate(cache="miss")
+            release_output(output_file)
+            began = time.perf_counter()
+            result = func(*args, **kwargs)
+            if result is True:
+                store(key, op, input_file, output_file, time.perf_counter() - began)
+            return result
+        return run
+    return wrap
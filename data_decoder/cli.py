@@ -0,0 +1,536 @@
+import argparse
+import json
+import os
+import shlex
+import sys
+import time
+
+from data_decoder import config
+from data_decoder.config import output_formats, valid_num_types, version
+
+
+# Headless mode
+# "data_decoder <decoder> ..." runs one decode without the interactive menu
+# and exits with 0 on success, 1 on failure. "data_decoder job <file>" runs a
+# list of decodes back to back in this process. Decoder modules are only
+# imported once a decode needs them, so a run loads just its own decoder.
+
+# subcommands that switch to headless mode
+cli_commands = ("xml", "csv", "sql", "yaml", "num", "job", "decode-dir", "bench", "serve", "submit")
+
+# decoder used for each file extension when decoding whole directories
+decode_extensions = {
+    ".xml": "xml",
+    ".csv": "csv",
+    ".sqlite": "sql",
+    ".sqlite3": "sql",
+    ".db": "sql",
+    ".yaml": "yaml",
+    ".yml": "yaml"
+}
+
+# default output names, same as the interactive modes
+def default_output_file(decoder, input_file, column=None, fmt=None):
+    if decoder in ("sql", "yaml"):
+        from data_decoder.json_output import json_output_file
+        return json_output_file(input_file, fmt or config.output_format)
+    if decoder == "num" and input_file == "-":
+        return "-"
+    base_name = os.path.splitext(input_file)[0]
+    if decoder == "csv":
+        return base_name + f"_{column}_decoded.txt"
+    return base_name + "_decoded.txt"
+
+# run a single decode, returns True when it succeeded.
+# Options are the same names the command line parser stores them under.
+def run_decode(decoder, input_file, output_file=None, **options):
+    try:
+        if decoder == "xml":
+            from data_decoder.xml_decoder import (
+                export_xml_records, extract_text_from_xml, extract_text_from_xml_stream
+            )
+
+            if options.get("record_path"):
+                from data_decoder.json_output import json_output_file
+
+                fmt = options.get("output_format") or "jsonl"
+                output_file = output_file or json_output_file(input_file, fmt)
+                return export_xml_records(input_file, output_file, options["record_path"], fmt)
+
+            output_file = output_file or default_output_file(decoder, input_file)
+            if options.get("stream"):
+                return extract_text_from_xml_stream(input_file, output_file)
+            return extract_text_from_xml(input_file, output_file)
+
+        if decoder == "csv":
+            from data_decoder.csv_decoder import decode_csv, decode_csv_batch
+
+            input_files = input_file if isinstance(input_file, list) else [input_file]
+            columns = options.get("columns") or []
+            if isinstance(columns, str):
+                columns = [c.strip() for c in columns.split(",") if c.strip()]
+            if not columns:
+                print("No CSV columns given.")
+                return False
+            if output_file:
+                if len(input_files) != 1 or len(columns) != 1:
+                    print("An output file can only be given for one CSV file and one column.")
+                    return False
+                return decode_csv(input_files[0], output_file, columns[0])
+            return decode_csv_batch(input_files, columns)
+
+        if decoder == "sql":
+            from data_decoder.json_output import json_output_file
+            from data_decoder.sqlite_decoder import (
+                export_sqlite_columns, export_sqlite_incremental, export_sqlite_json, sqlite_selection
+            )
+
+            selection = sqlite_selection(
+                options.get("tables"), options.get("exclude"), options.get("table_columns"),
+                options.get("where"), options.get("limit")
+            )
+            batch_size = options.get("batch_size") or config.sqlite_batch_size
+
+            if options.get("incremental"):
+                if selection:
+                    print("Incremental exports always include every table, column and row.")
+                    return False
+                output_file = output_file or json_output_file(input_file, "jsonl")
+                return export_sqlite_incremental(input_file, output_file, batch_size)
+
+            if options.get("columnar"):
+                output_file = output_file or input_file + ".columns"
+                return export_sqlite_columns(input_file, output_file, batch_size, selection)
+
+            fmt = options.get("output_format") or config.output_format
+            output_file = output_file or default_output_file(decoder, input_file, fmt=fmt)
+            return export_sqlite_json(
+                input_file, output_file, batch_size,
+                options.get("workers") or 1,
+                fmt, selection
+            )
+
+        if decoder == "yaml":
+            from data_decoder.yaml_decoder import export_yaml_json
+
+            fmt = options.get("output_format") or config.output_format
+            output_file = output_file or default_output_file(decoder, input_file, fmt=fmt)
+            return export_yaml_json(input_file, output_file, options.get("stream", False), fmt)
+
+        if decoder == "num":
+            from data_decoder.num_decoder import convert_binary_file, convert_num_file, num_chunk_size
+
+            output_file = output_file or default_output_file(decoder, input_file)
+            chunk_size = options.get("chunk_size")
+            if chunk_size is None:
+                chunk_size = num_chunk_size
+            type_in = options.get("type_in") or config.selectednumbers[0]
+            type_out = options.get("type_out") or config.selectednumbers[1]
+            if options.get("binary"):
+                if type_out is None:
+                    print("No output number type given.")
+                    return False
+                bytes_per_line = options.get("bytes_per_line")
+                if bytes_per_line is None:
+                    bytes_per_line = 16
+                if bytes_per_line < 1:
+                    print("Bytes per line must be at least 1.")
+                    return False
+                return convert_binary_file(
+                    input_file, output_file, type_out,
+                    bytes_per_line, chunk_size
+                ) > 0
+            if type_in is None or type_out is None:
+                print("Both input and output number types are needed.")
+                return False
+            return convert_num_file(
+                input_file, output_file, type_out, type_in,
+                config.per_byte if options.get("per_byte") is None else options["per_byte"],
+                chunk_size,
+                options.get("workers") or 1
+            ) > 0
+
+        print(f"Unknown decoder: {decoder}")
+        return False
+
+    except (OSError, ValueError) as e:
+        print(f"Error decoding {input_file}: {e}")
+        return False
+
+# directory worker: decode one file, returns (ok, seconds). result_cache is
+# passed along because worker processes don't see the parent's setting.
+def decode_dir_file(decoder, input_file, columns, result_cache=False):
+    config.result_cache = result_cache
+    began = time.perf_counter()
+    ok = run_decode(decoder, input_file, columns=columns)
+    return ok, time.perf_counter() - began
+
+# Directory decoder
+# Walks a directory tree, decodes every file with a known extension on a
+# thread (or process) pool and prints a summary. Files whose outputs are all
+# newer than the input are skipped unless force is set, so reruns only do
+# what changed. CSV files need the columns to extract. Returns how many
+# files failed.
+def decode_directory(root, workers=4, use_processes=False, columns=None, force=False):
+    if not os.path.isdir(root):
+        print(f"Directory not found: {root}")
+        return 1
+    if workers < 1:
+        print("Workers must be at least 1.")
+        return 1
+
+    # (path, decoder, outputs, status) for every candidate file
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            decoder = decode_extensions.get(os.path.splitext(filename)[1].lower())
+            if decoder is None:
+                continue
+            path = os.path.join(dirpath, filename)
+
+            if decoder == "csv":
+                if not columns:
+                    entries.append([path, decoder, [], "skipped (no columns)"])
+                    continue
+                outputs = [default_output_file(decoder, path, column) for column in columns]
+            else:
+                outputs = [default_output_file(decoder, path)]
+
+            mtime = os.path.getmtime(path)
+            if not force and all(os.path.exists(o) and os.path.getmtime(o) >= mtime for o in outputs):
+                entries.append([path, decoder, outputs, "up to date"])
+            else:
+                entries.append([path, decoder, outputs, None])
+
+    todo = [entry for entry in entries if entry[3] is None]
+    timings = {}
+    start = time.perf_counter()
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        futures = {}
+        for entry in todo:
+            futures[pool.submit(decode_dir_file, entry[1], entry[0], columns, config.result_cache)] = entry
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                ok, elapsed = future.result()
+            except Exception as e:
+                print(f"Error decoding {entry[0]}: {e}")
+                ok, elapsed = False, 0.0
+            entry[3] = "ok" if ok else "FAILED"
+            timings[entry[0]] = elapsed
+
+    wall = time.perf_counter() - start
+
+    # summary
+    print()
+    print(f"{'status':<22} {'time':>8} {'in':>12} {'out':>12}  file")
+    failed = 0
+    bytes_in = 0
+    for path, decoder, outputs, status in entries:
+        size_in = os.path.getsize(path)
+        size_out = sum(os.path.getsize(o) for o in outputs if os.path.exists(o))
+        elapsed = f"{timings[path]:.2f}s" if path in timings else "-"
+        print(f"{status:<22} {elapsed:>8} {size_in:>12,} {size_out:>12,}  {path}")
+        if status == "FAILED":
+            failed += 1
+        if path in timings:
+            bytes_in += size_in
+
+    print(f"{len(entries)} files, {len(todo)} decoded, {failed} failed, "
+          f"{len(entries) - len(todo)} skipped in {wall:.2f}s "
+          f"({bytes_in / wall / 1e6 if wall > 0 else 0:.1f} MB/s)")
+    return failed
+
+# argument parser for headless mode
+def build_cli_parser():
+    parser = argparse.ArgumentParser(prog="data_decoder", description=f"Data Decoder App v{version}")
+    sub = parser.add_subparsers(dest="decoder", required=True)
+
+    # instrumentation options of every decode command
+    measure = argparse.ArgumentParser(add_help=False)
+    measure.add_argument("--metrics", dest="metrics_file", metavar="FILE.jsonl",
+                         help="append timings, sizes and memory of every decode to a JSON Lines file")
+    measure.add_argument("--profile", choices=("cprofile", "tracemalloc"),
+                         help="save a cProfile or tracemalloc capture of every decode")
+
+    # result cache switch of the commands that decode xml, sqlite or yaml
+    caching = argparse.ArgumentParser(add_help=False)
+    caching.add_argument("--cache", dest="cache", action="store_true", default=None,
+                         help="reuse earlier outputs of unchanged files (default from config)")
+    caching.add_argument("--no-cache", dest="cache", action="store_false", help="always decode")
+
+    p = sub.add_parser("xml", parents=[measure, caching], help="extract text from an XML file")
+    p.add_argument("input_file")
+    p.add_argument("-o", "--output", dest="output_file")
+    p.add_argument("--stream", action="store_true", help="decode while reading (low memory)")
+    p.add_argument("--records", dest="record_path", metavar="PATH",
+                   help="write every element at PATH (like /feed/entry) as json instead of text")
+    p.add_argument("--format", dest="output_format", choices=output_formats,
+                   help="json layout of --records (default jsonl, one record per line)")
+
+    p = sub.add_parser("csv", parents=[measure], help="extract columns from CSV files")
+    p.add_argument("input_file", nargs="+", help="CSV files or glob patterns")
+    p.add_argument("-c", "--columns", required=True, help="comma separated column names")
+    p.add_argument("-o", "--output", dest="output_file", help="only for one file and one column")
+
+    p = sub.add_parser("sql", parents=[measure, caching], help="convert a SQLite database to JSON")
+    p.add_argument("input_file")
+    p.add_argument("-o", "--output", dest="output_file")
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--batch-size", dest="batch_size", type=int)
+    p.add_argument("--format", dest="output_format", choices=output_formats, help="json layout (default from config)")
+    p.add_argument("--columnar", action="store_true", help="write typed column files into a directory instead of json")
+    p.add_argument("--incremental", action="store_true", help="append only new rows to a json lines export")
+    p.add_argument("--tables", help="comma separated table names or patterns to export")
+    p.add_argument("--exclude", help="comma separated table names or patterns to skip")
+    p.add_argument("--columns", dest="table_columns", action="append", metavar="TABLE:COLS",
+                   help="columns to export from a table, e.g. users:id,name (repeatable)")
+    p.add_argument("--where", help="sql row filter applied to every exported table")
+    p.add_argument("--limit", type=int, help="export at most this many rows per table")
+
+    p = sub.add_parser("yaml", parents=[measure, caching], help="convert YAML to JSON")
+    p.add_argument("input_file")
+    p.add_argument("-o", "--output", dest="output_file")
+    p.add_argument("--stream", action="store_true", help="write entries while reading (low memory)")
+    p.add_argument("--format", dest="output_format", choices=output_formats, help="json layout (default from config)")
+
+    p = sub.add_parser("num", parents=[measure], help="convert numbers between bases")
+    p.add_argument("input_file", help="file of values, or - for stdin")
+    p.add_argument("-o", "--output", dest="output_file", help="output file, or - for stdout")
+    p.add_argument("--from", dest="type_in", choices=list(valid_num_types))
+    p.add_argument("--to", dest="type_out", choices=list(valid_num_types))
+    p.add_argument("--per-byte", dest="per_byte", action="store_true", default=None)
+    p.add_argument("--no-per-byte", dest="per_byte", action="store_false")
+    p.add_argument("--binary", action="store_true", help="read the input as raw bytes")
+    p.add_argument("--bytes-per-line", dest="bytes_per_line", type=int)
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--chunk", dest="chunk_size", type=int)
+
+    p = sub.add_parser("decode-dir", parents=[measure, caching], help="decode every known file in a directory tree")
+    p.add_argument("input_file", metavar="directory")
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--processes", action="store_true", help="use worker processes instead of threads")
+    p.add_argument("-c", "--columns", help="comma separated columns to extract from CSV files")
+    p.add_argument("--force", action="store_true", help="decode files even when their output is newer")
+
+    p = sub.add_parser("job", parents=[measure, caching], help="run many decodes listed in a job file")
+    p.add_argument("job_file", help="JSON list of jobs, or one command line per line")
+
+    from data_decoder.bench import bench_cases
+
+    p = sub.add_parser("bench", help="benchmark the decoders on generated data")
+    p.add_argument("--cases", help="comma separated cases to run (default all): " + ", ".join(bench_cases))
+    p.add_argument("--scale", type=float, default=1.0, help="input size multiplier (default 1)")
+    p.add_argument("--repeats", type=int, default=5, help="timed runs per case (default 5)")
+    p.add_argument("-o", "--output", dest="output_file", help="results file (default bench-<time>.json)")
+    p.add_argument("--compare", dest="compare_file", help="earlier results file to compare with")
+    p.add_argument("--threshold", type=float, default=10.0,
+                   help="throughput drop in percent that counts as a regression (default 10)")
+    p.add_argument("--keep", dest="keep_dir", help="generate the inputs into this folder and keep them")
+
+    # where the decode server listens, for serve and submit
+    address = argparse.ArgumentParser(add_help=False)
+    address.add_argument("--socket", dest="socket_path",
+                         help="unix socket file (default: server.sock in a folder only this user can open)")
+    address.add_argument("--host", help="use tcp on this host (default 127.0.0.1), requests need the server's token")
+    address.add_argument("--port", type=int, help="use tcp on this port (default 8765, and the default without unix sockets)")
+
+    p = sub.add_parser("serve", parents=[address, caching], help="run a decode server that takes jobs over a socket")
+    p.add_argument("--workers", type=int, help="jobs run at a time (default: number of cpus)")
+    p.add_argument("--queue", dest="queue_size", type=int, default=100,
+                   help="jobs that can wait for a worker before clients are slowed down (default 100)")
+    p.add_argument("--threads", dest="use_threads", action="store_true", help="run jobs on threads instead of processes")
+    p.add_argument("--metrics", dest="metrics_file", metavar="FILE.jsonl",
+                   help="append timings, sizes and memory of every job to a JSON Lines file")
+
+    p = sub.add_parser("submit", parents=[address], help="send a job file or a command to a running decode server")
+    p.add_argument("job_file", nargs="?", help="JSON list of jobs, or one command line per line")
+    p.add_argument("--command", choices=("ping", "stats", "shutdown"), help="send a server command instead of jobs")
+
+    return parser
+
+# read a job file into a list of run_decode keyword dicts. JSON files hold a
+# list (or {"jobs": [...]}) of objects, anything else is one command line per
+# line, like the headless arguments.
+def load_jobs(job_file, parser):
+    with open(job_file, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    if text.lstrip().startswith(("[", "{")):
+        jobs = json.loads(text)
+        if isinstance(jobs, dict):
+            jobs = jobs.get("jobs", [])
+        return jobs
+
+    jobs = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            namespace = parser.parse_args(shlex.split(line))
+        except SystemExit:
+            # argparse already printed why
+            jobs.append({"decoder": None, "line": line})
+            continue
+        if namespace.decoder == "job":
+            print(f"Job files can't run other job files: {line}")
+            jobs.append({"decoder": None, "line": line})
+            continue
+        jobs.append(vars(namespace))
+    return jobs
+
+# run every job, returns how many failed
+def run_jobs(jobs):
+    failed = 0
+    start = time.perf_counter()
+    for n, job in enumerate(jobs, 1):
+        job = dict(job)
+        decoder = job.pop("decoder", None)
+        input_file = job.pop("input_file", None)
+        job.pop("line", None)
+        # --metrics and --profile of a job line only apply to that job
+        measure = {"metrics_file": job.pop("metrics_file", None), "profile_mode": job.pop("profile", None)}
+        cache = job.pop("cache", None)
+        if decoder is None or input_file is None:
+            print(f"[job {n}] invalid job, skipped")
+            failed += 1
+            continue
+
+        began = time.perf_counter()
+        # so does --cache / --no-cache
+        saved_cache = config.result_cache
+        if cache is not None:
+            config.result_cache = cache
+        if any(measure.values()):
+            from data_decoder import metrics
+            saved = {name: getattr(metrics, name) for name in measure}
+            for name, value in measure.items():
+                setattr(metrics, name, value or saved[name])
+            try:
+                ok = run_decode(decoder, input_file, **job)
+            finally:
+                for name, value in saved.items():
+                    setattr(metrics, name, value)
+        else:
+            ok = run_decode(decoder, input_file, **job)
+        config.result_cache = saved_cache
+        name = " ".join(input_file) if isinstance(input_file, list) else input_file
+        print(f"[job {n}] {decoder} {name}: {'ok' if ok else 'FAILED'} ({time.perf_counter() - began:.2f}s)")
+        if not ok:
+            failed += 1
+
+    print(f"{len(jobs)} jobs, {failed} failed in {time.perf_counter() - start:.2f}s")
+    return failed
+
+# job with its input and output paths made absolute
+def server_job(job):
+    job = dict(job)
+    for key in ("input_file", "output_file", "metrics_file"):
+        value = job.get(key)
+        if isinstance(value, list):
+            job[key] = [os.path.abspath(v) for v in value]
+        elif isinstance(value, str) and value != "-":
+            job[key] = os.path.abspath(value)
+    return job
+
+# send a job file (or a command) to a decode server and print the results
+# like run_jobs, returns the exit code
+def submit_job_file(namespace, parser):
+    from data_decoder.server import send_command, submit_jobs
+
+    address = (namespace.socket_path, namespace.host, namespace.port)
+    try:
+        if namespace.command:
+            print(json.dumps(send_command(namespace.command, *address), indent=2))
+            return 0
+        if not namespace.job_file:
+            print("Give a job file or --command.")
+            return 1
+
+        # the server may run in another folder, so paths go out absolute
+        jobs = [server_job(job) for job in load_jobs(namespace.job_file, parser)]
+        failed = 0
+        start = time.perf_counter()
+        for n, (job, response) in enumerate(submit_jobs(jobs, *address), 1):
+            for message in response.get("messages", []):
+                print(f"  {message}")
+            name = job.get("input_file")
+            name = " ".join(name) if isinstance(name, list) else name
+            status = "ok" if response.get("ok") else f"FAILED {response.get('error', '')}".rstrip()
+            print(f"[job {n}] {job.get('decoder')} {name}: {status} ({response.get('elapsed', 0):.2f}s)")
+            if not response.get("ok"):
+                failed += 1
+    except (OSError, ValueError) as e:
+        print(f"Could not submit to the decode server: {e}")
+        return 1
+
+    print(f"{len(jobs)} jobs, {failed} failed in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+# headless entry point, returns the exit code
+def run_cli(argv):
+    parser = build_cli_parser()
+    namespace = parser.parse_args(argv)
+
+    options = vars(namespace)
+    cache = options.pop("cache", None)
+    if cache is not None:
+        config.result_cache = cache
+
+    if namespace.decoder == "serve":
+        from data_decoder.server import run_serve_command
+        options.pop("decoder")
+        return run_serve_command(**options)
+
+    if namespace.decoder == "submit":
+        return submit_job_file(namespace, parser)
+
+    metrics_file = options.pop("metrics_file", None)
+    profile = options.pop("profile", None)
+    if metrics_file or profile:
+        from data_decoder import metrics
+        metrics.metrics_file = metrics_file
+        metrics.profile_mode = profile
+
+    if namespace.decoder == "job":
+        try:
+            jobs = load_jobs(namespace.job_file, parser)
+        except (OSError, ValueError) as e:
+            print(f"Could not read job file: {e}")
+            return 1
+        return 1 if run_jobs(jobs) else 0
+
+    if namespace.decoder == "bench":
+        from data_decoder.bench import run_bench_command
+        options.pop("decoder")
+        return run_bench_command(**options)
+
+    if namespace.decoder == "decode-dir":
+        columns = [c.strip() for c in (namespace.columns or "").split(",") if c.strip()]
+        failed = decode_directory(namespace.input_file, namespace.workers, namespace.processes, columns, namespace.force)
+        return 1 if failed else 0
+
+    return 0 if run_decode(options.pop("decoder"), options.pop("input_file"), **options) else 1
+
+# entry point of "python -m data_decoder" and the exe. Known subcommands run
+# headless, anything else opens the interactive menu.
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+
+    # needed for process pools in the frozen exe
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+
+    # headless mode, no menu or prompts
+    if args and (args[0] in cli_commands or args[0] in ("-h", "--help")):
+        return run_cli(args)
+
+    from data_decoder.repl import run_repl
+    return run_repl(args)
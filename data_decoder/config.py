@@ -0,0 +1,108 @@
+# Settings shared by the decoders and the interactive menu, persisted in
+# data_decoder_config.json in the working directory.
+import os
+import json
+
+
+# Globals
+
+# Define available decoders
+decode_types = {
+    "/xml": "xml",
+    "/sql": "sql",
+    "/yaml": "yaml",
+    "/csv": "csv",
+    "/num": "num",
+    "/status": "status"
+}
+
+valid_num_types = {
+    "bin": 2,
+    "oct": 8,
+    "dec": 10,
+    "hex": 16
+}
+
+# selected number in.out types
+selectednumbers = [None, None]
+
+# decoder per byte toggle
+per_byte = True
+
+# rows fetched per batch when exporting sqlite tables
+sqlite_batch_size = 1000
+
+# json layout written by the sql and yaml decoders
+output_formats = ("pretty", "compact", "jsonl")
+output_format = "pretty"
+
+# result cache: reuse the earlier output when the same xml, yaml or sqlite
+# file is decoded again with the same options
+result_cache = False
+
+# size cap of the cache in megabytes, least recently used results go first
+cache_size_mb = 512
+
+# how a cached result becomes the output: "copy" it or hard "link" it
+cache_modes = ("copy", "link")
+cache_mode = "copy"
+
+# cache folder, None for the user cache folder
+cache_dir = None
+
+version = "1.0.4"
+
+# get current directory
+current_dir = os.getcwd()
+
+# Config file path
+config_file = os.path.join(current_dir, "data_decoder_config.json")
+
+# versions
+versions = {
+    "alpha1": {
+        "data": "unknown",  
+        "features": "unknown"
+    },
+
+}
+
+# Load config on startup
+def load_config():
+    global selectednumbers, per_byte, sqlite_batch_size, output_format
+    global result_cache, cache_size_mb, cache_mode, cache_dir
+    if os.path.exists(config_file):
+        try:
+            with open(config_file, 'r') as f:
+                config = json.load(f)
+                selectednumbers = config.get('selectednumbers', [None, None])
+                per_byte = config.get('per_byte', True)
+                sqlite_batch_size = config.get('sqlite_batch_size', 1000)
+                output_format = config.get('output_format', "pretty")
+                result_cache = config.get('result_cache', False)
+                cache_size_mb = config.get('cache_size_mb', 512)
+                cache_mode = config.get('cache_mode', "copy")
+                cache_dir = config.get('cache_dir')
+        except (json.JSONDecodeError, KeyError):
+            pass  # Use defaults if config is corrupted
+
+# Save config on changes
+def save_config():
+    config = {
+        'selectednumbers': selectednumbers,
+        'per_byte': per_byte,
+        'sqlite_batch_size': sqlite_batch_size,
+        'output_format': output_format,
+        'result_cache': result_cache,
+        'cache_size_mb': cache_size_mb,
+        'cache_mode': cache_mode,
+        'cache_dir': cache_dir
+    }
+    try:
+        with open(config_file, 'w') as f:
+            json.dump(config, f, indent=2)
+    except Exception:
+        pass  # Silently fail if can't save
+
+# Load config at start
+load_config()
@@ -0,0 +1,231 @@
+# Live console
+# A table that refreshes every second above a command prompt, used by the
+# debug screen. Keys and the refresh timer are events on an asyncio loop, so
+# nothing runs in between: on POSIX stdin is switched to cbreak mode and
+# watched with add_reader (select), on Windows a thread blocks on the console
+# input handle and hands the keys to the loop. A refresh only rewrites the
+# lines that changed, and command output is kept in a few lines under the
+# table so the layout never shifts.
+import asyncio
+import codecs
+import contextlib
+import io
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+
+# command output lines shown under the table
+message_lines = 6
+
+# colour and cursor escape codes, which take no room on screen
+ansi_codes = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+# cut a line to the terminal width so it never wraps, which would throw the
+# line count used for cursor moves off
+def fit(line, width):
+    plain = ansi_codes.sub("", line)
+    if len(plain) < width:
+        return line
+    return plain[:max(width - 1, 1)]
+
+# Run the console until run_command returns False or Ctrl+C / Ctrl+D is
+# pressed. build_lines returns the table lines, run_command handles one
+# command line and prints its output. Without a terminal it falls back to
+# plain line by line input.
+def run_live_console(build_lines, run_command, prompt="> "):
+    if not (sys.stdin.isatty() and sys.stdout.isatty()):
+        return run_plain_console(build_lines, run_command, prompt)
+
+    if os.name == "nt":
+        return asyncio.run(live_console(build_lines, run_command, prompt))
+
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    try:
+        return asyncio.run(live_console(build_lines, run_command, prompt))
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+# console without cursor control, for pipes and dumb terminals: the table is
+# printed once at the start and again after every command
+def run_plain_console(build_lines, run_command, prompt="> "):
+    print("\n".join(build_lines()))
+    while True:
+        try:
+            command = input(prompt).strip()
+        except EOFError:
+            return
+        if not command:
+            continue
+        if run_command(command) is False:
+            return
+        print("\n".join(build_lines()))
+
+async def live_console(build_lines, run_command, prompt):
+    loop = asyncio.get_running_loop()
+    closed = loop.create_future()
+
+    # lines on screen above the prompt, and the width they were cut to
+    shown = []
+    shown_width = None
+    messages = []
+    buffer = ""
+    # position inside an escape sequence (arrow keys and such) being skipped
+    escape = 0
+
+    def write(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    # prompt rewrites the input line even when no table line changed
+    def redraw(prompt_line=False):
+        nonlocal shown, shown_width
+        width = shutil.get_terminal_size().columns
+        lines = [fit(line, width) for line in build_lines() + messages[-message_lines:]]
+
+        out = []
+        if len(lines) != len(shown) or width != shown_width:
+            # the layout changed, draw everything again
+            if shown:
+                out.append(f"\033[{len(shown)}A")
+            out.append("\r\033[J")
+            out.extend(line + "\n" for line in lines)
+        else:
+            for i, line in enumerate(lines):
+                if line != shown[i]:
+                    up = len(shown) - i
+                    out.append(f"\033[{up}A\r\033[2K{line}\033[{up}B")
+            if not out and not prompt_line:
+                return
+        out.append("\r\033[2K" + prompt + buffer)
+        write("".join(out))
+        shown = lines
+        shown_width = width
+
+    # redraw on every new second, which is when the clock line changes
+    def tick():
+        nonlocal timer
+        redraw()
+        # just past the second, timers can fire a little early
+        timer = loop.call_later(1.01 - time.time() % 1, tick)
+
+    def submit():
+        nonlocal buffer
+        command = buffer.strip()
+        buffer = ""
+        if not command:
+            return
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            try:
+                keep = run_command(command)
+            except Exception as e:
+                print(f"Command failed: {e}")
+                keep = True
+        messages.append(prompt + command)
+        messages.extend(output.getvalue().splitlines())
+        del messages[:-message_lines]
+        if keep is False and not closed.done():
+            closed.set_result(None)
+
+    def on_keys(text):
+        nonlocal buffer, escape
+        for ch in text:
+            if closed.done():
+                return
+            if escape == 1:
+                # ESC [ or ESC O start a key sequence
+                escape = 2 if ch in "[O" else 0
+                continue
+            if escape == 2:
+                # parameters, ended by a letter or ~
+                if ch.isalpha() or ch == "~":
+                    escape = 0
+                continue
+
+            if ch in "\r\n":
+                submit()
+                redraw(True)
+            elif ch in "\b\x7f":
+                if buffer:
+                    buffer = buffer[:-1]
+                    write("\b \b")
+            elif ch in "\x03\x04":
+                closed.set_result(None)
+            elif ch == "\x1b":
+                escape = 1
+            elif ch.isprintable():
+                buffer += ch
+                write(ch)
+
+    timer = None
+    stop = threading.Event()
+    if os.name == "nt":
+        reader = threading.Thread(target=windows_keys, args=(loop, on_keys, stop), daemon=True)
+        reader.start()
+    else:
+        fd = sys.stdin.fileno()
+        decoder = codecs.getincrementaldecoder(sys.stdin.encoding or "utf-8")("replace")
+        loop.add_reader(fd, lambda: on_keys(decoder.decode(os.read(fd, 1024))))
+
+    try:
+        tick()
+        await closed
+    finally:
+        if timer is not None:
+            timer.cancel()
+        stop.set()
+        if os.name != "nt":
+            loop.remove_reader(sys.stdin.fileno())
+
+        # clear the table and the prompt
+        write((f"\033[{len(shown)}A" if shown else "") + "\r\033[J")
+
+# Windows key reader thread: waits on the console input handle, which wakes
+# it up when input arrives, and passes the typed keys to the loop. The wait
+# times out now and then only to notice that the console was closed.
+def windows_keys(loop, on_keys, stop):
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.GetStdHandle.argtypes = [wintypes.DWORD]
+    kernel32.GetStdHandle.restype = wintypes.HANDLE
+    kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    kernel32.FlushConsoleInputBuffer.argtypes = [wintypes.HANDLE]
+
+    # STD_INPUT_HANDLE
+    handle = kernel32.GetStdHandle(-10 & 0xFFFFFFFF)
+    while not stop.is_set():
+        # 0 is WAIT_OBJECT_0, input is waiting
+        if kernel32.WaitForSingleObject(handle, 250) != 0:
+            continue
+        if not msvcrt.kbhit():
+            # mouse, focus or resize events, drop them or the wait never blocks
+            kernel32.FlushConsoleInputBuffer(handle)
+            continue
+
+        keys = []
+        while msvcrt.kbhit():
+            ch = msvcrt.getwch()
+            if ch in "\x00\xe0":
+                # first half of an arrow or function key, skip both
+                msvcrt.getwch()
+                continue
+            keys.append(ch)
+        if keys and not stop.is_set():
+            try:
+                loop.call_soon_threadsafe(on_keys, "".join(keys))
+            except RuntimeError:
+                # the loop closed while the keys were read
+                return
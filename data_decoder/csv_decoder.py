@@ -0,0 +1,156 @@
+# CSV decoder
+import csv
+import glob
+import os
+import time
+
+from data_decoder.metrics import count, instrumented
+
+
+@instrumented("csv", "rows", output=1)
+def decode_csv(input_file, output_file, column):
+    try:
+        # Open CSV file
+        with open(input_file, newline='', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile)
+
+            # Check if the requested column exists in the CSV header
+            if column not in (reader.fieldnames or []):
+                raise KeyError(f"Column '{column}' not found in CSV file.")
+
+            # Write to output
+            with open(output_file, "w", encoding="utf-8") as txtfile:
+                rows = 0
+                for row in reader:
+                    rows += 1
+                    # short rows have None for the missing columns
+                    value = (row[column] or "").strip()
+                    if value:
+                        txtfile.write(value + "\n")
+                count(rows)
+
+        print(f"CSV column '{column}' decoded to: {output_file}")
+        return True
+
+    except KeyError as e:
+        print(f"Error: {e}")
+        return False
+    except FileNotFoundError:
+        print(f"File not found: {input_file}")
+        return False
+    except csv.Error as e:
+        print(f"CSV parsing error: {e}")
+        return False
+
+# CSV batch decoder
+# Reads every file once and writes each requested column to its own output,
+# instead of one full parse per column like decode_csv.
+@instrumented("csv_batch", "rows")
+def decode_csv_batch(input_files, columns):
+    ok = True
+
+    # expand glob patterns, keep plain paths as they are
+    files = []
+    for entry in input_files:
+        if glob.has_magic(entry):
+            matches = sorted(glob.glob(entry))
+            if not matches:
+                print(f"No files match: {entry}")
+                ok = False
+            files.extend(matches)
+        else:
+            files.append(entry)
+
+    # drop duplicate column names but keep their order
+    columns = list(dict.fromkeys(columns))
+
+    total_rows = 0
+    start = time.perf_counter()
+
+    for input_file in files:
+        try:
+            with open(input_file, newline='', encoding='utf-8') as csvfile:
+                reader = csv.reader(csvfile)
+                header = next(reader, [])
+
+                # header name -> position, last one wins like csv.DictReader
+                index = {name: i for i, name in enumerate(header)}
+
+                found = []
+                for column in columns:
+                    if column in index:
+                        found.append(column)
+                    else:
+                        print(f"Error: Column '{column}' not found in CSV file {input_file}.")
+                        ok = False
+                if not found:
+                    continue
+
+                base_name = os.path.splitext(input_file)[0]
+                outputs = []
+                try:
+                    for column in found:
+                        outputs.append(open(base_name + f"_{column}_decoded.txt", "w", encoding="utf-8", buffering=1 << 20))
+
+                    targets = [(index[column], out.write) for column, out in zip(found, outputs)]
+                    needed = max(i for i, _ in targets) + 1
+
+                    for row in reader:
+                        total_rows += 1
+                        if len(row) >= needed:
+                            for i, write in targets:
+                                value = row[i].strip()
+                                if value:
+                                    write(value + "\n")
+                        else:
+                            # short row, only some columns present
+                            for i, write in targets:
+                                if i < len(row):
+                                    value = row[i].strip()
+                                    if value:
+                                        write(value + "\n")
+                finally:
+                    for out in outputs:
+                        out.close()
+
+            print(f"CSV columns {', '.join(found)} decoded from: {input_file}")
+
+        except FileNotFoundError:
+            print(f"File not found: {input_file}")
+            ok = False
+        except csv.Error as e:
+            print(f"CSV parsing error in {input_file}: {e}")
+            ok = False
+
+    count(total_rows)
+    elapsed = time.perf_counter() - start
+    rate = total_rows / elapsed if elapsed > 0 else 0
+    print(f"Processed {total_rows} rows from {len(files)} file(s) in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return ok
+
+# Stream version for library use: yields {column: value} for every row of a
+# CSV text stream, values stripped and "" when a short row lacks the column.
+# Raises KeyError for a column missing from the header.
+def iter_csv_columns(source, columns):
+    reader = csv.reader(source)
+    header = next(reader, [])
+
+    # header name -> position, last one wins like csv.DictReader
+    index = {name: i for i, name in enumerate(header)}
+    for column in columns:
+        if column not in index:
+            raise KeyError(f"Column '{column}' not found in CSV file.")
+
+    targets = [(column, index[column]) for column in columns]
+    for row in reader:
+        yield {column: (row[i].strip() if i < len(row) else "") for column, i in targets}
+
+# the non empty values of each column, the lines decode_csv writes
+def read_csv_columns(source, columns):
+    columns = list(dict.fromkeys(columns))
+    values = {column: [] for column in columns}
+    for row in iter_csv_columns(source, columns):
+        for column in columns:
+            if row[column]:
+                values[column].append(row[column])
+    return values
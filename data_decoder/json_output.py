@@ -0,0 +1,29 @@
+# JSON writing helpers shared by the sql and yaml decoders
+import json
+
+# faster json encoder for compact output, optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# json.dump(indent=2, sort_keys=True) of a value nested `level` deep
+def indent_json(value, level):
+    return json.dumps(value, indent=2, sort_keys=True).replace("\n", "\n" + "  " * level)
+
+# compact json with sorted keys, through orjson when it is installed.
+# Both keep non-ascii text as is and read back to the same values, but the
+# text isn't identical: orjson spells exponents without "+" and leading
+# zeros (1e20 where json writes 1e+20) and writes NaN and Infinity as null.
+def compact_json(value):
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers over 64 bits, the json module handles them
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+# file name for json output of the sql and yaml decoders
+def json_output_file(input_file, fmt="pretty"):
+    return input_file + (".decoded.jsonl" if fmt == "jsonl" else ".decoded.json")
@@ -0,0 +1,266 @@
+# Instrumentation
+# Every file decode is recorded as an operation: bytes in and out, items
+# handled, elapsed time, throughput and memory. The latest operations are
+# kept for the debug table and can be appended to a JSON Lines file as they
+# finish. A cProfile or tracemalloc capture of each operation is opt-in.
+import collections
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# finished operations kept for the debug table, newest last
+history_size = 100
+operations = collections.deque(maxlen=history_size)
+
+# JSON Lines file every finished operation is appended to, None for none
+metrics_file = None
+
+# capture per operation: None, "cprofile" or "tracemalloc"
+profile_modes = ("cprofile", "tracemalloc")
+profile_mode = None
+
+# folder the captures are written to, None for the current directory
+profile_dir = None
+
+# per thread: stack, the records of the operations running right now
+# (outermost first, only that one is recorded, nested ones add their items
+# to it), and collected, a list finished records are also added to
+local = threading.local()
+
+
+# peak resident memory of this process in bytes, None where it can't be read
+def peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return windows_peak_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes everywhere else
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def windows_peak_rss():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        return None
+
+# size in bytes of a file, a directory tree, a list of files or an open
+# file, None when there is nothing to measure (stdin, values, missing files)
+def path_size(target):
+    if isinstance(target, (list, tuple)):
+        sizes = [path_size(t) for t in target]
+        sizes = [s for s in sizes if s is not None]
+        return sum(sizes) if sizes else None
+    try:
+        if isinstance(target, (str, os.PathLike)):
+            if os.path.isdir(target):
+                return sum(
+                    os.path.getsize(os.path.join(folder, name))
+                    for folder, _, names in os.walk(target) for name in names
+                )
+            return os.path.getsize(target)
+        if hasattr(target, "fileno"):
+            return os.fstat(target.fileno()).st_size
+    except (OSError, ValueError):
+        pass
+    return None
+
+# operations running in this thread
+def running():
+    stack = getattr(local, "stack", None)
+    if stack is None:
+        stack = local.stack = []
+    return stack
+
+# add handled items (rows, lines, entries...) to the running operation
+def count(items):
+    stack = running()
+    if stack:
+        stack[-1]["items"] += items
+
+# add fields to the record of the running operation
+def annotate(**fields):
+    stack = running()
+    if stack:
+        stack[0].update(fields)
+
+# collect the operations this thread finishes inside the block, on top of
+# the usual recording
+@contextlib.contextmanager
+def collect():
+    records = []
+    outer = getattr(local, "collected", None)
+    local.collected = records
+    try:
+        yield records
+    finally:
+        local.collected = outer
+
+
+# Operation recorder
+# Times the block and records it as op. unit names what the items are,
+# input_file and output_file are measured before and after. Nested
+# operations only add their items to the one around them.
+@contextlib.contextmanager
+def operation(op, unit, input_file=None, output_file=None):
+    record = {"op": op, "unit": unit, "items": 0}
+    active = running()
+    if active:
+        active.append(record)
+        try:
+            yield record
+        finally:
+            active.pop()
+            active[-1]["items"] += record["items"]
+        return
+
+    record.update({
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "input": os.fspath(input_file) if isinstance(input_file, (str, os.PathLike)) else None,
+        "output": os.fspath(output_file) if isinstance(output_file, (str, os.PathLike)) else None,
+        "bytes_in": path_size(input_file)
+    })
+    rss_before = peak_rss()
+
+    profiler = None
+    tracing = False
+    if profile_mode == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+    elif profile_mode == "tracemalloc":
+        import tracemalloc
+        tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    active.append(record)
+    began = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield record
+        if "ok" not in record:
+            record["ok"] = True
+    except BaseException as e:
+        record["ok"] = False
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - began
+        active.pop()
+
+        record["elapsed"] = round(elapsed, 6)
+        record["bytes_out"] = path_size(output_file) if output_file != "-" else None
+        record["bytes_per_s"] = round(record["bytes_in"] / elapsed, 1) if record["bytes_in"] and elapsed > 0 else None
+        record["items_per_s"] = round(record["items"] / elapsed, 1) if elapsed > 0 else None
+        record["peak_rss"] = peak_rss()
+        # above zero only when this operation raised the process high-water mark
+        record["rss_growth"] = record["peak_rss"] - rss_before if record["peak_rss"] is not None else None
+
+        if profiler is not None:
+            record["profile"] = write_cprofile(profiler, op)
+        elif profile_mode == "tracemalloc":
+            record["traced_peak"], record["profile"] = write_tracemalloc(op, tracing)
+
+        finish(record)
+
+# a decoder result that means it failed, for decoders reporting success as
+# True or False. Raising always counts as a failure.
+def returned_false(result):
+    return result is False
+
+# decorator form of operation for file decoders: the first argument is the
+# input and the argument at position output (if any) the output. failed
+# tells from the decoder's result whether it failed.
+def instrumented(op, unit, output=None, failed=returned_false):
+    def wrap(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            output_file = args[output] if output is not None and len(args) > output else None
+            with operation(op, unit, args[0] if args else None, output_file) as record:
+                result = func(*args, **kwargs)
+                if failed(result):
+                    record["ok"] = False
+                return result
+        return run
+    return wrap
+
+# capture file name for an operation, unique within the process
+def capture_file(op, extension):
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f"{time.time() % 1:.3f}"[1:]
+    return os.path.join(profile_dir or os.getcwd(), f"profile-{op}-{stamp}{extension}")
+
+# save a cProfile run for pstats / snakeviz, returns the file
+def write_cprofile(profiler, op):
+    path = capture_file(op, ".prof")
+    try:
+        profiler.dump_stats(path)
+    except OSError as e:
+        print(f"Could not write profile {path}: {e}")
+        return None
+    return path
+
+# save the top allocation sites of a tracemalloc run, returns (traced peak,
+# file). Tracing is stopped again when the operation started it.
+def write_tracemalloc(op, started):
+    import tracemalloc
+
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    if started:
+        tracemalloc.stop()
+
+    path = capture_file(op, ".tracemalloc.txt")
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{op}: traced peak {peak} bytes, still allocated at the end:\n")
+            for stat in snapshot.statistics("lineno")[:25]:
+                f.write(f"{stat}\n")
+    except OSError as e:
+        print(f"Could not write memory profile {path}: {e}")
+        return peak, None
+    return peak, path
+
+# keep a finished operation and append it to the metrics file
+def finish(record):
+    operations.append(record)
+    collected = getattr(local, "collected", None)
+    if collected is not None:
+        collected.append(record)
+    if metrics_file:
+        try:
+            with open(metrics_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Could not write metrics to {metrics_file}: {e}")
+
+# write the kept operations to a JSON Lines file, returns how many
+def export_operations(path):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in operations:
+            f.write(json.dumps(record) + "\n")
+    return len(operations)
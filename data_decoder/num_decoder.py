@@ -0,0 +1,356 @@
+# Number converter
+import collections
+import contextlib
+import io
+import mmap
+import os
+import sys
+import time
+
+from data_decoder.config import valid_num_types
+from data_decoder.metrics import count, instrumented
+
+# output format per number type, whole numbers and single bytes
+num_formats = {"bin": "b", "oct": "o", "dec": "d", "hex": "x"}
+byte_formats = {"bin": "08b", "oct": "03o", "dec": "d", "hex": "02x"}
+
+# every byte value already formatted per output type
+byte_tables = {
+    name: [format(b, fmt) for b in range(256)]
+    for name, fmt in byte_formats.items()
+}
+
+# common spellings of every byte value per input type, for parsing without int()
+byte_lookup = {
+    "bin": {},
+    "oct": {},
+    "dec": {},
+    "hex": {}
+}
+for b in range(256):
+    for name, fmts in (("bin", ("b", "08b")), ("oct", ("o", "03o")),
+                       ("dec", ("d", "03d")), ("hex", ("x", "X", "02x", "02X"))):
+        for fmt in fmts:
+            byte_lookup[name][format(b, fmt)] = b
+
+# rough number of bytes read at a time when converting number files
+num_chunk_size = 1 << 20
+
+
+# number covert num type in num type out function
+def convertnum(value, type_out, type_in, per_byte):
+    try:
+        return convert_number(value, type_out, type_in, per_byte)
+    except ValueError as e:
+        print(e)
+        return None
+
+# convertnum without the printing, for library use: raises ValueError with
+# the message convertnum would print
+def convert_number(value, type_out, type_in, per_byte):
+    if type_out not in valid_num_types or type_in not in valid_num_types:
+        raise ValueError("Invalid number type specified.")
+
+    try:
+        base_in = valid_num_types[type_in]
+
+        if not per_byte:
+            num = int(value, base_in)
+            return format(num, num_formats[type_out])
+
+        # =========================
+        # PER-BYTE MODE
+        # =========================
+        # Split input by spaces to support files like "00 FF 0A ..."
+        parts = value.strip().split() if " " in value.strip() else [value.strip()]
+        byte_values = []
+        for part in parts:
+            if type_in == "hex":
+                byte_values.append(int(part, 16))
+            elif type_in == "bin":
+                byte_values.append(int(part, 2))
+            elif type_in == "oct":
+                byte_values.append(int(part, 8))
+            elif type_in == "dec":
+                byte_values.append(int(part, 10))
+            else:
+                raise ValueError("Unsupported input type")
+
+        # Convert each byte to output format
+        output = []
+        fmt = byte_formats[type_out]
+        for b in byte_values:
+            output.append(format(b, fmt))
+
+        return " ".join(output)
+
+    except ValueError as e:
+        raise ValueError(f"Invalid number value: {e}") from None
+
+
+# Bulk number converter
+# Converts many lines with the same settings and yields (line, result) for
+# every non empty line, result being None when the line failed. The type
+# checks and formats are looked up once, and per-byte lines are parsed with
+# bytes.fromhex or the byte_lookup tables and rendered from byte_tables.
+# Lines the fast path can't take are handed to convert, convertnum by
+# default, so results and error messages stay the same.
+def convertnum_lines(lines, type_out, type_in, per_byte, convert=convertnum):
+    if type_out not in valid_num_types or type_in not in valid_num_types:
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line, convert(line, type_out, type_in, per_byte)
+        return
+
+    if not per_byte:
+        base_in = valid_num_types[type_in]
+        fmt = num_formats[type_out]
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line, format(int(line, base_in), fmt)
+            except ValueError:
+                yield line, convert(line, type_out, type_in, per_byte)
+        return
+
+    table = byte_tables[type_out]
+    lookup = byte_lookup[type_in].get
+    hex_in = type_in == "hex"
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # "00 FF 0A": two character tokens split by single spaces
+        if hex_in and len(line) % 3 == 2 and line[2::3] == " " * (len(line) // 3):
+            try:
+                data = bytes.fromhex(line)
+            except ValueError:
+                pass
+            else:
+                yield line, " ".join([table[b] for b in data])
+                continue
+
+        parts = line.split() if " " in line else [line]
+        values = [lookup(part) for part in parts]
+        if None in values:
+            yield line, convert(line, type_out, type_in, per_byte)
+        else:
+            yield line, " ".join([table[b] for b in values])
+
+
+# convert a chunk of lines, reporting the ones that failed
+def convert_num_chunk(lines, type_out, type_in, per_byte):
+    output_lines = []
+    for line, result in convertnum_lines(lines, type_out, type_in, per_byte):
+        if result is not None:
+            output_lines.append(result)
+        else:
+            print(f"Failed to convert line: {line}")
+    return output_lines
+
+# serial chunks: whole lines about chunk_size bytes at a time
+def convert_num_chunks(source, type_out, type_in, per_byte, chunk_size):
+    while True:
+        lines = source.readlines(chunk_size)
+        if not lines:
+            break
+        yield convert_num_chunk(lines, type_out, type_in, per_byte)
+
+# split a file into byte ranges of about chunk_size that end on a line break
+def line_ranges(input_file, chunk_size):
+    size = os.path.getsize(input_file)
+    ranges = []
+    with open(input_file, "rb") as f:
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                f.seek(end - 1)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+# parallel worker: convert the lines in one byte range of a file. Messages
+# are captured and sent back so they can be printed in file order, along with
+# the cpu time spent, which adds up to what a serial run would take.
+def convert_num_range(input_file, start, end, type_out, type_in, per_byte):
+    began = time.process_time()
+    with open(input_file, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    # same newline handling as reading the file in text mode
+    lines = io.StringIO(data.decode("utf-8"), newline=None)
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        output_lines = convert_num_chunk(lines, type_out, type_in, per_byte)
+
+    return output_lines, messages.getvalue(), time.process_time() - began
+
+# parallel chunks: byte ranges converted by a process pool, yielded in order
+# with only a few ranges in flight so memory stays bounded
+def convert_num_chunks_parallel(input_file, type_out, type_in, per_byte, chunk_size, workers):
+    # process pools take a while to import, so only parallel runs load them
+    from concurrent.futures import ProcessPoolExecutor
+
+    began = time.perf_counter()
+    ranges = iter(line_ranges(input_file, chunk_size))
+    busy = 0.0
+    converted = 0
+    pending = collections.deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            def submit_next():
+                for start, end in ranges:
+                    pending.append(pool.submit(convert_num_range, input_file, start, end, type_out, type_in, per_byte))
+                    return
+
+            for _ in range(workers * 2):
+                submit_next()
+
+            while pending:
+                output_lines, messages, elapsed = pending.popleft().result()
+                submit_next()
+                busy += elapsed
+                converted += len(output_lines)
+                sys.stdout.write(messages)
+                yield output_lines
+        finally:
+            for future in pending:
+                future.cancel()
+
+    wall = time.perf_counter() - began
+    speedup = busy / wall if wall > 0 else 0
+    print(f"Converted {converted} lines in {wall:.2f}s on {workers} workers "
+          f"({busy:.2f}s of worker cpu time, about {speedup:.1f}x serial speed)")
+
+# the file converters return how many lines or bytes they wrote, nothing
+# written means no output file and counts as a failure
+def nothing_converted(converted):
+    return not converted
+
+# Streaming number file converter
+# Converts whole lines about chunk_size bytes at a time and writes them
+# straight to the output. "-" reads stdin or writes stdout, in which case
+# messages go to stderr so they don't mix with the values. With workers > 1
+# a file is split into line aligned ranges converted by a process pool, and
+# written back in order. The output file is only created once something was
+# converted.
+@instrumented("num", "values", output=1, failed=nothing_converted)
+def convert_num_file(input_file, output_file, type_out, type_in, per_byte, chunk_size=num_chunk_size, workers=1):
+    to_stdout = output_file == "-"
+    stdout = sys.stdout
+    messages = contextlib.redirect_stdout(sys.stderr) if to_stdout else contextlib.nullcontext()
+
+    with messages:
+        if chunk_size < 1:
+            print("Chunk size must be at least 1 byte.")
+            return 0
+
+        part_file = None if to_stdout else output_file + ".part"
+        out = None
+        source = None
+        converted = 0
+        try:
+            if workers > 1 and input_file != "-":
+                chunks = convert_num_chunks_parallel(input_file, type_out, type_in, per_byte, chunk_size, workers)
+            else:
+                source = sys.stdin if input_file == "-" else open(input_file, "r", encoding="utf-8")
+                chunks = convert_num_chunks(source, type_out, type_in, per_byte, chunk_size)
+
+            try:
+                for output_lines in chunks:
+                    if not output_lines:
+                        continue
+
+                    if out is None:
+                        out = stdout if to_stdout else open(part_file, "w", encoding="utf-8")
+                    else:
+                        out.write("\n")
+                    out.write("\n".join(output_lines))
+                    converted += len(output_lines)
+            finally:
+                chunks.close()
+                if source is not None and source is not sys.stdin:
+                    source.close()
+                if out is not None and out is not stdout:
+                    out.close()
+
+        except FileNotFoundError:
+            print(f"File not found: {input_file}")
+            return 0
+        except UnicodeDecodeError as e:
+            if out is not None and out is not stdout:
+                os.remove(part_file)
+            print(f"Could not read {input_file} as text: {e}")
+            return 0
+
+        count(converted)
+        if not converted:
+            print("No valid values were converted. Output file was not created.")
+        elif to_stdout:
+            stdout.write("\n")
+            stdout.flush()
+        else:
+            os.replace(part_file, output_file)
+            print(f"Converted value saved to: {output_file}")
+
+    return converted
+
+
+# Binary file converter
+# Renders the raw bytes of any file in the output number type, per-byte
+# style, bytes_per_line bytes per line. The file is memory mapped and read
+# through memoryview slices, so large images are never copied or loaded whole.
+@instrumented("num_binary", "bytes", output=1, failed=nothing_converted)
+def convert_binary_file(input_file, output_file, type_out, bytes_per_line=16, chunk_size=num_chunk_size):
+    if type_out not in valid_num_types:
+        print("Invalid number type specified.")
+        return 0
+    if bytes_per_line < 1 or chunk_size < 1:
+        print("Bytes per line and chunk size must be at least 1.")
+        return 0
+
+    table = byte_tables[type_out]
+    # whole lines per chunk
+    step = max(1, chunk_size // bytes_per_line) * bytes_per_line
+    part_file = output_file + ".part"
+
+    try:
+        with open(input_file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                print("File is empty. Output file was not created.")
+                return 0
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view, \
+                    open(part_file, "w", encoding="utf-8") as out:
+                for start in range(0, size, step):
+                    with view[start:start + step] as chunk:
+                        if type_out == "hex":
+                            lines = [chunk[i:i + bytes_per_line].hex(" ") for i in range(0, len(chunk), bytes_per_line)]
+                        else:
+                            lines = [" ".join([table[b] for b in chunk[i:i + bytes_per_line]]) for i in range(0, len(chunk), bytes_per_line)]
+                    if start:
+                        out.write("\n")
+                    out.write("\n".join(lines))
+
+    except FileNotFoundError:
+        print(f"File not found: {input_file}")
+        return 0
+
+    os.replace(part_file, output_file)
+    count(size)
+    print(f"Converted {size} bytes saved to: {output_file}")
+    return size
@@ -0,0 +1,655 @@
+# Interactive menu
+import os
+import shlex
+import sys
+import time
+
+from colorama import init, Fore, Style
+
+from data_decoder import config, metrics
+from data_decoder.config import decode_types, valid_num_types, output_formats, version, current_dir
+
+
+# operations listed in the debug table
+debug_operations = 8
+
+# helper function definitions
+
+# split trailing "--name value" options off a command argument. Every
+# option takes a value, one given without raises ValueError.
+def split_options(text):
+    head, sep, tail = text.partition(" --")
+    options = {}
+    if sep:
+        tokens = shlex.split("--" + tail)
+        i = 0
+        while i < len(tokens):
+            name = tokens[i]
+            if not name.startswith("--"):
+                raise ValueError(f"Unexpected argument: {name}")
+            if i + 1 < len(tokens) and not tokens[i + 1].startswith("--"):
+                options[name[2:]] = tokens[i + 1]
+                i += 2
+            else:
+                raise ValueError(f"{name} needs a value")
+    return head.strip().strip('"'), options
+
+# human readable byte count
+def format_bytes(size):
+    if size is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+# one line per recorded operation for the debug table
+def format_operation(record):
+    name = os.path.basename(record["input"]) if record["input"] else "-"
+    rate = f"{format_bytes(record['bytes_per_s'])}/s" if record["bytes_per_s"] else "-"
+    status = "ok" if record["ok"] else "FAILED"
+    if record.get("cache") == "hit":
+        status += " (cached)"
+    return (f"{record['op']:<14} {name[:24]:<24} {record['items']:>10,} {record['unit']:<7} "
+            f"{format_bytes(record['bytes_in']):>9} -> {format_bytes(record['bytes_out']):>9} "
+            f"{record['elapsed']:8.3f}s {rate:>11} {record['items_per_s'] or 0:>11,.0f}/s "
+            f"peak {format_bytes(record['peak_rss'])} {status}")
+
+def build_debug_table(args):
+    lines = [
+        f"{Fore.CYAN + Style.BRIGHT}=== DEBUG STATUS ==={Style.RESET_ALL}",
+        f"arguments     : {args}",
+        f"Per-byte mode : {'ON' if config.per_byte else 'OFF'}",
+        f"Input type    : {config.selectednumbers[0]}",
+        f"Output type   : {config.selectednumbers[1]}",
+        f"Time          : {time.strftime('%H:%M:%S')}",
+        f"current dir   : {current_dir}",
+        f"version       : v{version}",
+        f"Profiling     : {metrics.profile_mode or 'off'}",
+        f"Metrics file  : {metrics.metrics_file or 'none'}",
+        f"Result cache  : {format_cache_stats()}",
+        f"Peak memory   : {format_bytes(metrics.peak_rss())}",
+        f"{Fore.CYAN + Style.BRIGHT}=== OPERATIONS ({len(metrics.operations)}) ==={Style.RESET_ALL}"
+    ]
+    recent = list(metrics.operations)[-debug_operations:]
+    if recent:
+        lines.extend(format_operation(record) for record in recent)
+    else:
+        lines.append("no decodes yet")
+    lines.append("-" * 30)
+    return lines
+
+
+# result cache state and the hits and misses of this session
+def format_cache_stats():
+    from data_decoder import cache
+
+    if not config.result_cache:
+        return "off"
+    stats = cache.stats
+    lookups = stats["hits"] + stats["misses"]
+    rate = f" ({stats['hits'] / lookups:.0%})" if lookups else ""
+    return (f"on, {stats['hits']} hits{rate}, {stats['misses']} misses, "
+            f"{stats['evicted']} evicted, {stats['saved_s']:.2f}s saved")
+
+# status mode "cache" commands
+def run_cache_command(command):
+    from data_decoder import cache
+
+    args = command.split()[1:]
+    if not args:
+        results, size = cache.cache_usage()
+        print(f"Result cache  : {format_cache_stats()}")
+        print(f"Folder        : {cache.cache_folder()}")
+        print(f"Stored        : {results} results, {format_bytes(size)} of {config.cache_size_mb} MB")
+        print(f"Hit outputs   : {config.cache_mode}")
+        print(f"Hashed        : {format_bytes(cache.stats['hashed_bytes'])} this session")
+    elif args[0].lower() in ("on", "off"):
+        config.result_cache = args[0].lower() == "on"
+        config.save_config()
+        print(f"Result cache turned {args[0].lower()}.")
+    elif args[0].lower() == "size" and len(args) == 2:
+        try:
+            size = int(args[1])
+            if size < 1:
+                raise ValueError
+        except ValueError:
+            print("Give the cache size in whole megabytes, at least 1.")
+            return
+        config.cache_size_mb = size
+        config.save_config()
+        cache.trim(size * 1024 * 1024)
+        print(f"Cache size set to: {size} MB")
+    elif args[0].lower() == "mode" and len(args) == 2 and args[1].lower() in config.cache_modes:
+        config.cache_mode = args[1].lower()
+        config.save_config()
+        print(f"Cached results are now {'linked' if config.cache_mode == 'link' else 'copied'} to the output.")
+    elif args[0].lower() == "clear":
+        print(f"Removed {cache.clear_cache()} cached results.")
+    else:
+        print("Usage: cache [on|off|clear|size <MB>|mode <copy|link>]")
+
+# run one debug console command, returns False to leave debug mode
+def run_debug_command(command):
+    if command.lower() == "exit":
+        return False
+
+    if command.lower() == "help":
+        print("Commands:\n profile <cprofile|tracemalloc|off> - Capture a profile of every following decode\n metrics <file.jsonl|off> - Append every following decode to a JSON Lines file\n export <file.jsonl> - Write the recorded decodes to a JSON Lines file\n reset - Forget the recorded decodes\n exit - Exit debug mode")
+    elif command.lower().startswith("profile "):
+        mode = command[8:].strip().lower()
+        if mode in metrics.profile_modes or mode == "off":
+            metrics.profile_mode = None if mode == "off" else mode
+            print(f"Profiling set to: {mode}")
+        else:
+            print("Invalid profile mode. Valid modes are: cprofile, tracemalloc, off.")
+    elif command.lower().startswith("metrics "):
+        path = command[8:].strip().strip('"')
+        metrics.metrics_file = None if path.lower() == "off" else path
+        print(f"Metrics file set to: {metrics.metrics_file or 'none'}")
+    elif command.lower().startswith("export "):
+        path = command[7:].strip().strip('"')
+        try:
+            print(f"Exported {metrics.export_operations(path)} decodes to: {path}")
+        except OSError as e:
+            print(f"Could not export decodes: {e}")
+    elif command.lower() == "reset":
+        metrics.operations.clear()
+        print("Recorded decodes cleared.")
+    else:
+        print("Unknown command. Type 'help' for options.")
+    return True
+
+
+# run the interactive menu, args are the command line arguments
+def run_repl(args):
+    # Initialize selected decoder variable
+    selected = None
+
+    # Flag to stop validation loop
+    stopvalidation = False
+
+    # setup code
+
+    init()  # Initialize colorama for ANSI colors on Windows
+
+    print("© 2025 David S all rights reserved.\n")
+    print(f"Data Decoder App v{version} \n\nAvailable Decoders:\n/xml\n/sql\n/yaml\n/csv\n/num\n")
+    print("Press Ctrl+C at any time to quit.\nCommands:\nhelp for help in commands,\nexit to exit current mode\nstatus to go into command query mode while in home menu\n")
+
+    # If running as EXE and /q passed, hide the console window
+    if "/q" in args:
+        import ctypes
+        hwnd = ctypes.windll.kernel32.GetConsoleWindow()
+        if hwnd != 0:
+            ctypes.windll.user32.ShowWindow(hwnd, 6)   # 6 = SW_MINIMIZE
+    for flag, decoder in decode_types.items():
+        if flag in args:
+            selected = decoder
+            break
+
+    # prompt user to select a mde
+    try:
+        if selected is None:
+            selected = input("Select decoder: ").lower()
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user. Exiting...")
+        sys.exit(0)
+
+
+    # Main prompt selection logic
+    try:
+        while True:
+            if (selected is not None and selected not in decode_types.values()) and selected not in ("status", "debug"):
+                print("Invalid decoder selected. Please choose from the available options.")
+                selected = input("Select decoder: ").lower()
+            elif selected is None:
+                # Just prompt silently
+                selected = input("Select decoder: ").lower()
+            elif not stopvalidation:
+                print(f'selected decoder is valid. {selected}')
+                stopvalidation = True
+
+
+            # if selected blocks
+            if selected == "xml":
+                from data_decoder.json_output import json_output_file
+                from data_decoder.xml_decoder import (
+                    export_xml_records, extract_text_from_xml, extract_text_from_xml_stream
+                )
+
+                print("XML decoder mode. Type: decode <file.xml>, stream <file.xml>, records <file.xml> --path /feed/entry or exit")
+
+                while True:
+                    try:
+                        command = input("> ").strip()
+                    except KeyboardInterrupt:
+                        print("\nExiting XML mode.")
+                        break
+
+                    if not command:
+                        continue
+
+                    if command.lower() == "help":
+                        print("Commands:\n decode <file.xml> - Decode the specified XML file\n stream <file.xml> - Decode a large XML file while reading it (low memory)\n records <file.xml> --path /feed/entry [--format jsonl|pretty|compact] - Write every element at the path as json, one per line by default\n exit - Exit XML mode")
+                        continue
+
+                    if command.lower() == "exit":
+                        selected = None
+                        stopvalidation = False
+                        print("Exiting XML mode.")
+                        break
+
+                    if command.lower().startswith("decode "):
+                        input_file = command[7:].strip().strip('"')
+
+                        base_name = os.path.splitext(input_file)[0]
+                        output_file = base_name + "_decoded.txt"
+
+                        extract_text_from_xml(input_file, output_file)
+                        continue
+
+                    if command.lower().startswith("stream "):
+                        input_file = command[7:].strip().strip('"')
+
+                        base_name = os.path.splitext(input_file)[0]
+                        output_file = base_name + "_decoded.txt"
+
+                        extract_text_from_xml_stream(input_file, output_file)
+                        continue
+
+                    if command.lower().startswith("records "):
+                        try:
+                            input_file, options = split_options(command[8:].strip())
+                        except ValueError as e:
+                            print(f"Invalid command format: {e}. Use: records <file.xml> --path /feed/entry [--format jsonl|pretty|compact]")
+                            continue
+                        record_path = options.get("path")
+                        fmt = options.get("format", "jsonl")
+                        if not isinstance(record_path, str) or fmt not in output_formats:
+                            print("Use: records <file.xml> --path /feed/entry [--format jsonl|pretty|compact]")
+                            continue
+
+                        export_xml_records(input_file, json_output_file(input_file, fmt), record_path, fmt)
+                        continue
+
+                    print("Unknown command. Type 'help' for options.")
+
+            elif selected == "csv":
+                from data_decoder.csv_decoder import decode_csv, decode_csv_batch
+
+                while True:
+                    try:
+                        command = input("> ").strip()
+                    except KeyboardInterrupt:
+                        print("\nExiting CSV mode.")
+                        break
+                    if not command:
+                        continue
+
+                    if command.lower() == "help":
+                        print("Commands:\n decode <file.csv> <column_name> - Decode the specified CSV file column\n batch <file.csv,...|pattern> <column1,column2,...> - Decode several columns from one or more files in a single pass\n exit - Exit CSV mode")
+                        continue
+
+                    if command.lower().startswith("decode "):
+                        parts = command[7:].strip().split(" ", 1)
+                        if len(parts) != 2:
+                            print("Invalid command format. Use: decode <file.csv> <column_name>")
+                            continue
+
+                        input_file = parts[0].strip().strip('"')
+                        column_name = parts[1].strip().strip('"')
+
+                        base_name = os.path.splitext(input_file)[0]
+                        output_file = base_name + f"_{column_name}_decoded.txt"
+
+                        decode_csv(input_file, output_file, column_name)
+                        continue
+
+                    if command.lower().startswith("batch "):
+                        parts = command[6:].strip().split(" ", 1)
+                        if len(parts) != 2:
+                            print("Invalid command format. Use: batch <file.csv,...|pattern> <column1,column2,...>")
+                            continue
+
+                        input_files = [p.strip().strip('"') for p in parts[0].split(",") if p.strip()]
+                        columns = [c.strip().strip('"') for c in parts[1].split(",") if c.strip()]
+
+                        decode_csv_batch(input_files, columns)
+                        continue
+
+                    if command.lower() == "exit":
+                        selected = None
+                        stopvalidation = False
+                        print("Exiting XML mode.")
+                        break
+
+            elif selected == "sql":
+                from data_decoder.json_output import json_output_file
+                from data_decoder.sqlite_decoder import (
+                    export_sqlite_columns, export_sqlite_incremental, export_sqlite_json, sqlite_selection
+                )
+
+                while True:
+                    try:
+                        command = input("> ").strip()
+                    except KeyboardInterrupt:
+                        print("\nExiting SQL mode.")
+                        break
+
+                    if not command:
+                        continue
+
+                    if command.lower() == "help":
+                        print(f"Commands:\n decode <file.sqlite> [--workers N] - Decode the specified SQLite database file, optionally one table per worker process\n   [--tables a,b*] [--exclude c*] [--columns 'a:id,name;b:id'] [--where 'sql filter'] [--limit N] - Only export some tables, columns or rows\n update <file.sqlite> - Append rows added since the last update to <file>.decoded.jsonl\n columns <file.sqlite> [options] - Export every table as typed column files into <file>.columns, same options as decode\n setbatch <rows> - Set how many rows are read at a time (current: {config.sqlite_batch_size})\n setformat <pretty|compact|jsonl> - Set the json layout, jsonl writes one row per line (current: {config.output_format})\n exit - Exit SQL mode")
+                        continue
+
+                    if command.lower() == "exit":
+                        selected = None
+                        stopvalidation = False
+                        print("Exiting SQL mode.")
+                        break
+
+                    if command.lower().startswith("decode "):
+                        try:
+                            input_file, options = split_options(command[7:].strip())
+                            workers = int(options.get("workers", 1))
+                            selection = sqlite_selection(
+                                options.get("tables"), options.get("exclude"), options.get("columns"),
+                                options.get("where"), options.get("limit")
+                            )
+                        except ValueError as e:
+                            print(f"Invalid command format: {e}. Use: decode <file.sqlite> [--workers N] [--tables ...] [--exclude ...] [--columns ...] [--where ...] [--limit N]")
+                            continue
+
+                        output_file = json_output_file(input_file, config.output_format)
+
+                        export_sqlite_json(input_file, output_file, config.sqlite_batch_size, workers, config.output_format, selection)
+                        continue
+
+                    if command.lower().startswith("update "):
+                        input_file = command[7:].strip().strip('"')
+                        export_sqlite_incremental(input_file, json_output_file(input_file, "jsonl"), config.sqlite_batch_size)
+                        continue
+
+                    if command.lower().startswith("columns "):
+                        try:
+                            input_file, options = split_options(command[8:].strip())
+                            selection = sqlite_selection(
+                                options.get("tables"), options.get("exclude"), options.get("columns"),
+                                options.get("where"), options.get("limit")
+                            )
+                        except ValueError as e:
+                            print(f"Invalid command format: {e}. Use: columns <file.sqlite> [--tables ...] [--exclude ...] [--columns ...] [--where ...] [--limit N]")
+                            continue
+
+                        export_sqlite_columns(input_file, input_file + ".columns", config.sqlite_batch_size, selection)
+                        continue
+
+                    if command.lower().startswith("setformat "):
+                        fmt = command[10:].strip().lower()
+                        if fmt in output_formats:
+                            config.output_format = fmt
+                            print(f"Output format set to: {fmt}")
+                            config.save_config()  # Save settings
+                        else:
+                            print("Invalid output format. Valid formats are: pretty, compact, jsonl.")
+                        continue
+
+                    if command.lower().startswith("setbatch "):
+                        try:
+                            size = int(command[9:].strip())
+                        except ValueError:
+                            size = 0
+                        if size > 0:
+                            config.sqlite_batch_size = size
+                            print(f"SQLite batch size set to: {size}")
+                            config.save_config()  # Save settings
+                        else:
+                            print("Invalid batch size. Use a whole number above 0.")
+                        continue
+
+            elif selected == "yaml":
+                from data_decoder.json_output import json_output_file
+                from data_decoder.yaml_decoder import export_yaml_json
+
+                while True:
+                    try:
+                        command = input("> ").strip()
+                    except KeyboardInterrupt:
+                        print("\nExiting YAML mode.")
+                        break
+
+                    if not command:
+                        continue
+
+                    if command.lower() == "help":
+                        print(f"Commands:\n decode <file.yaml> - Decode the specified YAML file\n stream <file.yaml> - Decode a large YAML file while reading it (top-level keys keep file order)\n setformat <pretty|compact|jsonl> - Set the json layout (current: {config.output_format})\n exit - Exit YAML mode")
+                        continue
+
+                    if command.lower() == "exit":
+                        selected = None
+                        stopvalidation = False
+                        print("Exiting YAML mode.")
+                        break
+
+                    if command.lower().startswith("decode "):
+                        input_file = command[7:].strip().strip('"')
+
+                        output_file = json_output_file(input_file, config.output_format)
+
+                        export_yaml_json(input_file, output_file, fmt=config.output_format)
+                        continue
+
+                    if command.lower().startswith("setformat "):
+                        fmt = command[10:].strip().lower()
+                        if fmt in output_formats:
+                            config.output_format = fmt
+                            print(f"Output format set to: {fmt}")
+                            config.save_config()  # Save settings
+                        else:
+                            print("Invalid output format. Valid formats are: pretty, compact, jsonl.")
+                        continue
+
+                    if command.lower().startswith("stream "):
+                        input_file = command[7:].strip().strip('"')
+
+                        output_file = json_output_file(input_file, config.output_format)
+
+                        export_yaml_json(input_file, output_file, stream=True, fmt=config.output_format)
+                        continue
+
+            elif selected == "num":
+                from data_decoder.num_decoder import convert_binary_file, convert_num_file, convertnum, num_chunk_size
+
+                while True:
+                    try:
+                        command = input("> ").strip()
+                    except KeyboardInterrupt:
+                        print("\nExiting Number Conversion mode.")
+                        break
+                    if not command:
+                        continue
+
+                    if command.lower() == "help":
+                        print("Commands:\n setin <type> - Set input number type (bin, oct, dec, hex)\n setout <type> - Set output number type (bin, oct, dec, hex)\n convert <value|file|-> - Convert a value, a file of values, or stdin to stdout (-)\n convert <file> --workers N [--chunk BYTES] - Convert a large file on several processes\n convertbin <file> [bytes_per_line] - Show the raw bytes of any file in the output type (default 16 per line)\n exit - Exit Number Conversion mode\n status - Show current settings\n toggleperbyte - Toggle per-byte mode ON/OFF")
+                        continue
+
+                    if command.lower() == "status":
+                        print(f"Per-byte mode: {'ON' if config.per_byte else 'OFF'}")
+                        print(f"Input type: {config.selectednumbers[0]}")
+                        print(f"Output type: {config.selectednumbers[1]}")
+                        continue
+
+                    if command.lower() == "toggleperbyte":
+                        config.per_byte = not config.per_byte
+                        print(f"Per-byte mode set to: {'ON' if config.per_byte else 'OFF'}")
+                        config.save_config()  # Save settings
+                        continue
+
+                    if command.lower() == "exit":
+                        selected = None
+                        stopvalidation = False
+                        print("Exiting Number Conversion mode.")
+                        break
+
+                    if command.lower().startswith("setin "):
+                        type_in = command[6:].strip().lower()
+                        if type_in in valid_num_types:
+                            config.selectednumbers[0] = type_in
+                            print(f"Input number type set to: {type_in}")
+                            config.save_config()  # Save settings
+                        else:
+                            print("Invalid number type. Valid types are: bin, oct, dec, hex.")
+                        continue
+
+                    if command.lower().startswith("setout "):
+                        type_out = command[7:].strip().lower()
+                        if type_out in valid_num_types:
+                            config.selectednumbers[1] = type_out
+                            print(f"Output number type set to: {type_out}")
+                            config.save_config()  # Save settings
+                        else:
+                            print("Invalid number type. Valid types are: bin, oct, dec, hex.")
+                        continue
+
+                    if command.lower().startswith("convertbin "):
+                        if config.selectednumbers[1] is None:
+                            print("Please set the output number type before converting.")
+                            continue
+
+                        parts = command[11:].strip().rsplit(" ", 1)
+                        bytes_per_line = 16
+                        if len(parts) == 2 and parts[1].isdigit():
+                            bytes_per_line = int(parts[1])
+                            input_file = parts[0].strip().strip('"')
+                        else:
+                            input_file = command[11:].strip().strip('"')
+
+                        if bytes_per_line < 1:
+                            print("Bytes per line must be at least 1.")
+                            continue
+
+                        base_name = os.path.splitext(input_file)[0]
+                        output_file = base_name + "_decoded.txt"
+                        convert_binary_file(input_file, output_file, config.selectednumbers[1], bytes_per_line)
+                        continue
+
+                    if command.lower().startswith("convert "):
+                        input_value = command[8:].strip()
+                        workers = 1
+                        chunk_size = num_chunk_size
+                        if " --" in input_value:
+                            try:
+                                input_value, options = split_options(input_value)
+                                workers = int(options.get("workers", 1))
+                                chunk_size = int(options.get("chunk", num_chunk_size))
+                            except ValueError as e:
+                                print(f"Invalid command format: {e}. Use: convert <file> [--workers N] [--chunk BYTES]")
+                                continue
+                        if config.selectednumbers[0] is None or config.selectednumbers[1] is None:
+                            print("Please set both input and output number types before converting.")
+                            continue
+
+                        # "-" converts values typed or piped into stdin
+                        if input_value == "-":
+                            print("Reading values from stdin, end with Ctrl+Z (Windows) or Ctrl+D.")
+                            convert_num_file("-", "-", config.selectednumbers[1], config.selectednumbers[0], config.per_byte)
+
+                        # If input is a file, convert it chunk by chunk
+                        elif os.path.isfile(input_value):
+                            base_name = os.path.splitext(input_value)[0]
+                            output_file = base_name + "_decoded.txt"
+                            convert_num_file(input_value, output_file, config.selectednumbers[1], config.selectednumbers[0], config.per_byte, chunk_size, workers)
+
+                        else:
+                            # direct input
+                            with metrics.operation("convertnum", "values") as record:
+                                result = convertnum(input_value, config.selectednumbers[1], config.selectednumbers[0], config.per_byte)
+                                record["ok"] = result is not None
+                                metrics.count(1)
+                            if result is not None:
+                                print(f"Converted value: {result}")
+            elif selected == "status":
+                print(f"{Fore.GREEN + Style.BRIGHT}status: menu mode. Type 'help' for commands or 'exit' to leave status mode.")
+                try:
+                    while True:
+                        command = input("> ").strip()
+                        if not command:
+                            continue
+
+                        if command.lower() == "help":
+                            print("Commands:\n   exit - Exit status mode\n   dir - List files in current directory\n   pwd - Show current directory path\n   read <file> - Read and display contents of a file\n   debug - opens debug menu\n   cache - Show result cache statistics\n   cache on|off - Reuse outputs of files decoded before with the same options\n   cache size <MB> - Set the cache size limit\n   cache mode <copy|link> - Copy or hard link cached results to the output\n   cache clear - Remove every cached result\n   clear - Clear the screen")
+                            continue
+
+                        if command.lower() == "exit":
+                            print(Style.RESET_ALL + "Exiting status mode.")
+                            selected = None
+                            stopvalidation = False
+                            break
+
+                        if command.lower() == "dir":
+                            files = os.listdir(current_dir)
+                            print("Files in current directory:")
+                            for f in files:
+                                print(f"  {f}")
+                            continue
+
+                        if command.lower() == "pwd":
+                            print(f"Current directory: {current_dir}")
+                            continue
+
+                        if command.lower().startswith("read "):
+                            file_to_read = command[5:].strip().strip('"')
+                            full_path = os.path.join(current_dir, file_to_read)
+                            try:
+                                with open(full_path, "r", encoding="utf-8") as f:
+                                    content = f.read()
+                                print(f"Contents of {file_to_read}:\n")
+                                print(content)
+                            except FileNotFoundError:
+                                print(f"File not found: {file_to_read}")
+                            except Exception as e:
+                                print(f"Error reading file: {e}")
+                            continue
+
+                        if command.lower() == "cache" or command.lower().startswith("cache "):
+                            run_cache_command(command)
+                            continue
+
+                        if command.lower() == "debug":
+                            selected = "debug"
+                            stopvalidation = False
+                            break
+
+                        if command.lower() == "clear":
+                            os.system('cls' if os.name == 'nt' else 'clear')
+                            continue
+
+
+                except KeyboardInterrupt:
+                    print("\nExiting status mode.")
+                    selected = None
+                    stopvalidation = False
+            elif selected == "debug":
+                from data_decoder.console import run_live_console
+
+                print("Entering debug mode. Type 'help' for commands or 'exit' to return.\n")
+
+                try:
+                    run_live_console(lambda: build_debug_table(args), run_debug_command)
+                    print("Exited debug mode.")
+                    selected = None
+                    stopvalidation = False
+
+                except KeyboardInterrupt:
+                    print("\nExiting debug mode.")
+                    selected = None
+                    stopvalidation = False
+
+
+
+
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user. Exiting...")
+        sys.exit(0)
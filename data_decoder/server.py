@@ -0,0 +1,413 @@
+# Decode server
+# "data_decoder serve" keeps the decoders loaded in a pool of worker
+# processes (or threads) and takes jobs over a local socket, so submitting a
+# decode costs a message instead of an interpreter start. The protocol is
+# JSON Lines both ways: every request line is a job shaped like the entries
+# of a JSON job file, {"id": 1, "decoder": "csv", "input_file": "a.csv",
+# "columns": "id,name"}, or a command, {"command": "ping" | "stats" |
+# "shutdown"}. Every request gets one response line, in request order:
+# {"id": 1, "ok": true, "outputs": [...], "operations": [...], "messages":
+# [...], "elapsed": ..., "waited": ...}.
+# Jobs wait in one bounded queue. When it is full the server stops reading
+# from the connections that submit, so clients are slowed down instead of
+# the backlog growing without limit.
+# Jobs read and write files with the rights of the user running the server,
+# so only that user may connect. The default is a Unix socket in a folder
+# only they can open. Over TCP every request has to carry the token the
+# server writes into that folder, {"token": "...", ...}.
+import asyncio
+import hmac
+import io
+import json
+import os
+import secrets
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+default_host = "127.0.0.1"
+default_port = 8765
+
+# decoders a job can ask for
+server_decoders = ("xml", "csv", "sql", "yaml", "num")
+
+# longest accepted request line
+max_request = 1 << 20
+
+
+# sys.stdout stand-in that sends what a job prints to the job's own buffer,
+# so jobs running side by side on threads don't mix their messages
+class JobOutput:
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def target(self):
+        return getattr(self.local, "buffer", None) or self.stream
+
+    def write(self, text):
+        return self.target().write(text)
+
+    def flush(self):
+        self.target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+# worker setup, run once in every worker process: route prints per job and
+# load every decoder up front so the first jobs don't pay for the imports
+def start_worker(metrics_file=None, result_cache=False):
+    import importlib
+    from data_decoder import config, metrics
+
+    for name in ("xml_decoder", "csv_decoder", "sqlite_decoder", "yaml_decoder", "num_decoder", "cli"):
+        importlib.import_module(f"data_decoder.{name}")
+
+    if not isinstance(sys.stdout, JobOutput):
+        sys.stdout = JobOutput(sys.stdout)
+    metrics.metrics_file = metrics_file
+    config.result_cache = result_cache
+
+# run one job in a worker, returns its response without the id
+def run_job(job):
+    from data_decoder import metrics
+    from data_decoder.cli import run_decode
+
+    job = dict(job)
+    decoder = job.pop("decoder", None)
+    input_file = job.pop("input_file", None)
+    # the server's own settings apply to every job
+    for key in ("id", "line", "token", "metrics_file", "profile", "cache"):
+        job.pop(key, None)
+
+    if decoder not in server_decoders:
+        return {"ok": False, "error": f"Unknown decoder: {decoder}. Use {', '.join(server_decoders)}."}
+    if not input_file or input_file == "-" or job.get("output_file") == "-":
+        return {"ok": False, "error": "Jobs need an input file, stdin and stdout can't be used."}
+
+    output = sys.stdout
+    buffer = io.StringIO()
+    if isinstance(output, JobOutput):
+        output.local.buffer = buffer
+
+    began = time.perf_counter()
+    error = None
+    try:
+        with metrics.collect() as records:
+            ok = bool(run_decode(decoder, input_file, **job))
+    except Exception as e:
+        # decoders report problems themselves, this keeps a bug from taking the worker down
+        ok = False
+        error = f"{type(e).__name__}: {e}"
+        records = []
+    finally:
+        if isinstance(output, JobOutput):
+            output.local.buffer = None
+
+    response = {
+        "ok": ok,
+        "outputs": [record["output"] for record in records if record.get("output")],
+        "operations": records,
+        "messages": buffer.getvalue().splitlines(),
+        "elapsed": round(time.perf_counter() - began, 6)
+    }
+    if error:
+        response["error"] = error
+    return response
+
+# "unix:<path>" for a socket file, otherwise host:port
+def format_address(socket_path, host, port):
+    return f"unix:{socket_path}" if socket_path else f"{host}:{port}"
+
+# private folder of the server's socket and token, created readable by this
+# user only. Raises OSError when someone else owns it or can open it.
+def server_folder():
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        folder = os.path.join(base, "data_decoder", "server")
+    elif os.environ.get("XDG_RUNTIME_DIR"):
+        folder = os.path.join(os.environ["XDG_RUNTIME_DIR"], "data_decoder")
+    else:
+        folder = os.path.join(tempfile.gettempdir(), f"data_decoder-{os.getuid()}")
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    if os.name != "nt":
+        st = os.lstat(folder)
+        if st.st_uid != os.getuid() or st.st_mode & 0o077 or os.path.islink(folder):
+            raise OSError(f"{folder} can be opened by other users, remove it or pick --socket")
+    return folder
+
+# the address to use: a socket file unless a tcp host or port is given or
+# unix sockets don't exist here
+def resolve_address(socket_path=None, host=None, port=None):
+    if socket_path or (host is None and port is None and hasattr(socket, "AF_UNIX")):
+        return socket_path or os.path.join(server_folder(), "server.sock"), None, None
+    return None, host or default_host, port or default_port
+
+# file holding the token of the tcp server on port
+def token_file(port):
+    return os.path.join(server_folder(), f"server-{port}.token")
+
+def read_token(port):
+    with open(token_file(port), "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+# Server
+# workers jobs run at a time, on processes unless use_threads is set, and
+# at most queue_size more wait for a worker. Returns when a client sends
+# the shutdown command (after the running and queued jobs are done) or on
+# Ctrl+C.
+async def serve_jobs(socket_path=None, host=None, port=None, workers=None,
+                     queue_size=100, use_threads=False, metrics_file=None):
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from data_decoder import config
+
+    socket_path, host, port = resolve_address(socket_path, host, port)
+    # the socket file's permissions guard a unix socket, tcp needs the token
+    token = None if socket_path else secrets.token_hex(16)
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    stopping = asyncio.Event()
+    stats = {"started": time.time(), "connections": 0, "received": 0, "done": 0, "failed": 0, "running": 0}
+
+    if use_threads:
+        start_worker(metrics_file, config.result_cache)
+        pool = ThreadPoolExecutor(max_workers=workers)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=start_worker,
+                                   initargs=(metrics_file, config.result_cache))
+        # start every worker now rather than on the first jobs
+        await asyncio.gather(*[loop.run_in_executor(pool, os.getpid) for _ in range(workers)])
+
+    # one per worker, so the pool never holds more jobs than it can run
+    async def dispatch():
+        while True:
+            job, future, queued_at = await queue.get()
+            waited = time.perf_counter() - queued_at
+            stats["running"] += 1
+            try:
+                response = await loop.run_in_executor(pool, run_job, job)
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            finally:
+                stats["running"] -= 1
+            response["waited"] = round(waited, 6)
+            stats["done"] += 1
+            if not response["ok"]:
+                stats["failed"] += 1
+            if not future.done():
+                future.set_result(response)
+            queue.task_done()
+
+    def reply(response):
+        future = loop.create_future()
+        future.set_result(response)
+        return future
+
+    def command_reply(command):
+        if command == "ping":
+            return reply({"ok": True, "pong": True})
+        if command == "stats":
+            uptime = time.time() - stats["started"]
+            return reply(dict(stats, ok=True, queued=queue.qsize(), workers=workers, uptime=round(uptime, 3),
+                              jobs_per_s=round(stats["done"] / uptime, 2) if uptime > 0 else None))
+        if command == "shutdown":
+            stopping.set()
+            return reply({"ok": True, "stopping": True})
+        return reply({"ok": False, "error": f"Unknown command: {command}"})
+
+    # reply queues and writers of the open connections
+    connections = {}
+
+    async def handle(reader, writer):
+        stats["connections"] += 1
+        # responses waiting to be sent in request order, bounded like the queue
+        replies = asyncio.Queue(maxsize=queue_size)
+        connections[writer] = replies
+
+        async def send_replies():
+            broken = False
+            while True:
+                request_id, future = await replies.get()
+                response = await future
+                if request_id is not None:
+                    response = dict(response, id=request_id)
+                if not broken:
+                    try:
+                        writer.write((json.dumps(response) + "\n").encode("utf-8"))
+                        await writer.drain()
+                    except ConnectionError:
+                        # the client left, the rest of its jobs still run
+                        broken = True
+                replies.task_done()
+
+        sender = loop.create_task(send_replies())
+        try:
+            while not stopping.is_set():
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await replies.put((None, reply({"ok": False, "error": "Request line too long."})))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("a request is a json object")
+                except ValueError as e:
+                    await replies.put((None, reply({"ok": False, "error": f"Invalid request: {e}"})))
+                    continue
+
+                request_id = request.get("id")
+                supplied = str(request.pop("token", "")).encode("utf-8", "surrogatepass")
+                if token and not hmac.compare_digest(supplied, token.encode("ascii")):
+                    await replies.put((request_id, reply({"ok": False, "error": "Missing or wrong token."})))
+                    break
+                if "command" in request:
+                    await replies.put((request_id, command_reply(request["command"])))
+                    continue
+                if stopping.is_set():
+                    await replies.put((request_id, reply({"ok": False, "error": "The server is shutting down."})))
+                    break
+
+                stats["received"] += 1
+                future = loop.create_future()
+                # both wait while full, which stops reading this connection
+                await replies.put((request_id, future))
+                await queue.put((request, future, time.perf_counter()))
+
+            await replies.join()
+        finally:
+            sender.cancel()
+            writer.close()
+            del connections[writer]
+            stats["connections"] -= 1
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        # only this user can submit jobs. The socket is created without
+        # rights for anyone else, a chmod after the bind would leave a gap.
+        umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(handle, path=socket_path, limit=max_request)
+        finally:
+            os.umask(umask)
+    else:
+        server = await asyncio.start_server(handle, host, port, limit=max_request)
+        if os.name == "nt":
+            with open(token_file(port), "w", encoding="utf-8") as f:
+                f.write(token)
+        else:
+            descriptor = os.open(token_file(port), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                f.write(token)
+
+    dispatchers = [loop.create_task(dispatch()) for _ in range(workers)]
+    print(f"Decode server listening on {format_address(socket_path, host, port)} with "
+          f"{workers} worker {'threads' if use_threads else 'processes'}, queue of {queue_size}. "
+          f"Send {{\"command\": \"shutdown\"}} or press Ctrl+C to stop.")
+    if token:
+        print(f"Requests need the token in {token_file(port)}.")
+    sys.stdout.flush()
+
+    try:
+        await stopping.wait()
+        server.close()
+        # finish the accepted jobs and send their responses, then drop idle connections
+        await queue.join()
+        if connections:
+            await asyncio.wait([loop.create_task(replies.join()) for replies in connections.values()], timeout=10)
+        for writer in list(connections):
+            writer.close()
+    finally:
+        for task in dispatchers:
+            task.cancel()
+        server.close()
+        pool.shutdown(wait=False)
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+        if token and os.path.exists(token_file(port)):
+            os.remove(token_file(port))
+
+    print(f"Decode server stopped after {stats['done']} jobs, {stats['failed']} failed.")
+    return stats
+
+# headless "serve" command, returns the exit code
+def run_serve_command(socket_path=None, host=None, port=None, workers=None,
+                      queue_size=100, use_threads=False, metrics_file=None):
+    if socket_path and not hasattr(socket, "AF_UNIX"):
+        print("Unix sockets aren't available here, use --port instead.")
+        return 1
+    if queue_size < 1:
+        print("The queue needs room for at least one job.")
+        return 1
+    if host not in (None, "127.0.0.1", "localhost", "::1"):
+        print(f"Warning: listening on {host}, anyone who can reach it and has the token can decode files as this user.")
+    try:
+        socket_path, host, port = resolve_address(socket_path, host, port)
+    except OSError as e:
+        print(f"Could not start the decode server: {e}")
+        return 1
+
+    try:
+        asyncio.run(serve_jobs(socket_path, host, port, workers, queue_size, use_threads, metrics_file))
+    except KeyboardInterrupt:
+        print("\nDecode server stopped.")
+    except OSError as e:
+        print(f"Could not start the decode server on {format_address(socket_path, host, port)}: {e}")
+        return 1
+    return 0
+
+
+# Client
+# Sends jobs (dicts like the entries of a JSON job file) to a running server
+# and yields (job, response) in job order. Jobs are written from a thread
+# while responses are read, so a full server queue can't deadlock the two.
+# token is read from the server folder when it isn't given.
+def submit_jobs(jobs, socket_path=None, host=None, port=None, token=None):
+    socket_path, host, port = resolve_address(socket_path, host, port)
+    if socket_path:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    else:
+        token = token or read_token(port)
+        conn = socket.create_connection((host, port))
+
+    jobs = list(jobs)
+    failed = []
+
+    def send():
+        try:
+            for n, job in enumerate(jobs):
+                request = dict(job, id=n, token=token) if token else dict(job, id=n)
+                conn.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            conn.shutdown(socket.SHUT_WR)
+        except OSError as e:
+            failed.append(e)
+
+    sender = threading.Thread(target=send, daemon=True)
+    sender.start()
+    try:
+        with conn.makefile("r", encoding="utf-8") as responses:
+            for job in jobs:
+                line = responses.readline()
+                if not line:
+                    raise ConnectionError(f"The server closed the connection: {failed[0] if failed else 'no response'}")
+                yield job, json.loads(line)
+    finally:
+        conn.close()
+        sender.join()
+
+# send one command ("ping", "stats" or "shutdown") and return the response
+def send_command(command, socket_path=None, host=None, port=None, token=None):
+    for _, response in submit_jobs([{"command": command}], socket_path, host, port, token):
+        return response
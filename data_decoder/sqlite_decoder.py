@@ -0,0 +1,748 @@
+# db/sqlite decoder
+import array
+import base64
+import contextlib
+import fnmatch
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import sqlite3
+import sys
+
+from data_decoder.cache import cached
+from data_decoder.json_output import compact_json, indent_json
+from data_decoder.metrics import count, instrumented
+
+# file path to file: url, as urllib.request does without importing it
+if os.name == "nt":
+    from nturl2path import pathname2url
+else:
+    from urllib.parse import quote as pathname2url
+
+
+# convert a sqlite row into a json friendly dict
+def sqlite_record(row):
+    record = {}
+    for key in row.keys():
+        value = row[key]
+
+        # handle blobs
+        if isinstance(value, bytes):
+            value = {
+                "__type__": "blob",
+                "base64": base64.b64encode(value).decode("ascii")
+            }
+
+        record[key] = value
+
+    return record
+
+# check that a row filter is one sql expression, so it can't end the
+# WHERE (...) it is put in: parentheses have to balance and ; and comments
+# are refused outside string literals and quoted names
+def check_where(where):
+    depth = 0
+    quote = None
+    i = 0
+    while i < len(where):
+        ch = where[i]
+        if quote is not None:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"`":
+            quote = ch
+        elif ch == "[":
+            quote = "]"
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth < 0:
+                break
+        elif ch == ";" or where.startswith(("--", "/*"), i):
+            raise ValueError(f"The row filter has to be a single expression, without ; or comments: {where}")
+        i += 1
+    if depth != 0 or quote is not None:
+        raise ValueError(f"Unbalanced parentheses or quotes in the row filter: {where}")
+    return where
+
+# build a table/column selection for the sqlite exports, None keeps
+# everything. tables and exclude are name patterns like "log_*", columns
+# entries look like "table:col1,col2" (several can be joined with ";"), where
+# is a row filter in sql (one expression, see check_where) applied to every
+# selected table and limit caps the rows per table.
+def sqlite_selection(tables=None, exclude=None, columns=None, where=None, limit=None):
+    def names(values):
+        if isinstance(values, str):
+            values = [values]
+        return [name.strip() for value in values or [] for name in value.split(",") if name.strip()]
+
+    selection = {
+        "tables": names(tables),
+        "exclude": names(exclude),
+        "columns": {},
+        "where": check_where(where.strip()) if where else None,
+        "limit": None
+    }
+
+    if isinstance(columns, str):
+        columns = [columns]
+    for entry in columns or []:
+        for part in entry.split(";"):
+            if not part.strip():
+                continue
+            table, sep, column_list = part.partition(":")
+            if not sep or not names(column_list):
+                raise ValueError(f"Use table:col1,col2 for column lists, got: {part.strip()}")
+            selection["columns"][table.strip().lower()] = names(column_list)
+
+    if limit is not None:
+        selection["limit"] = int(limit)
+        if selection["limit"] < 0:
+            raise ValueError("The limit can't be negative.")
+
+    if not any(selection.values()) and selection["limit"] is None:
+        return None
+    return selection
+
+# get user table names in export order, narrowed down by a selection. A
+# table pattern that matches nothing is reported, or raises KeyError when
+# strict (library use).
+def sqlite_tables(conn, selection=None, strict=False):
+    cur = conn.execute("""
+        SELECT name
+        FROM sqlite_master
+        WHERE type='table'
+        AND name NOT LIKE 'sqlite_%'
+        ORDER BY name
+    """)
+    tables = [row[0] for row in cur.fetchall()]
+
+    if selection:
+        # sqlite names are case insensitive, so are the patterns
+        def matches(table, patterns):
+            return any(fnmatch.fnmatchcase(table.lower(), pattern.lower()) for pattern in patterns)
+
+        if selection["tables"]:
+            for pattern in selection["tables"]:
+                if not any(matches(table, [pattern]) for table in tables):
+                    if strict:
+                        raise KeyError(f"No tables match: {pattern}")
+                    print(f"No tables match: {pattern}")
+            tables = [table for table in tables if matches(table, selection["tables"])]
+        tables = [table for table in tables if not matches(table, selection["exclude"])]
+
+    return tables
+
+# quote a table or column name for use in sql text
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+# get column names and declared types of a table, only the given names
+# (in that order) when names is set. Generated columns are listed too, like
+# SELECT * reads them, hidden columns of virtual tables aren't. sqlite
+# before 3.26 has no table_xinfo and no generated columns either.
+def sqlite_columns(conn, table, names=None):
+    try:
+        cur = conn.execute("SELECT name, type FROM pragma_table_xinfo(?) WHERE hidden != 1", (table,))
+    except sqlite3.OperationalError:
+        cur = conn.execute("SELECT name, type FROM pragma_table_info(?)", (table,))
+    columns = [
+        {
+            "name": col[0],
+            "type": col[1]
+        }
+        for col in cur.fetchall()
+    ]
+
+    if names:
+        by_name = {col["name"].lower(): col for col in columns}
+        for name in names:
+            if name.lower() not in by_name:
+                raise KeyError(f"Column '{name}' not found in table '{table}'.")
+        columns = [by_name[name.lower()] for name in names]
+
+    return columns
+
+# columns of a table and the query that reads it, with the selection's column
+# list, row filter and limit pushed down into sqlite. The columns are always
+# named, so the values of a row line up with them. Returns
+# (columns, sql, params).
+def sqlite_table_query(conn, table, selection=None):
+    names = selection["columns"].get(table.lower()) if selection else None
+    columns = sqlite_columns(conn, table, names)
+
+    # no columns means no such table, which * lets sqlite report
+    fields = ", ".join(quote_identifier(col["name"]) for col in columns) or "*"
+    sql = f"SELECT {fields} FROM {quote_identifier(table)}"
+    params = []
+    if selection and selection["where"]:
+        sql += f" WHERE ({selection['where']})"
+    if selection and selection["limit"] is not None:
+        sql += " LIMIT ?"
+        params.append(selection["limit"])
+
+    return columns, sql, params
+
+# db/sqlite decoder
+@instrumented("sqlite", "rows")
+def decode_sqlite(db_path, selection=None):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return sqlite_document(conn, selection)
+    finally:
+        conn.close()
+
+# every selected table of an open database as {"tables": {name: {"columns",
+# "rows"}}}. Rows are read as sqlite3.Row whatever the connection's
+# row_factory is. strict as for sqlite_tables.
+def sqlite_document(conn, selection=None, strict=False):
+    cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+
+    result = {
+        "tables": {}
+    }
+
+    for table in sqlite_tables(conn, selection, strict):
+        # get columns
+        column_info, sql, params = sqlite_table_query(conn, table, selection)
+
+        # fetch rows
+        cur.execute(sql, params)
+        rows = [sqlite_record(row) for row in cur.fetchall()]
+        count(len(rows))
+
+        result["tables"][table] = {
+            "columns": column_info,
+            "rows": rows
+        }
+
+    return result
+
+# write one table, fetching rows in batches. pretty and compact write the
+# `"name": {"columns": ..., "rows": ...}` member of the "tables" object,
+# jsonl writes a {"table", "columns"} line followed by a {"table", "row"}
+# line per row. Returns how many rows were written.
+def write_sqlite_table(conn, table, out, batch_size, fmt="pretty", selection=None):
+    columns, sql, params = sqlite_table_query(conn, table, selection)
+    name = json.dumps(table)
+
+    if fmt == "jsonl":
+        out.write('{"table":' + name + ',"columns":' + compact_json(columns) + "}\n")
+        prefix = '{"table":' + name + ',"row":'
+    elif fmt == "compact":
+        out.write(name + ':{"columns":' + compact_json(columns) + ',"rows":[')
+    else:
+        out.write(name + ": {\n")
+        out.write('      "columns": ' + indent_json(columns, 3) + ",\n")
+        out.write('      "rows": ')
+
+    cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+    cur.execute(sql, params)
+
+    first = True
+    written = 0
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        written += len(rows)
+
+        if fmt == "jsonl":
+            out.write("".join([prefix + compact_json(sqlite_record(row)) + "}\n" for row in rows]))
+        elif fmt == "compact":
+            # the whole batch at once, without its brackets
+            out.write(("" if first else ",") + compact_json([sqlite_record(row) for row in rows])[1:-1])
+        else:
+            chunk = []
+            for row in rows:
+                chunk.append(indent_json(sqlite_record(row), 4))
+            out.write(("[\n        " if first else ",\n        ") + ",\n        ".join(chunk))
+        first = False
+
+    if fmt == "compact":
+        out.write("]}")
+    elif fmt == "pretty":
+        out.write("[]" if first else "\n      ]")
+        out.write("\n    }")
+
+    count(written)
+    return written
+
+# open a sqlite database read only, each export worker uses its own
+def connect_readonly(db_path):
+    uri = "file:" + pathname2url(os.path.abspath(db_path)) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+# export worker: write one table member into its own part file, returns
+# the file and its row count
+def export_sqlite_table_part(db_path, table, part_file, batch_size, fmt="pretty", selection=None):
+    conn = connect_readonly(db_path)
+    try:
+        with open(part_file, "w", encoding="utf-8") as out:
+            rows = write_sqlite_table(conn, table, out, batch_size, fmt, selection)
+    finally:
+        conn.close()
+    return part_file, rows
+
+# text around and between the tables for each output format:
+# (start, separator, end, no tables)
+sqlite_layouts = {
+    "pretty": ('{\n  "tables": {\n    ', ",\n    ", "\n  }\n}", '{\n  "tables": {}\n}'),
+    "compact": ('{"tables":{', ",", "}}", '{"tables":{}}'),
+    "jsonl": ("", "", "", "")
+}
+
+# write every selected table of an open database to a text stream, the same
+# text export_sqlite_json writes to its output file
+def write_sqlite_document(conn, out, batch_size=1000, fmt="pretty", selection=None, strict=False):
+    tables = sqlite_tables(conn, selection, strict)
+    start, separator, end, empty = sqlite_layouts[fmt]
+    if not tables:
+        out.write(empty)
+        return
+
+    out.write(start)
+    for n, table in enumerate(tables):
+        if n:
+            out.write(separator)
+        write_sqlite_table(conn, table, out, batch_size, fmt, selection)
+    out.write(end)
+
+# Streaming SQLite decoder
+# Pretty output is the same json as dumping decode_sqlite() with indent=2
+# and sort_keys=True, compact is the same document on one line and jsonl
+# writes one line per row. Never holds more than batch_size rows in memory.
+# With workers > 1 every table is exported by a worker process into a part
+# file, and the parts are stitched together in table order. A selection
+# (see sqlite_selection) limits which tables, columns and rows are read.
+@instrumented("sqlite_json", "rows", output=1)
+@cached("sqlite_json", ignore=("batch_size", "workers"), companions=("-wal",))
+def export_sqlite_json(db_path, output_file, batch_size=1000, workers=1, fmt="pretty", selection=None):
+    if not os.path.isfile(db_path):
+        print(f"File not found: {db_path}")
+        return False
+
+    part_file = output_file + ".part"
+    part_dir = None
+    pool = None
+    futures = []
+    conn = None
+    try:
+        conn = connect_readonly(db_path)
+        tables = sqlite_tables(conn, selection)
+
+        if workers > 1 and len(tables) > 1:
+            # process pools take a while to import, so only parallel runs load them
+            import tempfile
+            from concurrent.futures import ProcessPoolExecutor
+
+            part_dir = tempfile.mkdtemp(prefix=".sqlite_parts_", dir=os.path.dirname(os.path.abspath(output_file)))
+            pool = ProcessPoolExecutor(max_workers=workers)
+            for n, table in enumerate(tables):
+                futures.append(pool.submit(
+                    export_sqlite_table_part, db_path, table,
+                    os.path.join(part_dir, f"{n}.part"), batch_size, fmt, selection
+                ))
+
+        start, separator, end, empty = sqlite_layouts[fmt]
+        with open(part_file, "w", encoding="utf-8") as out:
+            if tables:
+                out.write(start)
+                for n, table in enumerate(tables):
+                    if n:
+                        out.write(separator)
+                    if pool is None:
+                        write_sqlite_table(conn, table, out, batch_size, fmt, selection)
+                    else:
+                        table_part, rows = futures[n].result()
+                        count(rows)
+                        with open(table_part, "r", encoding="utf-8") as part:
+                            shutil.copyfileobj(part, out, 1 << 20)
+                        os.remove(table_part)
+                out.write(end)
+            else:
+                out.write(empty)
+
+        os.replace(part_file, output_file)
+        print("Decoded SQLite DB written to:", output_file)
+        return True
+
+    except (sqlite3.Error, KeyError) as e:
+        if os.path.exists(part_file):
+            os.remove(part_file)
+        if isinstance(e, KeyError):
+            print(f"Error: {e}")
+        else:
+            print(f"SQLite error: {e}")
+        return False
+    finally:
+        if conn is not None:
+            conn.close()
+        if pool is not None:
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
+        if part_dir is not None:
+            shutil.rmtree(part_dir, ignore_errors=True)
+
+# high-water mark of one table for incremental exports: schema hash, max
+# rowid (None while empty) and row count, read inside the caller's
+# transaction. WITHOUT ROWID tables can't be exported incrementally.
+def sqlite_table_mark(conn, table):
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()[0]
+    mark = {"schema": hashlib.sha256((sql or "").encode("utf-8")).hexdigest(), "rowid": True}
+    try:
+        mark["max_rowid"], mark["rows"] = conn.execute(f"SELECT max(rowid), count(*) FROM {quote_identifier(table)}").fetchone()
+    except sqlite3.OperationalError:
+        mark["rowid"] = False
+        mark["max_rowid"] = None
+        mark["rows"] = conn.execute(f"SELECT count(*) FROM {quote_identifier(table)}").fetchone()[0]
+    return mark
+
+# rows of a table above an old max rowid, in rowid order
+def sqlite_rows_after(conn, table, max_rowid):
+    if max_rowid is None:
+        return conn.execute(f"SELECT * FROM {quote_identifier(table)} ORDER BY rowid")
+    return conn.execute(f"SELECT * FROM {quote_identifier(table)} WHERE rowid > ? ORDER BY rowid", (max_rowid,))
+
+# what an incremental run has to do for one table given its last mark:
+# "same", "append" (only rows above the old max rowid are new) or "full"
+# when the table was changed in a way appending can't express
+def sqlite_table_change(conn, table, old, mark):
+    if old is None:
+        return "append"
+    if old["schema"] != mark["schema"] or not (old["rowid"] and mark["rowid"]):
+        return "full"
+    if (mark["max_rowid"], mark["rows"]) == (old["max_rowid"], old["rows"]):
+        return "same"
+    if old["max_rowid"] is None:
+        return "append"
+    # rows deleted or rowids reused below the old mark mean a rewrite
+    kept = conn.execute(f"SELECT count(*) FROM {quote_identifier(table)} WHERE rowid <= ?", (old["max_rowid"],)).fetchone()[0]
+    return "append" if kept == old["rows"] else "full"
+
+# True when a loaded state file has the shape export_sqlite_incremental
+# writes, anything else (another program's file, a hand edit) is ignored
+def valid_sqlite_state(state):
+    def integer(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    if not isinstance(state, dict) or not isinstance(state.get("tables"), dict):
+        return False
+    if not integer(state.get("output_size")) or state["output_size"] < 0:
+        return False
+    for mark in state["tables"].values():
+        if not isinstance(mark, dict) or not isinstance(mark.get("schema"), str) or not isinstance(mark.get("rowid"), bool):
+            return False
+        if not integer(mark.get("rows")) or not (mark.get("max_rowid") is None or integer(mark["max_rowid"])):
+            return False
+    return True
+
+# Incremental SQLite decoder
+# Keeps a JSON Lines export of a growing database up to date. A sidecar
+# state file records the high-water mark of every table, and later runs only
+# append rows whose rowid is above it (and whole new tables) to the output.
+# A changed schema, dropped table, deleted rows or an output file that no
+# longer matches the state falls back to a full export. Rows updated in
+# place below the mark are not detected. Returns True when it succeeded.
+@instrumented("sqlite_update", "rows", output=1)
+def export_sqlite_incremental(db_path, output_file, batch_size=1000):
+    if not os.path.isfile(db_path):
+        print(f"File not found: {db_path}")
+        return False
+
+    state_file = output_file + ".state.json"
+    state = None
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        pass
+    if state is not None and not valid_sqlite_state(state):
+        print(f"Ignoring unreadable state file: {state_file}")
+        state = None
+
+    conn = None
+    part_file = output_file + ".part"
+    try:
+        conn = connect_readonly(db_path)
+        # one read transaction, so marks and rows come from the same snapshot
+        conn.execute("BEGIN")
+        tables = sqlite_tables(conn)
+        marks = {table: sqlite_table_mark(conn, table) for table in tables}
+
+        full = state is None
+        if not full:
+            # an interrupted append leaves extra bytes, a missing or shorter
+            # file means the export was touched since the last run
+            size = os.path.getsize(output_file) if os.path.isfile(output_file) else -1
+            full = size < state["output_size"] or not set(state["tables"]) <= set(tables)
+        if not full:
+            changes = {table: sqlite_table_change(conn, table, state["tables"].get(table), marks[table]) for table in tables}
+            full = "full" in changes.values()
+
+        if full:
+            with open(part_file, "w", encoding="utf-8") as out:
+                for table in tables:
+                    write_sqlite_table(conn, table, out, batch_size, "jsonl")
+            os.replace(part_file, output_file)
+            print("Full export written to:", output_file)
+        else:
+            with open(output_file, "r+b") as out:
+                out.truncate(state["output_size"])
+
+            new_rows = 0
+            with open(output_file, "a", encoding="utf-8") as out:
+                for table in tables:
+                    if changes[table] == "same":
+                        continue
+                    old = state["tables"].get(table)
+                    if old is None:
+                        write_sqlite_table(conn, table, out, batch_size, "jsonl")
+                        new_rows += marks[table]["rows"]
+                        continue
+
+                    prefix = '{"table":' + json.dumps(table) + ',"row":'
+                    cur = sqlite_rows_after(conn, table, old["max_rowid"])
+                    while True:
+                        rows = cur.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        out.write("".join([prefix + compact_json(sqlite_record(row)) + "}\n" for row in rows]))
+                        new_rows += len(rows)
+                        count(len(rows))
+            print(f"Appended {new_rows} new rows to: {output_file}")
+
+        conn.rollback()
+
+        state = {
+            "output_size": os.path.getsize(output_file),
+            "tables": marks
+        }
+        with open(state_file + ".part", "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(state_file + ".part", state_file)
+        return True
+
+    except sqlite3.Error as e:
+        if os.path.exists(part_file):
+            os.remove(part_file)
+        print(f"SQLite error: {e}")
+        return False
+    finally:
+        if conn is not None:
+            conn.close()
+
+# sqlite type affinity of a declared column type, same rules as sqlite uses
+def sqlite_affinity(declared):
+    declared = (declared or "").upper()
+    if "INT" in declared:
+        return "integer"
+    if "CHAR" in declared or "CLOB" in declared or "TEXT" in declared:
+        return "text"
+    if "BLOB" in declared or not declared:
+        return "blob"
+    if "REAL" in declared or "FLOA" in declared or "DOUB" in declared:
+        return "real"
+    return "numeric"
+
+# column file layouts of the columnar export: array typecode of fixed width
+# values, or None for a data file plus an index of end offsets
+column_storages = {
+    "int64": ("q", ".i64"),
+    "float64": ("d", ".f64"),
+    "text": (None, ".txt"),
+    "blob": (None, ".bin"),
+    "json": (None, ".jsonl")
+}
+
+# pick how a column is stored from its declared affinity and the value types
+# it actually holds, since sqlite doesn't enforce declared types
+def column_storage(affinity, types):
+    types = set(types) - {"null"}
+    if not types:
+        types = {affinity if affinity in ("integer", "real", "text") else "blob"}
+    if types == {"integer"}:
+        return "int64"
+    if types == {"real"} or (types == {"integer", "real"} and affinity in ("real", "numeric")):
+        return "float64"
+    if types == {"text"}:
+        return "text"
+    if types == {"blob"}:
+        return "blob"
+    return "json"
+
+# fixed width values are always written little endian
+def write_column_array(out, typecode, values):
+    arr = array.array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    arr.tofile(out)
+
+# write one table as column files into table_dir, returns its manifest entry
+def write_sqlite_columns(conn, table, table_dir, batch_size, selection=None):
+    columns, sql, params = sqlite_table_query(conn, table, selection)
+    os.makedirs(table_dir)
+
+    # one pass over the rows to see which value types each column holds
+    survey = ", ".join(f"group_concat(DISTINCT typeof({quote_identifier(col['name'])}))" for col in columns)
+    found = conn.execute(f"SELECT {survey} FROM ({sql})", params).fetchone()
+
+    entries = []
+    files = []
+    with contextlib.ExitStack() as stack:
+        for i, col in enumerate(columns):
+            types = found[i].split(",") if found[i] else []
+            storage = column_storage(sqlite_affinity(col["type"]), types)
+            typecode, ext = column_storages[storage]
+            entry = {"name": col["name"], "type": col["type"], "storage": storage, "data": f"c{i}{ext}"}
+
+            data = stack.enter_context(open(os.path.join(table_dir, entry["data"]), "wb"))
+            index = nulls = None
+            if storage in ("text", "blob"):
+                entry["index"] = f"c{i}.idx"
+                index = stack.enter_context(open(os.path.join(table_dir, entry["index"]), "wb"))
+                write_column_array(index, "Q", [0])
+            if "null" in types and storage != "json":
+                entry["nulls"] = f"c{i}.nul"
+                nulls = stack.enter_context(open(os.path.join(table_dir, entry["nulls"]), "wb"))
+
+            entries.append(entry)
+            # [storage, data file, index file, null flags file, data offset]
+            files.append([storage, data, index, nulls, 0])
+
+        cur = conn.cursor()
+        cur.row_factory = None
+        cur.execute(sql, params)
+
+        row_count = 0
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            row_count += len(rows)
+
+            # one column at a time across the whole batch
+            for column_files, values in zip(files, zip(*rows)):
+                storage, data, index, nulls, offset = column_files
+
+                if nulls is not None:
+                    nulls.write(bytes([value is None for value in values]))
+
+                if storage in ("int64", "float64"):
+                    write_column_array(data, column_storages[storage][0], [0 if value is None else value for value in values])
+                elif storage in ("text", "blob"):
+                    if storage == "text":
+                        pieces = [b"" if value is None else value.encode("utf-8") for value in values]
+                    else:
+                        pieces = [b"" if value is None else value for value in values]
+                    data.write(b"".join(pieces))
+                    ends = array.array("Q", itertools.accumulate(map(len, pieces), initial=offset))
+                    column_files[4] = ends[-1]
+                    write_column_array(index, "Q", ends[1:])
+                else:
+                    # mixed types: one json value per line, blobs like the json export
+                    lines = []
+                    for value in values:
+                        if isinstance(value, bytes):
+                            value = {"__type__": "blob", "base64": base64.b64encode(value).decode("ascii")}
+                        lines.append(compact_json(value) + "\n")
+                    data.write("".join(lines).encode("utf-8"))
+
+    count(row_count)
+    return {"dir": os.path.basename(table_dir), "rows": row_count, "columns": entries}
+
+# Columnar SQLite export
+# Writes every table as one file per column into output_dir, typed from the
+# declared column types: integers and reals as packed little endian int64 /
+# float64 arrays, text and blobs as raw bytes with an index of uint64 end
+# offsets (starting with a 0), and columns holding mixed types as one json
+# value per line. Columns with nulls get a .nul file with one 0/1 byte per
+# row. manifest.json lists the tables, row counts and column files.
+@instrumented("sqlite_columns", "rows", output=1)
+def export_sqlite_columns(db_path, output_dir, batch_size=1000, selection=None):
+    if not os.path.isfile(db_path):
+        print(f"File not found: {db_path}")
+        return False
+
+    part_dir = output_dir + ".part"
+    shutil.rmtree(part_dir, ignore_errors=True)
+    conn = None
+    try:
+        conn = connect_readonly(db_path)
+        os.makedirs(part_dir)
+        manifest = {"source": os.path.basename(db_path), "byteorder": "little", "tables": {}}
+
+        for n, table in enumerate(sqlite_tables(conn, selection)):
+            # keep directory names file system safe, the manifest has the real names
+            safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in table)
+            manifest["tables"][table] = write_sqlite_columns(conn, table, os.path.join(part_dir, f"{n}_{safe}"), batch_size, selection)
+
+        with open(os.path.join(part_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.isdir(output_dir):
+            shutil.rmtree(output_dir)
+        os.replace(part_dir, output_dir)
+        print("Columnar SQLite export written to:", output_dir)
+        return True
+
+    except (sqlite3.Error, KeyError) as e:
+        shutil.rmtree(part_dir, ignore_errors=True)
+        if isinstance(e, KeyError):
+            print(f"Error: {e}")
+        else:
+            print(f"SQLite error: {e}")
+        return False
+    finally:
+        if conn is not None:
+            conn.close()
+
+# read one column back from a columnar export as a list of values.
+# Blobs come back as bytes, except in mixed type (json) columns.
+def read_sqlite_column(export_dir, table, column):
+    with open(os.path.join(export_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        info = json.load(f)["tables"][table]
+
+    entry = next((col for col in info["columns"] if col["name"] == column), None)
+    if entry is None:
+        raise KeyError(f"Column '{column}' not found in table '{table}'.")
+
+    table_dir = os.path.join(export_dir, info["dir"])
+    storage = entry["storage"]
+    typecode = column_storages[storage][0]
+
+    with open(os.path.join(table_dir, entry["data"]), "rb") as f:
+        data = f.read()
+
+    def load_array(typecode, raw):
+        arr = array.array(typecode)
+        arr.frombytes(raw)
+        if sys.byteorder == "big":
+            arr.byteswap()
+        return arr
+
+    if typecode is not None:
+        values = load_array(typecode, data).tolist()
+    elif storage in ("text", "blob"):
+        with open(os.path.join(table_dir, entry["index"]), "rb") as f:
+            ends = load_array("Q", f.read())
+        values = [data[ends[i]:ends[i + 1]] for i in range(info["rows"])]
+        if storage == "text":
+            values = [value.decode("utf-8") for value in values]
+    else:
+        values = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+    if "nulls" in entry:
+        with open(os.path.join(table_dir, entry["nulls"]), "rb") as f:
+            values = [None if null else value for value, null in zip(values, f.read())]
+
+    return values
@@ -0,0 +1,347 @@
+# XML decoder
+import contextlib
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+
+from data_decoder.cache import cached
+from data_decoder.json_output import compact_json
+from data_decoder.metrics import count, instrumented
+
+
+@instrumented("xml", "lines", output=1)
+@cached("xml")
+def extract_text_from_xml(input_file, output_file):
+    try:
+        # Parse the XML file
+        tree = ET.parse(input_file)
+        root = tree.getroot()
+
+        # Recursive function to gather all text
+        def get_text(element, depth=0):
+            text_content = ""
+
+            if element.text and element.text.strip():
+                text_content += ("  " * depth) + element.text.strip() + "\n"
+
+            for child in element:
+                text_content += get_text(child, depth + 1)
+
+            if element.tail and element.tail.strip():
+                text_content += element.tail.strip() + "\n"
+
+            return text_content
+
+        full_text = get_text(root)
+        count(full_text.count("\n"))
+
+        # Write the text to a new file
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(full_text.strip())
+
+        print(f"Decoded text saved to: {output_file}")
+        return True
+
+    except ET.ParseError as e:
+        print(f"Error parsing XML: {e}")
+        return False
+    except FileNotFoundError:
+        print(f"File not found: {input_file}")
+        return False
+
+# Text pieces of an XML document in document order, the lines written by
+# extract_text_from_xml before its final strip(). source is a path or a file
+# object. An element's text is only final once its first child starts (or it
+# ends), and its tail once the next sibling starts (or its parent ends), so
+# each piece is yielded at that point and finished elements are dropped.
+def iter_xml_text(source):
+    # [element, text written] for every open element
+    stack = []
+    # finished element whose tail is not known yet
+    pending = None
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if stack:
+                parent = stack[-1]
+                if not parent[1]:
+                    text = parent[0].text
+                    if text and text.strip():
+                        yield ("  " * (len(stack) - 1)) + text.strip()
+                    parent[1] = True
+                if pending is not None:
+                    tail = pending.tail
+                    if tail and tail.strip():
+                        yield tail.strip()
+                    pending = None
+                    # drop finished siblings, keep the new child
+                    del parent[0][:-1]
+            stack.append([element, False])
+        else:
+            if not stack.pop()[1]:
+                text = element.text
+                if text and text.strip():
+                    yield ("  " * len(stack)) + text.strip()
+            if pending is not None:
+                tail = pending.tail
+                if tail and tail.strip():
+                    yield tail.strip()
+            del element[:]
+            pending = element
+
+    if pending is not None:
+        tail = pending.tail
+        if tail and tail.strip():
+            yield tail.strip()
+
+# Streaming XML decoder
+# Same output as extract_text_from_xml, but written while parsing so memory
+# stays flat on very large files.
+@instrumented("xml_stream", "lines", output=1)
+@cached("xml")
+def extract_text_from_xml_stream(input_file, output_file):
+    # written next to the output and moved into place once parsing succeeded
+    part_file = output_file + ".part"
+    try:
+        with open(input_file, 'rb') as source, open(part_file, 'w', encoding='utf-8') as f:
+            # text pieces waiting to be written, flushed in batches
+            pieces = []
+            written = False
+
+            def flush():
+                nonlocal written
+                if not pieces:
+                    return
+                # matches the final strip() of the non-streaming decoder
+                if written:
+                    f.write("\n")
+                else:
+                    pieces[0] = pieces[0].lstrip()
+                    written = True
+                f.write("\n".join(pieces))
+                count(len(pieces))
+                pieces.clear()
+
+            for piece in iter_xml_text(source):
+                pieces.append(piece)
+                if len(pieces) >= 4096:
+                    flush()
+            flush()
+
+        os.replace(part_file, output_file)
+        print(f"Decoded text saved to: {output_file}")
+        return True
+
+    except ET.ParseError as e:
+        os.remove(part_file)
+        print(f"Error parsing XML: {e}")
+        return False
+    except FileNotFoundError:
+        print(f"File not found: {input_file}")
+        return False
+
+# element or attribute name without its namespace
+def local_name(tag):
+    return tag.rpartition("}")[2]
+
+# Record path like /feed/entry: names (or * for any) from the root element
+# down, // lets any number of elements come in between and a path without
+# a leading / matches at any depth. Returns [(any depth before, name)].
+def parse_record_path(record_path):
+    path = record_path.strip()
+    if not path.startswith("/"):
+        path = "//" + path
+
+    steps = []
+    i = 0
+    while i < len(path):
+        descendant = path.startswith("//", i)
+        i += 2 if descendant else 1
+        end = path.find("/", i)
+        end = len(path) if end < 0 else end
+        name = path[i:end]
+        if not name or any(ch in name for ch in "[]@()=\"' \t"):
+            raise ValueError(f"Invalid record path: {record_path}. Use element names, * and //, like /feed/entry.")
+        steps.append((descendant, local_name(name)))
+        i = end
+    return steps
+
+# True when the open elements (local names from the root) are a record
+def match_record_path(steps, names):
+    if not steps:
+        return not names
+    if not names:
+        return False
+    descendant, name = steps[0]
+    if name in ("*", names[0]) and match_record_path(steps[1:], names[1:]):
+        return True
+    return descendant and match_record_path(steps, names[1:])
+
+# Parser target that builds the records of a record path straight from the
+# parser callbacks, without building elements. An element becomes json with
+# its attributes under "@name", its text (joined with the text between its
+# children) under "#text" and its children by name, repeated ones as a
+# list. An element with only text becomes that text, an empty one None.
+# Finished records wait in records until the reader takes them.
+class RecordTarget:
+    def __init__(self, steps):
+        self.steps = steps
+        # local names from the root down to the current element outside records
+        self.names = []
+        # (name, record, text pieces) of the open elements of the current
+        # record, None between records. A None piece marks where a child was.
+        self.open = None
+        self.records = []
+        # tag -> local name and attribute -> "@" + local name, tags repeat a lot
+        self.tags = {}
+        self.attributes = {}
+
+    def start(self, tag, attrib):
+        name = self.tags.get(tag)
+        if name is None:
+            name = self.tags[tag] = local_name(tag)
+        if self.open is None:
+            self.names.append(name)
+            if not match_record_path(self.steps, self.names):
+                return
+            self.open = []
+        elif self.open[-1][2]:
+            self.open[-1][2].append(None)
+        record = {}
+        for key, value in attrib.items():
+            key_name = self.attributes.get(key)
+            if key_name is None:
+                key_name = self.attributes[key] = "@" + local_name(key)
+            record[key_name] = value
+        self.open.append((name, record, []))
+
+    def data(self, text):
+        if self.open:
+            self.open[-1][2].append(text)
+
+    def end(self, tag):
+        if self.open is None:
+            self.names.pop()
+            return
+
+        name, record, pieces = self.open.pop()
+        text = None
+        if pieces:
+            if None in pieces:
+                runs = "".join(piece if piece is not None else "\0" for piece in pieces).split("\0")
+                text = " ".join([run.strip() for run in runs if run.strip()])
+            else:
+                text = "".join(pieces).strip()
+        if text:
+            if record:
+                record["#text"] = text
+            else:
+                record = text
+        value = record or None
+
+        if not self.open:
+            self.records.append(value)
+            self.open = None
+            self.names.pop()
+            return
+
+        parent = self.open[-1][1]
+        if name not in parent:
+            parent[name] = value
+        elif isinstance(parent[name], list):
+            parent[name].append(value)
+        else:
+            parent[name] = [parent[name], value]
+
+    def close(self):
+        pass
+
+# Records of an XML document: every element matching the record path, as
+# json (see RecordTarget), in document order. source is a path or a file
+# object. The document is fed to the parser a block at a time and the
+# records of each block are handed out before the next is read, so memory
+# holds a block's records rather than the document.
+def iter_xml_records(source, record_path):
+    target = RecordTarget(parse_record_path(record_path))
+    parser = ET.XMLParser(target=target)
+
+    with contextlib.ExitStack() as stack:
+        if isinstance(source, (str, os.PathLike)):
+            source = stack.enter_context(open(source, "rb"))
+        for block in iter(lambda: source.read(1 << 16), source.read(0)):
+            parser.feed(block)
+            if target.records:
+                yield from target.records
+                target.records.clear()
+        parser.close()
+        yield from target.records
+
+# write records to a text stream: one compact object per line for jsonl,
+# otherwise a json list (pretty or compact, keys sorted like the other
+# decoders). Records are encoded a batch at a time. Returns how many.
+def write_xml_records(source, out, record_path, fmt="jsonl"):
+    records = 0
+    batch = []
+
+    def write_batch():
+        if fmt == "jsonl":
+            out.write("".join([compact_json(record) + "\n" for record in batch]))
+        elif fmt == "compact":
+            out.write(("," if records > len(batch) else "[") + compact_json(batch)[1:-1])
+        else:
+            # drop the "[\n" and "\n]" around the batch
+            out.write((",\n" if records > len(batch) else "[\n") + json.dumps(batch, indent=2, sort_keys=True)[2:-2])
+        count(len(batch))
+        batch.clear()
+
+    for record in iter_xml_records(source, record_path):
+        batch.append(record)
+        records += 1
+        if len(batch) == 1000:
+            write_batch()
+    if batch:
+        write_batch()
+
+    if fmt != "jsonl":
+        out.write(("]" if fmt == "compact" else "\n]") if records else "[]")
+    return records
+
+# Structured XML decoder
+# Writes every element matching record_path (see parse_record_path) as json
+# with its attributes, text and children, one object per line for jsonl.
+# The document is parsed while it is read and every record is dropped once
+# written, so memory stays flat on feeds of any size.
+@instrumented("xml_records", "records", output=1)
+@cached("xml_records")
+def export_xml_records(input_file, output_file, record_path, fmt="jsonl"):
+    try:
+        parse_record_path(record_path)
+    except ValueError as e:
+        print(e)
+        return False
+
+    # written next to the output and moved into place once parsing succeeded
+    part_file = output_file + ".part"
+    began = time.perf_counter()
+    try:
+        with open(input_file, "rb") as source, open(part_file, "w", encoding="utf-8") as out:
+            records = write_xml_records(source, out, record_path, fmt)
+    except ET.ParseError as e:
+        os.remove(part_file)
+        print(f"Error parsing XML: {e}")
+        return False
+    except FileNotFoundError:
+        print(f"File not found: {input_file}")
+        return False
+
+    if not records:
+        os.remove(part_file)
+        print(f"No elements match {record_path} in {input_file}.")
+        return False
+
+    os.replace(part_file, output_file)
+    elapsed = time.perf_counter() - began
+    print(f"{records:,} records written to: {output_file} "
+          f"({records / elapsed if elapsed > 0 else 0:,.0f} records/s)")
+    return True
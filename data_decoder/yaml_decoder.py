@@ -0,0 +1,260 @@
+# YAML decoder
+import functools
+import json
+
+from data_decoder.cache import cached
+from data_decoder.json_output import compact_json, indent_json
+from data_decoder.metrics import count, instrumented
+
+
+# pase value function
+def parse_value(value):
+    return parse_scalar(value.strip())
+
+# scalar resolver behind parse_value. The first character decides which
+# checks can apply, so plain strings never go through float() and its
+# exception, and recent literals are cached since config values repeat.
+@functools.lru_cache(maxsize=4096)
+def parse_scalar(value):
+    if value == "":
+        return None
+
+    first = value[0]
+
+    if first in "nNtTfF":
+        lower = value.lower()
+        if lower == "null":
+            return None
+        if lower == "true":
+            return True
+        if lower == "false":
+            return False
+
+    # only these can start something float() accepts
+    if first.isdigit() or first in "+-.":
+        if value.isdigit():
+            return int(value)
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    elif first in "iInN" and value.lower() in ("inf", "infinity", "nan"):
+        return float(value)
+
+    if (first == '"' and value.endswith('"')) or \
+       (first == "'" and value.endswith("'")):
+        return value[1:-1]
+
+    return value
+
+# Reads the lines one at a time and yields every top-level entry once it is
+# complete: (key, value) for a mapping, (None, item) for a top-level list.
+# Finished entries are dropped, so only the entry being read is in memory.
+def iter_yaml(lines):
+    root = {}
+    # (indent, container, owner, key): owner[key] is where the container is
+    # stored, so an empty mapping can be swapped for a list when its first
+    # "- " item shows up. owner is None for the root and list items.
+    stack = [(-1, root, None, None)]
+
+    # a top-level entry is still being read
+    pending = False
+    pending_key = None
+    # a top-level key was seen, so the document is a mapping
+    has_keys = False
+
+    for raw_line in lines:
+        line = raw_line.split("#", 1)[0].rstrip()
+        if not line.strip():
+            continue
+
+        indent = len(line) - len(line.lstrip(" "))
+        line = line.lstrip()
+        is_item = line.startswith("- ")
+
+        while indent <= stack[-1][0]:
+            top_indent, container, owner, _ = stack[-1]
+            # "- " items may sit at the indent of their key, they belong to
+            # that key while it is still empty (or already their list)
+            if is_item and top_indent == indent and owner is not None and \
+                    (isinstance(container, list) or not container):
+                break
+            stack.pop()
+
+        # a new top-level line completes the previous entry
+        if pending and len(stack) == 1:
+            if isinstance(root, list):
+                yield None, root.pop()
+            else:
+                yield pending_key, root.pop(pending_key)
+            pending = False
+
+        parent = stack[-1][1]
+
+        # list item
+        if is_item:
+            value_part = line[2:].strip()
+
+            if not isinstance(parent, list):
+                new_list = []
+
+                if len(stack) == 1 and not has_keys:
+                    # the document itself is a list
+                    root = new_list
+                    stack[0] = (-1, root, None, None)
+                elif parent or stack[-1][2] is None:
+                    # only an empty key can become a list, a mapping that
+                    # already has keys keeps them and the stray item is skipped
+                    continue
+                else:
+                    list_indent, _, owner, owner_key = stack[-1]
+                    stack[-1] = (list_indent, new_list, owner, owner_key)
+                    if owner is not None:
+                        owner[owner_key] = new_list
+
+                parent = new_list
+
+            if ":" in value_part:
+                item = {}
+                parent.append(item)
+                stack.append((indent, item, None, None))
+
+                key, value = value_part.split(":", 1)
+                item[key.strip()] = parse_value(value.strip())
+            else:
+                parent.append(parse_value(value_part))
+
+            if parent is root:
+                pending = True
+
+            continue
+
+        # key / value
+        if ":" in line:
+            key, value = line.split(":", 1)
+            key = key.strip()
+            value = value.strip()
+
+            if value == "":
+                parent[key] = {}
+                stack.append((indent, parent[key], parent, key))
+            else:
+                parent[key] = parse_value(value)
+
+            if parent is root:
+                pending = True
+                pending_key = key
+                has_keys = True
+
+    if pending:
+        if isinstance(root, list):
+            yield None, root.pop()
+        else:
+            yield pending_key, root.pop(pending_key)
+
+# decode a whole YAML document, lines can be any iterable such as an open file
+@instrumented("yaml", "entries")
+def decode_yaml(lines):
+    result = None
+    for key, value in iter_yaml(lines):
+        if key is None:
+            if result is None:
+                result = []
+            result.append(value)
+        else:
+            if result is None:
+                result = {}
+            result[key] = value
+
+    if result is None:
+        return {}
+    count(len(result))
+    return result
+
+# write a YAML document as json while reading it. pretty and compact match
+# json.dump with indent=2 or compact separators and sort_keys=True, except
+# that top-level keys keep document order. jsonl writes every top-level list
+# item, or {key: value} for a mapping, on its own line. List items are
+# encoded a batch at a time.
+def write_yaml_json_stream(lines, out, fmt="pretty"):
+    is_list = None
+    first = True
+    items = []
+
+    def write_items():
+        nonlocal first
+        if fmt == "jsonl":
+            out.write("".join([compact_json(item) + "\n" for item in items]))
+        elif fmt == "compact":
+            out.write(("" if first else ",") + compact_json(items)[1:-1])
+        else:
+            # drop the "[\n" and "\n]" around the batch
+            out.write(("\n" if first else ",\n") + json.dumps(items, indent=2, sort_keys=True)[2:-2])
+        first = False
+        items.clear()
+
+    for key, value in iter_yaml(lines):
+        count(1)
+        if is_list is None:
+            is_list = key is None
+            if fmt != "jsonl":
+                out.write("[" if is_list else "{")
+
+        if is_list:
+            items.append(value)
+            if len(items) == 1000:
+                write_items()
+        elif fmt == "jsonl":
+            out.write(compact_json({key: value}) + "\n")
+        elif fmt == "compact":
+            out.write(("" if first else ",") + json.dumps(key, ensure_ascii=False) + ":" + compact_json(value))
+            first = False
+        else:
+            out.write(("\n  " if first else ",\n  ") + json.dumps(key) + ": " + indent_json(value, 1))
+            first = False
+
+    if items:
+        write_items()
+
+    if fmt == "jsonl":
+        return
+    if is_list is None:
+        out.write("{}")
+    elif fmt == "compact":
+        out.write("]" if is_list else "}")
+    else:
+        out.write("\n]" if is_list else "\n}")
+
+# YAML file decoder, writes the decoded tree as json. In stream mode every
+# top-level entry is written as soon as it is read, so memory stays flat;
+# top-level keys then keep document order instead of being sorted. jsonl
+# output is always streamed.
+@instrumented("yaml_json", "entries", output=1)
+@cached("yaml_json")
+def export_yaml_json(input_file, output_file, stream=False, fmt="pretty"):
+    try:
+        with open(input_file, "r", encoding="utf-8") as f:
+            if stream or fmt == "jsonl":
+                with open(output_file, "w", encoding="utf-8") as out:
+                    write_yaml_json_stream(f, out, fmt)
+            else:
+                data = decode_yaml(f)
+
+                with open(output_file, "w", encoding="utf-8") as out:
+                    if fmt == "compact":
+                        out.write(compact_json(data))
+                    else:
+                        json.dump(
+                            data,
+                            out,
+                            indent=2,          # pretty formatting
+                            sort_keys=True     # deterministic ordering
+                        )
+
+    except FileNotFoundError:
+        print(f"File not found: {input_file}")
+        return False
+
+    print("Decoded YAML written to:", output_file)
+    return True
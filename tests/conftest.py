@@ -0,0 +1,22 @@
+# Shared fixtures. The tests import the package from the repository root
+# and run every decode inside a temporary folder.
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# run in a temporary folder with the default settings and no result cache
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    from data_decoder import config, metrics
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "result_cache", False)
+    monkeypatch.setattr(config, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "output_format", "pretty")
+    monkeypatch.setattr(metrics, "metrics_file", None)
+    monkeypatch.setattr(metrics, "profile_mode", None)
+    return tmp_path
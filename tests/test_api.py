@@ -0,0 +1,102 @@
+import io
+import pathlib
+import sqlite3
+
+import pytest
+
+from data_decoder import api
+from data_decoder.sqlite_decoder import sqlite_selection
+
+feed = "<feed><entry id='1'><title>One</title></entry><entry id='2'>Two<x/>tail</entry></feed>"
+table = "id,name\n1, Ann \n2,\n3,Cy\n"
+doc = "name: app\nitems:\n  - 1\n  - two\nnested:\n  k: v\n"
+
+
+@pytest.fixture
+def database(workdir):
+    path = workdir / "app.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, data BLOB)")
+    conn.executemany("INSERT INTO users (name, data) VALUES (?, ?)", [("a", b"\x00"), ("b", None), ("c", b"hi")])
+    conn.execute("CREATE TABLE logs (line TEXT)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+# every kind of source gives the same result
+def sources(workdir, text):
+    path = workdir / "source.txt"
+    path.write_text(text, encoding="utf-8")
+    return [text, text.encode("utf-8"), path, io.StringIO(text), io.BytesIO(text.encode("utf-8"))]
+
+
+def test_xml(workdir, capsys):
+    for source in sources(workdir, feed):
+        assert api.xml_text(source) == "One\n  Two\ntail"
+    assert list(api.xml_lines(feed)) == ["One", "  Two", "tail"]
+    assert list(api.xml_records(feed, "/feed/entry")) == [{"@id": "1", "title": "One"}, {"@id": "2", "#text": "Two tail", "x": None}]
+    assert api.xml_json(feed, "//title") == '"One"\n'
+    out = io.StringIO()
+    assert api.xml_json(feed, "//title", out, "compact") is None and out.getvalue() == '["One"]'
+    assert capsys.readouterr().out == ""
+
+
+def test_csv(workdir, capsys):
+    for source in sources(workdir, table):
+        assert api.csv_columns(source, ["name", "id"]) == {"name": ["Ann", "Cy"], "id": ["1", "2", "3"]}
+    assert list(api.csv_rows(table, "name")) == [{"name": "Ann"}, {"name": ""}, {"name": "Cy"}]
+    with pytest.raises(KeyError):
+        api.csv_columns(table, ["missing"])
+    assert capsys.readouterr().out == ""
+
+
+def test_sqlite(database, capsys):
+    data = database.read_bytes()
+    conn = sqlite3.connect(database)
+    for source in (database, str(database), data, io.BytesIO(data), conn):
+        document = api.sqlite_data(source)
+        assert list(document["tables"]) == ["logs", "users"]
+        assert document["tables"]["users"]["rows"][0] == {"id": 1, "name": "a", "data": {"__type__": "blob", "base64": "AA=="}}
+    conn.close()
+
+    assert [row["name"] for row in api.sqlite_rows(database, "users", batch_size=2)] == ["a", "b", "c"]
+    assert api.sqlite_json(database, fmt="jsonl").count("\n") == 5
+    assert capsys.readouterr().out == ""
+
+
+def test_sqlite_errors_are_raised(database, capsys):
+    with pytest.raises(KeyError, match="No tables match"):
+        api.sqlite_data(database, sqlite_selection(tables="nothing*"))
+    with pytest.raises(KeyError, match="No tables match"):
+        api.sqlite_json(database, selection=sqlite_selection(tables="users,nothing"))
+    with pytest.raises(sqlite3.OperationalError):
+        list(api.sqlite_rows(database, "missing"))
+    with pytest.raises(FileNotFoundError):
+        api.sqlite_data(pathlib.Path("missing.sqlite"))
+    with pytest.raises(TypeError):
+        api.sqlite_data(io.StringIO("text"))
+    assert capsys.readouterr().out == ""
+
+
+def test_yaml(workdir, capsys):
+    expected = {"name": "app", "items": [1, "two"], "nested": {"k": "v"}}
+    for source in sources(workdir, doc):
+        assert api.yaml_data(source) == expected
+    assert list(api.yaml_entries(doc)) == list(expected.items())
+    assert api.yaml_json(doc, fmt="compact") == '{"items":[1,"two"],"name":"app","nested":{"k":"v"}}'
+    assert api.yaml_json(doc, fmt="jsonl").count("\n") == 3
+    assert capsys.readouterr().out == ""
+
+
+def test_numbers(workdir, capsys):
+    for source in sources(workdir, "ff 0a\nzz\n\n10\n"):
+        assert api.numbers_text(source, "dec", "hex") == "255 10\n16"
+    lines = list(api.number_lines("ff\nzz", "bin", "hex", per_byte=False))
+    assert lines[0] == ("ff", "11111111", None)
+    assert lines[1][:2] == ("zz", None) and lines[1][2].startswith("Invalid number value")
+    with pytest.raises(ValueError):
+        list(api.number_lines("1", "bin", "base64"))
+    assert api.bytes_text(bytes(range(5)), "hex", 2) == "00 01\n02 03\n04"
+    assert api.bytes_text(io.BytesIO(b"\x07"), "bin") == "00000111"
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,161 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+from data_decoder import cache, config
+from data_decoder.sqlite_decoder import export_sqlite_json
+from data_decoder.yaml_decoder import export_yaml_json
+
+
+@pytest.fixture
+def result_cache(workdir, monkeypatch):
+    monkeypatch.setattr(config, "result_cache", True)
+    monkeypatch.setattr(config, "cache_mode", "copy")
+    monkeypatch.setattr(config, "cache_size_mb", 512)
+    monkeypatch.setattr(cache, "stats", dict.fromkeys(cache.stats, 0))
+    return cache.stats
+
+
+def write_old(path, text):
+    path.write_text(text, encoding="utf-8")
+    # older than racy_seconds, so its hash is remembered
+    old = time.time() - 60
+    os.utime(path, (old, old))
+
+
+def test_hit_restores_output(workdir, result_cache, capsys):
+    write_old(workdir / "a.yaml", "a: 1\nb:\n  - x\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    first = (workdir / "out.json").read_text()
+    os.remove("out.json")
+
+    assert export_yaml_json("a.yaml", "out.json")
+    assert (workdir / "out.json").read_text() == first
+    assert "Cached result" in capsys.readouterr().out
+    assert (result_cache["misses"], result_cache["hits"], result_cache["stored"]) == (1, 1, 1)
+
+
+def test_changed_input_misses(workdir, result_cache):
+    write_old(workdir / "a.yaml", "a: 1\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    write_old(workdir / "a.yaml", "a: 2\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    assert '"a": 2' in (workdir / "out.json").read_text()
+    assert result_cache["hits"] == 0 and result_cache["misses"] == 2
+
+
+# same size and modification time with new content still has to miss while
+# the file is recent enough for its hash to be computed again
+def test_recent_change_with_same_size_misses(workdir, result_cache):
+    path = workdir / "a.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    stamp = os.stat(path).st_mtime_ns
+    assert export_yaml_json("a.yaml", "out.json")
+    path.write_text("a: 2\n", encoding="utf-8")
+    os.utime(path, ns=(stamp, stamp))
+    assert export_yaml_json("a.yaml", "out.json")
+    assert '"a": 2' in (workdir / "out.json").read_text()
+
+
+def test_options_are_part_of_the_key(workdir, result_cache):
+    write_old(workdir / "a.yaml", "a: 1\n")
+    assert export_yaml_json("a.yaml", "out.json", fmt="pretty")
+    assert export_yaml_json("a.yaml", "out.json", fmt="compact")
+    assert (workdir / "out.json").read_text().strip() == '{"a":1}'
+    assert result_cache["hits"] == 0
+    # the pretty result is still cached, whatever output it goes to
+    assert export_yaml_json("a.yaml", "other.json", fmt="pretty")
+    assert result_cache["hits"] == 1
+
+
+def test_wal_changes_miss(workdir, result_cache):
+    path = str(workdir / "a.sqlite")
+    writer = sqlite3.connect(path)
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("CREATE TABLE t (v)")
+    writer.execute("INSERT INTO t VALUES (1)")
+    writer.commit()
+    assert export_sqlite_json(path, "out.json")
+    # batch sizes don't change the output
+    assert export_sqlite_json(path, "out.json", batch_size=7)
+    assert result_cache["hits"] == 1
+    # the new row only lives in the write-ahead log
+    writer.execute("INSERT INTO t VALUES (2)")
+    writer.commit()
+    assert export_sqlite_json(path, "out.json")
+    writer.close()
+    assert '"v": 2' in (workdir / "out.json").read_text()
+    assert result_cache["hits"] == 1
+
+
+def test_link_mode_releases_before_decoding(workdir, result_cache, monkeypatch):
+    monkeypatch.setattr(config, "cache_mode", "link")
+    write_old(workdir / "a.yaml", "a: 1\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    assert export_yaml_json("a.yaml", "out.json")
+    assert os.stat("out.json").st_nlink == 2
+
+    write_old(workdir / "a.yaml", "a: 2\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    # the cached copy of the first result is untouched
+    os.remove("out.json")
+    write_old(workdir / "a.yaml", "a: 1\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    assert '"a": 1' in (workdir / "out.json").read_text()
+
+
+def test_trim_drops_least_recently_used(workdir, result_cache, monkeypatch):
+    for n in range(3):
+        write_old(workdir / f"{n}.yaml", f"n: {n}\nfill: {'x' * 3000}\n")
+        assert export_yaml_json(f"{n}.yaml", f"{n}.json")
+        old = time.time() - 100 + n
+        for key in os.listdir(cache.results_folder()):
+            path = os.path.join(cache.results_folder(), key)
+            if os.stat(path).st_mtime > old:
+                os.utime(path, (old, old))
+
+    cache.trim(2 * 3100)
+    assert result_cache["evicted"] == 1
+    assert cache.cache_usage()[0] == 2
+    os.remove("0.json")
+    assert export_yaml_json("0.yaml", "0.json")
+    assert result_cache["hits"] == 0
+
+    assert cache.clear_cache() >= 2
+    assert cache.cache_usage() == (0, 0)
+
+
+def test_off_by_default(workdir):
+    write_old(workdir / "a.yaml", "a: 1\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    assert not os.path.exists(cache.results_folder())
+
+
+def test_new_version_misses(workdir, result_cache, monkeypatch):
+    write_old(workdir / "a.yaml", "a: 1\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    monkeypatch.setattr(config, "version", config.version + ".1")
+    assert export_yaml_json("a.yaml", "out.json")
+    monkeypatch.setattr(cache, "cache_format", cache.cache_format + 1)
+    assert export_yaml_json("a.yaml", "out.json")
+    assert result_cache["hits"] == 0 and result_cache["misses"] == 3
+
+
+# a hit notes its use on the result's .json, a linked output keeps its time
+def test_hits_leave_linked_outputs_alone(workdir, result_cache, monkeypatch):
+    monkeypatch.setattr(config, "cache_mode", "link")
+    write_old(workdir / "a.yaml", "a: 1\n")
+    assert export_yaml_json("a.yaml", "out.json")
+    [key] = [name for name in os.listdir(cache.results_folder()) if "." not in name]
+    entry = os.path.join(cache.results_folder(), key)
+    old = time.time() - 1000
+    for path in (entry, entry + ".json"):
+        os.utime(path, (old, old))
+
+    assert export_yaml_json("a.yaml", "out.json")
+    assert result_cache["hits"] == 1
+    assert os.stat("out.json").st_ino == os.stat(entry).st_ino
+    assert os.stat("out.json").st_mtime == pytest.approx(old)
+    assert os.stat(entry + ".json").st_mtime > old + 900
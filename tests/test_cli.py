@@ -0,0 +1,49 @@
+import pytest
+
+from data_decoder.cli import run_cli
+
+
+@pytest.mark.parametrize("workers", ["0", "-2"])
+def test_decode_dir_needs_a_worker(workdir, capsys, workers):
+    (workdir / "a.yaml").write_text("a: 1\n", encoding="utf-8")
+    assert run_cli(["decode-dir", str(workdir), "--workers", workers]) == 1
+    assert "Workers must be at least 1." in capsys.readouterr().out
+    assert not (workdir / "a.yaml.decoded.json").exists()
+
+
+def test_decode_dir(workdir, capsys):
+    (workdir / "a.yaml").write_text("a: 1\n", encoding="utf-8")
+    assert run_cli(["decode-dir", str(workdir), "--workers", "1"]) == 0
+    assert (workdir / "a.yaml.decoded.json").exists()
+
+
+@pytest.mark.parametrize("bytes_per_line", ["0", "-1"])
+def test_binary_dump_needs_a_byte_per_line(workdir, capsys, bytes_per_line):
+    (workdir / "data.bin").write_bytes(bytes(range(40)))
+    argv = ["num", "data.bin", "--binary", "--to", "hex", "--bytes-per-line", bytes_per_line, "-o", "out.txt"]
+    assert run_cli(argv) == 1
+    assert "Bytes per line must be at least 1." in capsys.readouterr().out
+    assert not (workdir / "out.txt").exists()
+
+
+def test_binary_dump(workdir):
+    (workdir / "data.bin").write_bytes(bytes(range(40)))
+    assert run_cli(["num", "data.bin", "--binary", "--to", "hex", "--bytes-per-line", "8", "-o", "out.txt"]) == 0
+    lines = (workdir / "out.txt").read_text().splitlines()
+    assert len(lines) == 5 and lines[0] == "00 01 02 03 04 05 06 07"
+
+
+def test_bench_help_lists_every_case(capsys):
+    from data_decoder.bench import bench_cases
+
+    with pytest.raises(SystemExit):
+        run_cli(["bench", "--help"])
+    help_text = " ".join(capsys.readouterr().out.split())
+    assert all(case in help_text for case in bench_cases)
+
+
+@pytest.mark.parametrize("chunk", ["0", "-5"])
+def test_num_chunk_needs_a_byte(workdir, capsys, chunk):
+    (workdir / "values.txt").write_text("ff\n", encoding="utf-8")
+    assert run_cli(["num", "values.txt", "--from", "hex", "--to", "dec", "--chunk", chunk, "--workers", "2"]) == 1
+    assert "Chunk size must be at least 1 byte." in capsys.readouterr().out
@@ -0,0 +1,62 @@
+import pytest
+
+from data_decoder.csv_decoder import decode_csv, decode_csv_batch
+
+
+files = {
+    "a.csv": "id,name,note\n1, Ann ,x\n2,Bob,\n\n3,,z\n4\n5,Eve\n",
+    "b.csv": 'id,name,note\n10,"Smith, J","multi\nline"\n11,é字,y,extra\n',
+    # duplicate headers: the last one wins, like csv.DictReader
+    "dup.csv": "name,id,name\nfirst,1,last\nonly,2\n",
+    "empty.csv": "",
+}
+
+
+@pytest.fixture
+def parts(workdir):
+    folder = workdir / "parts"
+    folder.mkdir()
+    for name, text in files.items():
+        (folder / name).write_text(text, encoding="utf-8", newline="")
+    return folder
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+# the batch writes the files decode_csv writes one column at a time
+def test_batch_matches_single_columns(parts, capsys):
+    assert decode_csv_batch([str(parts / "*.csv")], ["name", "id", "name"]) is False
+    batch = {path.name: read(path) for path in parts.glob("*_decoded.txt")}
+    assert "Column 'name' not found in CSV file" in capsys.readouterr().out
+
+    for path in parts.glob("*_decoded.txt"):
+        path.unlink()
+    for name in files:
+        for column in ("name", "id"):
+            decode_csv(str(parts / name), str(parts / f"{name[:-4]}_{column}_decoded.txt"), column)
+    single = {path.name: read(path) for path in parts.glob("*_decoded.txt")}
+
+    assert batch == single
+    assert batch["dup_name_decoded.txt"] == "last\n"
+    assert batch["a_name_decoded.txt"] == "Ann\nBob\nEve\n"
+    assert batch["b_name_decoded.txt"] == "Smith, J\né字\n"
+    assert "empty_id_decoded.txt" not in batch
+
+
+def test_missing_column(parts, capsys):
+    assert not decode_csv_batch([str(parts / "a.csv")], ["id", "missing"])
+    assert "Column 'missing' not found" in capsys.readouterr().out
+    assert read(parts / "a_id_decoded.txt") == "1\n2\n3\n4\n5\n"
+    assert not (parts / "a_missing_decoded.txt").exists()
+    assert not decode_csv(str(parts / "a.csv"), "out.txt", "missing")
+
+
+def test_batch_reports_unmatched_patterns(parts, capsys):
+    assert not decode_csv_batch([str(parts / "*.tsv"), str(parts / "gone.csv")], ["id"])
+    out = capsys.readouterr().out
+    assert "No files match" in out and "File not found" in out
+    assert decode_csv_batch([str(parts / "a.csv"), str(parts / "b.csv")], ["note"])
+    assert read(parts / "b_note_decoded.txt") == "multi\nline\ny\n"
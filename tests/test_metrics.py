@@ -0,0 +1,45 @@
+import pytest
+
+from data_decoder import metrics
+from data_decoder.num_decoder import convert_binary_file, convert_num_file
+
+
+def record_of(func, *args):
+    with metrics.collect() as records:
+        result = func(*args)
+    [record] = records
+    return result, record
+
+
+@pytest.mark.parametrize("result, ok", [(True, True), (False, False), (0, True), ({}, True), (None, True)])
+def test_only_false_fails_by_default(result, ok):
+    decoder = metrics.instrumented("test", "items")(lambda: result)
+    assert record_of(decoder)[1]["ok"] is ok
+
+
+def test_decoder_predicate():
+    decoder = metrics.instrumented("test", "items", failed=lambda n: n < 0)(lambda n: n)
+    assert record_of(decoder, 0)[1]["ok"] is True
+    assert record_of(decoder, -1)[1]["ok"] is False
+
+
+def test_exceptions_fail():
+    def broken():
+        raise ValueError("bad")
+
+    with metrics.collect() as records:
+        with pytest.raises(ValueError):
+            metrics.instrumented("test", "items")(broken)()
+    assert records[0]["ok"] is False
+
+
+def test_number_converters(workdir):
+    (workdir / "values.txt").write_text("ff\n10\n", encoding="utf-8")
+    (workdir / "bad.txt").write_text("zz\n", encoding="utf-8")
+    (workdir / "empty.bin").write_bytes(b"")
+
+    converted, record = record_of(convert_num_file, "values.txt", "out.txt", "dec", "hex", False)
+    assert converted == 2 and record["ok"] and record["items"] == 2
+    assert record_of(convert_num_file, "bad.txt", "out2.txt", "dec", "hex", False)[1]["ok"] is False
+    assert record_of(convert_binary_file, "empty.bin", "out3.txt", "hex")[1]["ok"] is False
+    assert record_of(convert_binary_file, "values.txt", "out4.txt", "hex")[1]["ok"] is True
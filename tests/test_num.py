@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from data_decoder.num_decoder import convert_num_file, convertnum, convertnum_lines
+
+
+@pytest.fixture
+def values(workdir):
+    rng = random.Random(7)
+    lines = []
+    for n in range(6000):
+        if n % 500 == 0:
+            lines.append("not a number")
+        elif n % 333 == 0:
+            lines.append("")
+        else:
+            lines.append(" ".join(format(rng.randrange(256), "02x") for _ in range(rng.randrange(1, 9))))
+    (workdir / "values.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return "values.txt"
+
+
+# line aligned ranges converted on worker processes come back in order
+@pytest.mark.parametrize("per_byte", [False, True])
+@pytest.mark.parametrize("workers, chunk_size", [(2, 4096), (4, 1000), (3, 1 << 20)])
+def test_parallel_matches_serial(workdir, values, per_byte, workers, chunk_size):
+    serial = convert_num_file(values, "serial.txt", "bin", "hex", per_byte, chunk_size)
+    parallel = convert_num_file(values, "parallel.txt", "bin", "hex", per_byte, chunk_size, workers)
+    assert parallel == serial > 0
+    assert (workdir / "parallel.txt").read_bytes() == (workdir / "serial.txt").read_bytes()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunk_size", [0, -5])
+def test_chunk_size_needs_a_byte(workdir, values, capsys, workers, chunk_size):
+    assert convert_num_file(values, "out.txt", "bin", "hex", False, chunk_size, workers) == 0
+    assert "Chunk size must be at least 1 byte." in capsys.readouterr().out
+    assert not (workdir / "out.txt").exists()
+
+
+lines = [
+    "00 ff 0A FF", "7f", "12C 300 256", "255 256", "0x1f", "0b101", "0o17", "0X1F 0B11",
+    "aB cD", "ABCDEF", "deadbeef", "  ff   00  ", "ff  00", "1\t2", "101 11111111 100000000",
+    "\u0661\u0662", "\uff11\uff10", "\u0661 2", "zz", "12 zz", "-1", "+7", "1_0", "", "   ",
+    "377 400 7", "00000001", "000 001 255", "1e3", "ff ", " 0a",
+]
+
+
+# the fast paths give what convertnum gives line by line, messages included
+@pytest.mark.parametrize("per_byte", [False, True])
+@pytest.mark.parametrize("type_in", ["bin", "oct", "dec", "hex"])
+@pytest.mark.parametrize("type_out", ["bin", "oct", "dec", "hex"])
+def test_bulk_matches_convertnum(capsys, type_out, type_in, per_byte):
+    expected = []
+    for line in lines:
+        if line.strip():
+            expected.append((line.strip(), convertnum(line.strip(), type_out, type_in, per_byte)))
+    expected_messages = capsys.readouterr().out
+
+    assert list(convertnum_lines(lines, type_out, type_in, per_byte)) == expected
+    assert capsys.readouterr().out == expected_messages
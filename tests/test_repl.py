@@ -0,0 +1,21 @@
+import pytest
+
+pytest.importorskip("colorama")
+
+from data_decoder.repl import split_options  # noqa: E402
+
+
+def test_split_options():
+    assert split_options('"my db.sqlite" --where "a > 1" --limit 5') == ("my db.sqlite", {"where": "a > 1", "limit": "5"})
+    assert split_options("db.sqlite") == ("db.sqlite", {})
+
+
+@pytest.mark.parametrize("text", [
+    "db.sqlite --where",
+    "db.sqlite --tables --limit 5",
+    "db.sqlite --limit",
+    "db.sqlite --columns",
+])
+def test_options_need_values(text):
+    with pytest.raises(ValueError, match="needs a value"):
+        split_options(text)
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+
+import pytest
+
+from data_decoder import server
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs unix sockets")
+
+
+# run a thread mode server in the background until the test is done
+@pytest.fixture
+def start_server(workdir, monkeypatch):
+    # start_worker routes prints through JobOutput, put the real stdout back afterwards
+    monkeypatch.setattr(sys, "stdout", sys.stdout)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(workdir / "run"))
+    os.makedirs(workdir / "run", mode=0o700)
+    started = []
+
+    def start(**options):
+        options.setdefault("workers", 2)
+        thread = threading.Thread(target=asyncio.run, args=(server.serve_jobs(use_threads=True, **options),))
+        thread.start()
+        address = {key: options.get(key) for key in ("socket_path", "host", "port")}
+        started.append((thread, address))
+        for _ in range(200):
+            try:
+                if server.send_command("ping", **address)["ok"]:
+                    return address
+            except OSError:
+                time.sleep(0.02)
+        raise AssertionError("the server didn't start")
+
+    yield start
+    for thread, address in started:
+        server.send_command("shutdown", **address)
+        thread.join(10)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def write_yaml(workdir, n):
+    path = workdir / f"doc{n}.yaml"
+    path.write_text(f"name: doc{n}\nitems:\n  - {n}\n  - {n + 1}\n", encoding="utf-8")
+    return str(path)
+
+
+def test_jobs_round_trip_in_order(start_server, workdir):
+    address = start_server(socket_path=str(workdir / "s.sock"))
+    jobs = [{"decoder": "yaml", "input_file": write_yaml(workdir, n)} for n in range(30)]
+    jobs.insert(5, {"decoder": "yaml", "input_file": str(workdir / "missing.yaml")})
+    jobs.insert(9, {"decoder": "nope", "input_file": "x"})
+
+    responses = list(server.submit_jobs(jobs, **address))
+    assert [job for job, _ in responses] == jobs
+    for job, response in responses:
+        if job["decoder"] == "nope" or "missing" in job["input_file"]:
+            assert not response["ok"]
+            continue
+        assert response["ok"], response
+        output = job["input_file"] + ".decoded.json"
+        assert response["outputs"] == [output]
+        assert any(output in message for message in response["messages"])
+        with open(output, encoding="utf-8") as f:
+            name = os.path.basename(job["input_file"])[:-5]
+            assert json.load(f)["name"] == name
+
+    stats = server.send_command("stats", **address)
+    assert stats["done"] == 32 and stats["failed"] == 2
+
+
+def test_socket_is_private(start_server, workdir):
+    address = start_server()
+    socket_path = os.path.join(str(workdir / "run"), "data_decoder", "server.sock")
+    assert stat.S_ISSOCK(os.stat(socket_path).st_mode)
+    assert os.stat(socket_path).st_mode & 0o077 == 0
+    assert os.stat(os.path.dirname(socket_path)).st_mode & 0o077 == 0
+    assert server.send_command("ping", **address)["ok"]
+
+
+def test_shared_folder_is_refused(workdir, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(workdir))
+    os.makedirs(workdir / "data_decoder", mode=0o755)
+    os.chmod(workdir / "data_decoder", 0o755)
+    with pytest.raises(OSError):
+        server.resolve_address()
+
+
+def test_tcp_needs_token(start_server, workdir):
+    port = free_port()
+    address = start_server(port=port)
+    assert os.stat(server.token_file(port)).st_mode & 0o077 == 0
+
+    for wrong in ("wrong", "tökén", "\ud800", 12):
+        response = server.send_command("stats", port=port, token=wrong)
+        assert not response["ok"] and "token" in response["error"]
+    job = {"decoder": "yaml", "input_file": write_yaml(workdir, 1)}
+    [(_, response)] = server.submit_jobs([job], port=port, token="wrong")
+    assert not response["ok"]
+    assert not os.path.exists(job["input_file"] + ".decoded.json")
+
+    [(_, response)] = server.submit_jobs([job], **address)
+    assert response["ok"]
+
+
+# with one worker and a queue of one the server stops reading a connection
+# once a job runs, one waits and one more is read
+def test_full_queue_stops_reading(start_server, workdir, monkeypatch):
+    gate = threading.Event()
+
+    def slow_job(job):
+        gate.wait(10)
+        return {"ok": True, "n": job["n"]}
+
+    monkeypatch.setattr(server, "run_job", slow_job)
+    address = start_server(socket_path=str(workdir / "s.sock"), workers=1, queue_size=1)
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.connect(address["socket_path"])
+    conn.sendall("".join(json.dumps({"id": n, "n": n}) + "\n" for n in range(50)).encode("utf-8"))
+    time.sleep(0.3)
+    stats = server.send_command("stats", **address)
+    assert stats["received"] <= 3
+    assert stats["running"] == 1
+
+    gate.set()
+    with conn, conn.makefile("r", encoding="utf-8") as responses:
+        got = [json.loads(responses.readline()) for _ in range(50)]
+    assert [response["id"] for response in got] == list(range(50))
+    assert all(response["ok"] for response in got)
@@ -0,0 +1,247 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from data_decoder.sqlite_decoder import export_sqlite_json, sqlite_selection
+
+
+@pytest.fixture
+def database(workdir):
+    path = str(workdir / "app.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, note TEXT)")
+    conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, total REAL, data BLOB)")
+    conn.execute("CREATE TABLE secrets (value TEXT)")
+    conn.executemany("INSERT INTO users (name, note) VALUES (?, ?)",
+                     [(f"user{i}", "it's (fine)" if i % 3 else None) for i in range(250)])
+    conn.executemany("INSERT INTO orders (user_id, total, data) VALUES (?, ?, ?)",
+                     [(i % 250, i * 1.25, bytes([i % 256]) * 3) for i in range(700)])
+    conn.execute("INSERT INTO secrets VALUES ('hidden')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("where", [
+    "id < 10",
+    "note = 'it''s (fine)'",
+    "name IN (SELECT name FROM users WHERE id % 2 = 0)",
+    '"name" LIKE \'user1%\'',
+])
+def test_where_accepts_expressions(where):
+    assert sqlite_selection(where=where)["where"] == where
+
+
+@pytest.mark.parametrize("where", [
+    "1) UNION SELECT value, 1, 1 FROM secrets --",
+    "1; DROP TABLE users",
+    "id = 1 -- trailing",
+    "id = 1 /* comment */",
+    "(id = 1",
+    "id = 1)",
+    "name = 'open",
+])
+def test_where_refuses_escapes(where):
+    with pytest.raises(ValueError):
+        sqlite_selection(where=where)
+
+
+def test_where_filters_rows(database):
+    selection = sqlite_selection(tables="users", where="note = 'it''s (fine)'")
+    assert export_sqlite_json(database, "out.json", selection=selection)
+    rows = read_json("out.json")["tables"]["users"]["rows"]
+    assert rows and all(row["note"] == "it's (fine)" for row in rows)
+
+
+# lines of a jsonl export per table, in file order
+def read_tables(path):
+    tables = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            tables.setdefault(record["table"], []).append(record)
+    return tables
+
+
+# the appended export holds what a fresh full export of the database holds,
+# rows of existing tables only come after the rows of later tables
+def assert_matches_full_export(database, output):
+    from data_decoder.sqlite_decoder import export_sqlite_incremental
+
+    assert export_sqlite_incremental(database, "fresh.jsonl")
+    assert read_tables(output) == read_tables("fresh.jsonl")
+    os.remove("fresh.jsonl")
+    os.remove("fresh.jsonl.state.json")
+
+
+def test_incremental_appends_new_rows(database, capsys):
+    from data_decoder.sqlite_decoder import export_sqlite_incremental
+
+    assert export_sqlite_incremental(database, "out.jsonl", batch_size=64)
+    assert "Full export" in capsys.readouterr().out
+    state = read_json("out.jsonl.state.json")
+    assert state["output_size"] == os.path.getsize("out.jsonl")
+    assert state["tables"]["users"]["max_rowid"] == 250 and state["tables"]["users"]["rows"] == 250
+
+    assert export_sqlite_incremental(database, "out.jsonl")
+    assert "Appended 0 new rows" in capsys.readouterr().out
+
+    with sqlite3.connect(database) as conn:
+        conn.executemany("INSERT INTO users (name) VALUES (?)", [(f"new{i}",) for i in range(10)])
+        conn.execute("CREATE TABLE tags (name TEXT)")
+        conn.execute("INSERT INTO tags VALUES ('a')")
+    assert export_sqlite_incremental(database, "out.jsonl", batch_size=3)
+    assert "Appended 11 new rows" in capsys.readouterr().out
+    assert read_json("out.jsonl.state.json")["tables"]["users"]["max_rowid"] == 260
+    assert_matches_full_export(database, "out.jsonl")
+
+
+@pytest.mark.parametrize("change", [
+    "DELETE FROM users WHERE id = 5",
+    "ALTER TABLE users ADD COLUMN extra TEXT",
+    "DROP TABLE secrets",
+])
+def test_incremental_rewrites_after_changes(database, capsys, change):
+    from data_decoder.sqlite_decoder import export_sqlite_incremental
+
+    assert export_sqlite_incremental(database, "out.jsonl")
+    with sqlite3.connect(database) as conn:
+        conn.execute(change)
+        conn.execute("INSERT INTO orders (user_id, total) VALUES (1, 2.5)")
+    capsys.readouterr()
+    assert export_sqlite_incremental(database, "out.jsonl")
+    assert "Full export" in capsys.readouterr().out
+    assert_matches_full_export(database, "out.jsonl")
+
+
+# an output cut short since the last run can't be appended to
+def test_incremental_rewrites_a_shortened_output(database, capsys):
+    from data_decoder.sqlite_decoder import export_sqlite_incremental
+
+    assert export_sqlite_incremental(database, "out.jsonl")
+    with open("out.jsonl", "r+b") as f:
+        f.truncate(100)
+    capsys.readouterr()
+    assert export_sqlite_incremental(database, "out.jsonl")
+    assert "Full export" in capsys.readouterr().out
+    assert_matches_full_export(database, "out.jsonl")
+
+
+# the streamed export is the document decode_sqlite builds in memory,
+# whatever the batch size
+@pytest.mark.parametrize("batch_size", [1, 64, 5000])
+@pytest.mark.parametrize("selection", [None, {"tables": "users,orders", "columns": "orders:id,data", "limit": 90}])
+def test_stream_matches_document(database, batch_size, selection):
+    from data_decoder.sqlite_decoder import decode_sqlite
+
+    selection = sqlite_selection(**selection) if selection else None
+    document = decode_sqlite(database, selection)
+    assert export_sqlite_json(database, "pretty.json", batch_size, fmt="pretty", selection=selection)
+    with open("pretty.json", "r", encoding="utf-8") as f:
+        assert f.read() == json.dumps(document, indent=2, sort_keys=True)
+    assert export_sqlite_json(database, "compact.json", batch_size, fmt="compact", selection=selection)
+    assert read_json("compact.json") == document
+
+    assert export_sqlite_json(database, "rows.jsonl", batch_size, fmt="jsonl", selection=selection)
+    tables = read_tables("rows.jsonl")
+    assert list(tables) == list(document["tables"])
+    for name, records in tables.items():
+        assert records[0]["columns"] == document["tables"][name]["columns"]
+        assert [record["row"] for record in records[1:]] == document["tables"][name]["rows"]
+
+
+# parts written by worker processes stitch into the serial output
+@pytest.mark.parametrize("fmt", ["pretty", "compact", "jsonl"])
+@pytest.mark.parametrize("workers", [2, 8])
+def test_parallel_matches_serial(database, fmt, workers):
+    assert export_sqlite_json(database, "serial.out", 50, 1, fmt)
+    assert export_sqlite_json(database, "parallel.out", 50, workers, fmt)
+    with open("serial.out", "rb") as serial, open("parallel.out", "rb") as parallel:
+        assert parallel.read() == serial.read()
+    assert not [name for name in os.listdir(".") if name.startswith("parallel.out") and name != "parallel.out"]
+
+
+def test_parallel_selection_matches_serial(database):
+    selection = sqlite_selection(exclude="secrets", where="id % 7 = 0", limit=20)
+    assert export_sqlite_json(database, "serial.json", 50, 1, "pretty", selection)
+    assert export_sqlite_json(database, "parallel.json", 50, 3, "pretty", selection)
+    assert read_json("parallel.json") == read_json("serial.json")
+    assert set(read_json("parallel.json")["tables"]) == {"users", "orders"}
+
+
+# every column reads back as it was stored, generated columns included
+@pytest.mark.parametrize("batch_size", [2, 1000])
+def test_columns_round_trip(workdir, batch_size):
+    from data_decoder.sqlite_decoder import export_sqlite_columns, read_sqlite_column
+
+    path = str(workdir / "typed.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (a INTEGER, g INT GENERATED ALWAYS AS (a * 10) VIRTUAL, "
+                 "r REAL, s TEXT, b BLOB, m, k INT GENERATED ALWAYS AS (s || '!') STORED)")
+    rows = [
+        (1, 1.5, "one", b"\x00\x01", 1),
+        (None, None, None, None, "text"),
+        (3, -2.25, "é字", b"", b"\xff"),
+        (-7, 0.0, "", b"raw", None),
+        (2 ** 40, 1e300, "x" * 300, bytes(range(256)), 2.5),
+    ]
+    conn.executemany("INSERT INTO t (a, r, s, b, m) VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    names = ["a", "g", "r", "s", "b", "m", "k"]
+    expected = dict(zip(names, map(list, zip(*conn.execute("SELECT a, g, r, s, b, m, k FROM t ORDER BY rowid")))))
+    conn.close()
+
+    assert export_sqlite_columns(path, "typed.columns", batch_size)
+    manifest = read_json("typed.columns/manifest.json")
+    assert [col["name"] for col in manifest["tables"]["t"]["columns"]] == names
+    for name in ("a", "g", "r", "s", "b", "k"):
+        assert read_sqlite_column("typed.columns", "t", name) == expected[name], name
+    # mixed types are stored as json, blobs like the json export
+    mixed = read_sqlite_column("typed.columns", "t", "m")
+    assert mixed[:2] == [1, "text"] and mixed[3:] == [None, 2.5]
+    assert mixed[2] == {"__type__": "blob", "base64": "/w=="}
+
+
+def test_json_export_lists_generated_columns(workdir):
+    path = str(workdir / "gen.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (a INT, g INT GENERATED ALWAYS AS (a * 10) VIRTUAL)")
+    conn.execute("INSERT INTO t (a) VALUES (4)")
+    conn.commit()
+    conn.close()
+    assert export_sqlite_json(path, "gen.json")
+    table = read_json("gen.json")["tables"]["t"]
+    assert [col["name"] for col in table["columns"]] == ["a", "g"]
+    assert table["rows"] == [{"a": 4, "g": 40}]
+
+
+# a state file of the wrong shape means starting over, not crashing
+@pytest.mark.parametrize("state", [
+    "[]",
+    "{}",
+    "not json",
+    '{"output_size": 10}',
+    '{"output_size": "10", "tables": {}}',
+    '{"output_size": 10, "tables": []}',
+    '{"output_size": 10, "tables": {"users": {"schema": "x", "rowid": true, "rows": 3}}}',
+    '{"output_size": 10, "tables": {"users": {"schema": "x", "rowid": true, "max_rowid": "3", "rows": 3}}}',
+    '{"output_size": 10, "tables": {"users": null}}',
+])
+def test_incremental_ignores_foreign_state(database, capsys, state):
+    from data_decoder.sqlite_decoder import export_sqlite_incremental
+
+    assert export_sqlite_incremental(database, "out.jsonl")
+    with open("out.jsonl.state.json", "w", encoding="utf-8") as f:
+        f.write(state)
+    capsys.readouterr()
+    assert export_sqlite_incremental(database, "out.jsonl")
+    assert "Full export" in capsys.readouterr().out
+    assert_matches_full_export(database, "out.jsonl")
+    assert read_json("out.jsonl.state.json")["tables"]["users"]["rows"] == 250
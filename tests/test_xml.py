@@ -0,0 +1,133 @@
+import io
+import json
+import os
+
+import pytest
+
+from data_decoder.xml_decoder import (
+    export_xml_records, extract_text_from_xml, extract_text_from_xml_stream, iter_xml_records,
+    parse_record_path, write_xml_records
+)
+
+
+documents = [
+    "<a>text</a>",
+    "<a>  lead <b>one</b> tail of b <c>two<d>three</d>after d</c>   end  </a>",
+    "<a><b/><b>x</b><!-- note --><b/>tail</a>",
+    "<root xmlns:p='urn:p'><p:item id='1'>x &amp; y</p:item><![CDATA[<raw>]]></root>",
+    "<a>\n  <b>\n    multi\n    line\n  </b>\n</a>",
+    "<a><b></b></a>",
+    "<a>é ü 字</a>",
+]
+
+
+def decode_both(workdir, text):
+    (workdir / "in.xml").write_text(text, encoding="utf-8")
+    assert extract_text_from_xml("in.xml", "whole.txt")
+    assert extract_text_from_xml_stream("in.xml", "stream.txt")
+    return (workdir / "whole.txt").read_text(encoding="utf-8"), (workdir / "stream.txt").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("text", documents)
+def test_stream_matches_whole(workdir, text):
+    whole, stream = decode_both(workdir, text)
+    assert stream == whole
+
+
+# more pieces than the stream decoder writes at once
+def test_stream_matches_whole_on_large_files(workdir):
+    items = "".join(f"<item n='{n}'><name>name {n}</name>tail {n}<deep><er>{n}</er></deep></item>" for n in range(5000))
+    whole, stream = decode_both(workdir, f"<feed>head{items}</feed>")
+    assert stream == whole
+    assert whole.count("\n") > 4096 * 2
+
+
+def test_broken_xml_fails_both(workdir):
+    (workdir / "in.xml").write_text("<a><b>x</a>", encoding="utf-8")
+    assert not extract_text_from_xml("in.xml", "whole.txt")
+    assert not extract_text_from_xml_stream("in.xml", "stream.txt")
+    assert not os.path.exists("stream.txt") and not os.path.exists("stream.txt.part")
+
+
+feed = """<?xml version="1.0"?>
+<feed xmlns="urn:feed" xmlns:m="urn:meta">
+  <entry id="1" m:lang="en">
+    <title>First</title>
+    <tag>a</tag><tag>b</tag><tag>c</tag>
+    <summary type="text">short</summary>
+    <empty/>
+    <note>lead <b>bold</b> middle <i>it</i> end</note>
+  </entry>
+  <entry id="2">
+    <title>Second</title>
+    <tag>x</tag>
+    <group><entry>nested</entry></group>
+  </entry>
+  <other><entry id="3">deep</entry></other>
+</feed>"""
+
+
+def test_records_keep_the_structure():
+    first, second = iter_xml_records(io.BytesIO(feed.encode()), "/feed/entry")
+    assert first == {
+        "@id": "1", "@lang": "en",
+        "title": "First",
+        "tag": ["a", "b", "c"],
+        "summary": {"@type": "text", "#text": "short"},
+        "empty": None,
+        "note": {"#text": "lead middle end", "b": "bold", "i": "it"},
+    }
+    assert second == {"@id": "2", "title": "Second", "tag": "x", "group": {"entry": "nested"}}
+
+
+# a match inside a record stays part of that record
+@pytest.mark.parametrize("path, expected", [
+    ("/feed/entry", ["1", "2"]),
+    ("entry", ["1", "2", "3"]),
+    ("//entry", ["1", "2", "3"]),
+    ("/feed//entry", ["1", "2", "3"]),
+    ("//group/entry", ["nested"]),
+    ("/feed/entry/*/entry", ["nested"]),
+    ("/feed/*/entry", ["3"]),
+    ("/*/other/entry", ["3"]),
+    ("/feed/entry/tag", ["a", "b", "c", "x"]),
+    ("/entry", []),
+])
+def test_record_paths(path, expected):
+    records = iter_xml_records(io.BytesIO(feed.encode()), path)
+    assert [record["@id"] if isinstance(record, dict) else record for record in records] == expected
+
+
+@pytest.mark.parametrize("path", ["/feed/entry[1]", "/feed/@id", "/feed//", "", "/feed/entry[@id='1']", "/a/text()"])
+def test_record_path_rejects_predicates(path):
+    with pytest.raises(ValueError):
+        parse_record_path(path)
+
+
+# records spread over several encoding batches still form one document
+@pytest.mark.parametrize("fmt", ["jsonl", "compact", "pretty"])
+@pytest.mark.parametrize("n", [0, 1, 999, 1000, 1001, 2500])
+def test_record_formats(fmt, n):
+    items = "".join(f"<item n='{i}'><v>{i}</v></item>" for i in range(n))
+    out = io.StringIO()
+    assert write_xml_records(io.BytesIO(f"<list>{items}</list>".encode()), out, "/list/item", fmt) == n
+
+    expected = [{"@n": str(i), "v": str(i)} for i in range(n)]
+    text = out.getvalue()
+    if fmt == "jsonl":
+        assert [json.loads(line) for line in text.splitlines()] == expected
+    else:
+        assert json.loads(text) == expected
+        if fmt == "pretty":
+            assert text == json.dumps(expected, indent=2, sort_keys=True)
+        else:
+            assert "\n" not in text
+
+
+def test_export_records(workdir, capsys):
+    (workdir / "feed.xml").write_text(feed, encoding="utf-8")
+    assert export_xml_records("feed.xml", "out.jsonl", "/feed/entry")
+    assert len((workdir / "out.jsonl").read_text().splitlines()) == 2
+    assert not export_xml_records("feed.xml", "none.jsonl", "/feed/missing")
+    assert not export_xml_records("feed.xml", "bad.jsonl", "/feed/entry[1]")
+    assert not os.path.exists("none.jsonl") and not os.path.exists("none.jsonl.part")
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from data_decoder.yaml_decoder import decode_yaml, export_yaml_json
+
+
+documents = [
+    # "- " items at the indent of their key belong to that key
+    ("a:\n  b: 1\n  c:\n  - x", {"a": {"b": 1, "c": ["x"]}}),
+    ("root:\n  items:\n  - a\n  - b", {"root": {"items": ["a", "b"]}}),
+    ("items:\n- a\n- b\nother: 1", {"items": ["a", "b"], "other": 1}),
+    ("a:\n  b:\n  - 1\n  - k: v\n    m: 2\n  - 3\n  c: 4", {"a": {"b": [1, {"k": "v", "m": 2}, 3], "c": 4}}),
+    ("x:\n  y:\n    z:\n    - 1\n  w: 2", {"x": {"y": {"z": [1]}, "w": 2}}),
+    # indented lists
+    ("a:\n  - x\n  - y\nb: 2", {"a": ["x", "y"], "b": 2}),
+    ("- name: x\n  tags:\n  - a\n  - b\n- name: y", [{"name": "x", "tags": ["a", "b"]}, {"name": "y"}]),
+    ("- a\n- b", ["a", "b"]),
+    # scalars and comments
+    ("n: 12\nf: 1.5\nt: true\nz: null\ns: 'q'\nplain: text # comment", {
+        "n": 12, "f": 1.5, "t": True, "z": None, "s": "q", "plain": "text"
+    }),
+    ("", {}),
+]
+
+
+@pytest.mark.parametrize("text, expected", documents)
+def test_decode_yaml(text, expected):
+    assert decode_yaml(text.splitlines()) == expected
+
+
+# a list item after keys of the same mapping is invalid yaml, it must not
+# take the keys with it
+def test_stray_item_keeps_mapping():
+    assert decode_yaml("a:\n  b: 1\n  - x\n  c: 2".splitlines()) == {"a": {"b": 1, "c": 2}}
+
+
+@pytest.mark.parametrize("text, expected", documents)
+@pytest.mark.parametrize("fmt", ["pretty", "compact"])
+def test_stream_export_matches(workdir, text, expected, fmt):
+    (workdir / "in.yaml").write_text(text, encoding="utf-8")
+    assert export_yaml_json("in.yaml", "whole.json", False, fmt)
+    assert export_yaml_json("in.yaml", "stream.json", True, fmt)
+
+    whole = json.loads((workdir / "whole.json").read_text(encoding="utf-8"))
+    stream = json.loads((workdir / "stream.json").read_text(encoding="utf-8"))
+    assert whole == stream == expected
+
+
+def test_jsonl_export(workdir):
+    (workdir / "in.yaml").write_text("a:\n  b: 1\n  c:\n  - x\nd: 2\n", encoding="utf-8")
+    assert export_yaml_json("in.yaml", "out.jsonl", fmt="jsonl")
+    lines = (workdir / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [{"a": {"b": 1, "c": ["x"]}}, {"d": 2}]